@@ -0,0 +1,81 @@
+"""Память AST: узлы с __dict__ против узлов с __slots__.
+
+Прежнее дерево воспроизводится по текущему: у каждого литерала и
+объявления дочерний узел с именем типа, оператор хранится строкой str(TokenType), у листьев
+собственный пустой список детей.
+"""
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.generator import SHAPES, generate_program
+from src.ast_builder import ASTBuilder
+from src.ast_nodes.printer import DECLARATION_TYPE_NAMES, LITERAL_TYPE_NAMES
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.ast_node_type import NodeType
+from src.ast_nodes.traversal import count_nodes
+from src.lexer import Lexer
+from src.tokens.token_type import TokenType
+
+
+class DictNode:
+    # Узел в прежнем виде, с __dict__ на каждом экземпляре
+    def __init__(self, type, value=None, children=None, token=None, value_type=None,
+                 literal=None, symbol=None):
+        self.type = type
+        self.value = value
+        self.children = children if children is not None else []
+        self.token = token
+        self.value_type = value_type
+        self.literal = literal
+        self.symbol = symbol
+
+
+def dict_tree(node: ASTNode) -> DictNode:
+    children = [dict_tree(child) for child in node.children]
+    value = node.value
+    if isinstance(value, TokenType):
+        value = str(value)
+    if node.type == NodeType.LITERAL:
+        children.append(DictNode(NodeType.IDENTIFIER, LITERAL_TYPE_NAMES[node.value_type]))
+    elif node.type == NodeType.VARIABLE_DECLARATION:
+        children.append(DictNode(NodeType.IDENTIFIER, DECLARATION_TYPE_NAMES[node.value_type]))
+    return DictNode(node.type, value, children, node.token, node.value_type, node.literal, node.symbol)
+
+
+def count_dict_nodes(node: DictNode) -> int:
+    return 1 + sum(count_dict_nodes(child) for child in node.children)
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Память AST')
+    parser.add_argument('--shape', choices=list(SHAPES), default='statements')
+    parser.add_argument('--size', type=int, default=50_000)
+    args = parser.parse_args()
+
+    code = generate_program(args.shape, args.size)
+    tokens = Lexer(code).tokenize()
+
+    root, slots_size = measure(lambda: ASTBuilder(tokens, strict=True).parse())
+    old_root, dict_size = measure(lambda: dict_tree(root))
+
+    results = {
+        'Узлы с __dict__': (count_dict_nodes(old_root), dict_size),
+        'Узлы с __slots__': (count_nodes(root), slots_size),
+    }
+    print(f"Форма: {args.shape}, операторов: {args.size}, токенов: {len(tokens)}")
+    for name, (nodes, size) in results.items():
+        print(f"{name:<18} {nodes:>9} узлов {size / 1024 / 1024:8.1f} МБ {size / nodes:8.1f} байт/узел")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Сохранение и загрузка AST: двоичный формат против pickle и JSON.
+
+pickle получает дерево вложенными кортежами, как его хранил кэш
+компиляции до двоичного формата.
+"""
+import argparse
+import pickle
+
+from benchmarks.generator import SHAPES, generate_program
+from benchmarks.suite import best_time
+from src.ast_builder import ASTBuilder
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.ast_node_type import NodeType
+from src.ast_nodes.serialization import dump_ast, dump_ast_json, load_ast
+from src.lexer import Lexer
+from src.tokens.token_type import TokenType
+
+
+def tuple_tree(node: ASTNode, token_indexes: dict) -> tuple:
+    return (node.type.name, node.value, token_indexes.get(id(node.token), -1),
+            node.value_type.name if node.value_type is not None else None,
+            node.literal, node.symbol,
+            [tuple_tree(child, token_indexes) for child in node.children if child is not None])
+
+
+def load_tuple_tree(record: tuple, tokens: list) -> ASTNode:
+    type_name, value, token_index, value_type, literal, symbol, children = record
+    return ASTNode(NodeType[type_name], value,
+                   [load_tuple_tree(child, tokens) for child in children] if children else (),
+                   tokens[token_index] if token_index >= 0 else None,
+                   TokenType[value_type] if value_type is not None else None, literal, symbol)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Сохранение и загрузка AST')
+    parser.add_argument('--shape', choices=list(SHAPES), default='statements')
+    parser.add_argument('--size', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    code = generate_program(args.shape, args.size)
+    tokens = Lexer(code).tokenize()
+    root = ASTBuilder(tokens, strict=True).parse()
+    token_indexes = {id(token): index for index, token in enumerate(tokens)}
+
+    binary = dump_ast(root, tokens)
+    pickled = pickle.dumps(tuple_tree(root, token_indexes), protocol=pickle.HIGHEST_PROTOCOL)
+    results = {
+        'Двоичный': (len(binary),
+                     best_time(lambda: dump_ast(root, tokens), args.repeat),
+                     best_time(lambda: load_ast(binary, tokens), args.repeat)),
+        'pickle кортежей': (len(pickled),
+                            best_time(lambda: pickle.dumps(tuple_tree(root, token_indexes),
+                                                           protocol=pickle.HIGHEST_PROTOCOL), args.repeat),
+                            best_time(lambda: load_tuple_tree(pickle.loads(pickled), tokens), args.repeat)),
+        'JSON': (len(dump_ast_json(root).encode('utf-8')),
+                 best_time(lambda: dump_ast_json(root), args.repeat), None),
+    }
+    print(f"Форма: {args.shape}, операторов: {args.size}, токенов: {len(tokens)}")
+    for name, (size, dump_seconds, load_seconds) in results.items():
+        load = f"{load_seconds * 1000:8.1f} мс" if load_seconds is not None else f"{'-':>11}"
+        print(f"{name:<16} {size / 1024 / 1024:8.2f} МБ  запись {dump_seconds * 1000:8.1f} мс  загрузка {load}")
+
+
+if __name__ == '__main__':
+    main()
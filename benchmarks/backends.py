@@ -0,0 +1,79 @@
+"""Сравнение скорости исполнения: обход AST, байт-код на стековой машине и трансляция в Python"""
+import argparse
+import io
+import time
+
+from src.bytecode.bytecode_compiler import BytecodeCompiler
+from src.bytecode.virtual_machine import VirtualMachine
+from src.compiler import Compiler
+from src.interpreter import Interpreter
+from src.python_backend import transpile
+
+
+PROGRAMS = {
+    'nested_for': """
+        program var i, j, s : %;
+        begin
+            s as 0;
+            for i as 1 to {n} do
+                for j as 1 to 100 do
+                    s as s plus i mult j min j div 3;
+            write(s)
+        end.
+    """,
+    'while_branches': """
+        program var i, a : %; ok : $;
+        begin
+            i as 0; a as 0;
+            while i LT {n} mult 100 do
+                if i EQ i div 2 mult 2 then i as i plus 1 else i as i plus 1;
+            ok as (i GT 0) and (a LE i) or false;
+            write(i, ok)
+        end.
+    """,
+    'invariants': """
+        program var i, j, s, k, m : %;
+        begin
+            s as 0; k as 3; m as 7;
+            for i as 1 to {n} do
+                for j as 1 to 100 do
+                    s as s plus (k mult m plus k) mult (m min k) plus j;
+            write(s)
+        end.
+    """,
+}
+
+
+def best_time(function, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Скорость исполнения программ')
+    parser.add_argument('--size', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--optimize', '-O', action='store_true', help='Исполнять оптимизированное AST')
+    args = parser.parse_args()
+
+    print(f"{'программа':<16} {'AST, с':>10} {'VM, с':>10} {'Python, с':>10} "
+          f"{'VM/AST':>8} {'Python/AST':>11}")
+    for name, template in PROGRAMS.items():
+        _, root = Compiler.build(template.replace('{n}', str(args.size)), optimize=args.optimize)
+        code_object = BytecodeCompiler().compile(root)
+        python_program = transpile(root)
+        
+        ast_time = best_time(lambda: Interpreter(output_stream=io.StringIO()).run(root), args.repeat)
+        vm_time = best_time(lambda: VirtualMachine(output_stream=io.StringIO()).run(code_object),
+                            args.repeat)
+        python_time = best_time(lambda: python_program.run(output_stream=io.StringIO()), args.repeat)
+        print(f"{name:<16} {ast_time:>10.3f} {vm_time:>10.3f} {python_time:>10.3f} "
+              f"{ast_time / vm_time:>7.2f}x {ast_time / python_time:>10.2f}x")
+
+
+if __name__ == '__main__':
+    main()
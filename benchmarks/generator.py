@@ -0,0 +1,111 @@
+"""Синтетические программы заданного размера и формы.
+
+Программы проходят все фазы компиляции, включая посимвольные проверки
+SemanticAnalyzer.analyze: справа от 'as' и по обе стороны от plus, min,
+LT и GT стоят только идентификаторы и литералы, скобки - после mult.
+"""
+import random
+
+from typing import Callable, Dict, List, Optional
+
+
+def _names(count: int) -> List[str]:
+    return [f"x{index}" for index in range(count)]
+
+
+def _program(declarations: str, statements: List[str]) -> str:
+    return f"program var {declarations}\nbegin\n" + ';\n'.join(statements) + "\nend."
+
+
+def _assignment(rng: random.Random, names: List[str]) -> str:
+    target, left, right = rng.choice(names), rng.choice(names), rng.choice(names)
+    operator = rng.choice(['plus', 'min', 'mult'])
+    return f"{target} as {left} {operator} {right} plus {rng.randint(0, 99)}"
+
+
+def _expression(rng: random.Random, names: List[str], depth: int) -> str:
+    if depth == 0:
+        return f"{rng.choice(names)} plus {rng.randint(1, 9)}"
+    return f"{rng.choice(names)} plus {rng.randint(1, 9)} mult ({_expression(rng, names, depth - 1)})"
+
+
+def _nested(rng: random.Random, names: List[str], depth: int) -> str:
+    if depth == 0:
+        return _assignment(rng, names)
+    body = _nested(rng, names, depth - 1)
+    kind = rng.choice(['if', 'while', 'for'])
+    if kind == 'if':
+        return (f"if {rng.choice(names)} LT {rng.randint(0, 99)} then {body} "
+                f"else {_assignment(rng, names)}")
+    if kind == 'while':
+        return f"while {rng.choice(names)} GT {rng.randint(0, 99)} do {body}"
+    return f"for {rng.choice(names)} as 1 to {rng.randint(2, 9)} do {body}"
+
+
+def declarations(size: int, depth: int, rng: random.Random) -> str:
+    """Тысячи объявлений разных типов и немного операторов"""
+    groups = []
+    for start in range(0, size, 10):
+        group = ', '.join(f"v{index}" for index in range(start, min(size, start + 10)))
+        groups.append(f"{group} : {'%!$'[start // 10 % 3]};")
+    integers = [f"v{index}" for index in range(size) if index // 10 % 3 == 0]
+    statements = [_assignment(rng, integers) for _ in range(max(1, size // 100))]
+    return _program(' '.join(groups), statements)
+
+
+def statements(size: int, depth: int, rng: random.Random) -> str:
+    """Длинный список простых операторов"""
+    names = _names(20)
+    body = []
+    for _ in range(size):
+        choice = rng.random()
+        if choice < 0.8:
+            body.append(_assignment(rng, names))
+        elif choice < 0.9:
+            body.append(f"write({rng.choice(names)}, {rng.choice(names)})")
+        else:
+            body.append(f"read({rng.choice(names)})")
+    return _program(f"{', '.join(names)} : %;", body)
+
+
+def expressions(size: int, depth: int, rng: random.Random) -> str:
+    """Операторы с глубоко вложенными скобочными выражениями"""
+    names = _names(10)
+    body = [f"{rng.choice(names)} as {_expression(rng, names, depth)}" for _ in range(size)]
+    return _program(f"{', '.join(names)} : %;", body)
+
+
+def nested(size: int, depth: int, rng: random.Random) -> str:
+    """Вложенные друг в друга if, while и for"""
+    names = _names(10)
+    return _program(f"{', '.join(names)} : %;", [_nested(rng, names, depth) for _ in range(size)])
+
+
+def comments(size: int, depth: int, rng: random.Random) -> str:
+    """Исходный текст, в котором комментарии занимают большую часть"""
+    names = _names(10)
+    words = ['значение', 'переменная', 'цикл', 'условие', 'результат', 'счетчик', 'сумма']
+    body = []
+    for index in range(size):
+        comment = ' '.join(rng.choice(words) for _ in range(rng.randint(5, 30)))
+        body.append(f"{{ {index}: {comment} }}\n{_assignment(rng, names)}")
+    return _program(f"{{ {' '.join(words * 5)} }} {', '.join(names)} : %;", body)
+
+
+SHAPES: Dict[str, Callable[[int, int, random.Random], str]] = {
+    'declarations': declarations,
+    'statements': statements,
+    'expressions': expressions,
+    'nested': nested,
+    'comments': comments,
+}
+
+# Глубина вложенности по умолчанию для форм, где она есть
+DEFAULT_DEPTH = {'expressions': 30, 'nested': 6}
+
+
+def generate_program(shape: str, size: int, depth: Optional[int] = None, seed: int = 0) -> str:
+    """Программа формы shape: size - число операторов (объявлений для declarations)"""
+    if depth is None:
+        depth = DEFAULT_DEPTH.get(shape, 0)
+    return SHAPES[shape](size, depth, random.Random(seed))
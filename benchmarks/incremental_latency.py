@@ -0,0 +1,56 @@
+"""Задержка IncrementalCompiler.edit в зависимости от размера программы.
+
+Правка меняет литерал оператора в середине программы, попеременно на
+'true' (ошибка типов) и на число другой длины, так что сдвигаются смещения
+всех следующих токенов. Время правки не должно расти с числом операторов.
+"""
+import argparse
+import gc
+import statistics
+import time
+
+from src.incremental import IncrementalCompiler
+
+
+def generate_program(statements: int) -> str:
+    body = ';\n'.join(f"x as x plus {index}" for index in range(statements))
+    return f"program var x, y : %;\nbegin\n{body}\nend."
+
+
+def edit_times(statements: int, edits: int) -> list:
+    code = generate_program(statements)
+    compiler = IncrementalCompiler(code)
+    # Литерал оператора из середины программы: 'x as x plus N'
+    literal = str(statements // 2)
+    start = code.index(f"x as x plus {literal};") + len("x as x plus ")
+    times = []
+    gc.disable()
+    try:
+        for index in range(edits):
+            text = 'true' if index % 2 == 0 else '1'
+            began = time.perf_counter()
+            compiler.edit(start, start + len(literal), text)
+            compiler.diagnostics
+            times.append(time.perf_counter() - began)
+            literal = text
+    finally:
+        gc.enable()
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Задержка инкрементальной перекомпиляции')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 50_000])
+    parser.add_argument('--edits', type=int, default=200)
+    args = parser.parse_args()
+
+    # Первая правка строит индекс строк SourceMap, поэтому вместо максимума - 95-й процентиль
+    print(f"{'Операторов':>10}  {'медиана':>10}  {'95%':>10}")
+    for size in args.sizes:
+        times = edit_times(size, args.edits)
+        percentile = statistics.quantiles(times, n=20)[-1]
+        print(f"{size:>10}  {statistics.median(times) * 1000:7.3f} мс  {percentile * 1000:7.3f} мс")
+
+
+if __name__ == '__main__':
+    main()
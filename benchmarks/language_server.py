@@ -0,0 +1,120 @@
+"""Языковой сервер против запуска компилятора на каждую проверку.
+
+Сценарный клиент открывает большую программу и правит одну строку в середине;
+запрос hover заставляет сервер сразу применить правку и ответить по новому тексту.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.language_server import read_message
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+URI = 'file:///benchmark.uvm'
+
+
+def generate_program(statements: int) -> str:
+    body = ';\n'.join(f"x as x plus {index}" for index in range(statements))
+    return f"program var x, y : %;\nbegin\n{body}\nend."
+
+
+class Client:
+    def __init__(self):
+        self.process = subprocess.Popen([sys.executable, 'main.py', '--lsp'], cwd=ROOT,
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._id = 0
+        # Диагностика, пришедшая раньше ответа на запрос
+        self._published = []
+
+    def notify(self, method: str, params: dict):
+        self._send({'jsonrpc': '2.0', 'method': method, 'params': params})
+
+    def request(self, method: str, params: dict) -> dict:
+        self._id += 1
+        self._send({'jsonrpc': '2.0', 'id': self._id, 'method': method, 'params': params})
+        while True:
+            message = read_message(self.process.stdout)
+            if message.get('id') == self._id:
+                return message
+            if message.get('method') == 'textDocument/publishDiagnostics':
+                self._published.append(message['params']['diagnostics'])
+
+    def wait_diagnostics(self) -> list:
+        if self._published:
+            return self._published.pop(0)
+        while True:
+            message = read_message(self.process.stdout)
+            if message.get('method') == 'textDocument/publishDiagnostics':
+                return message['params']['diagnostics']
+
+    def close(self):
+        self.request('shutdown', {})
+        self.notify('exit', {})
+        self.process.wait()
+
+    def _send(self, message: dict):
+        body = json.dumps(message).encode('utf-8')
+        self.process.stdin.write(b'Content-Length: %d\r\n\r\n' % len(body) + body)
+        self.process.stdin.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Задержка проверки после правки')
+    parser.add_argument('--statements', type=int, default=20_000)
+    parser.add_argument('--edits', type=int, default=50)
+    args = parser.parse_args()
+
+    code = generate_program(args.statements)
+    # Строка оператора из середины программы: 'x as x plus N;'
+    line = 2 + args.statements // 2
+
+    client = Client()
+    start = time.perf_counter()
+    client.request('initialize', {})
+    client.notify('initialized', {})
+    client.notify('textDocument/didOpen', {'textDocument': {'uri': URI, 'version': 1, 'text': code}})
+    client.wait_diagnostics()
+    open_time = time.perf_counter() - start
+
+    literal = str(line - 2)
+    start = time.perf_counter()
+    for index in range(args.edits):
+        # Чередуются правильный оператор и оператор с ошибкой типов
+        text = 'true' if index % 2 == 0 else '1'
+        client.notify('textDocument/didChange', {
+            'textDocument': {'uri': URI, 'version': index + 2},
+            'contentChanges': [{'range': {'start': {'line': line, 'character': 12},
+                                          'end': {'line': line, 'character': 12 + len(literal)}},
+                                'text': text}]
+        })
+        literal = text
+        client.request('textDocument/hover', {'textDocument': {'uri': URI},
+                                              'position': {'line': line, 'character': 0}})
+        client.wait_diagnostics()
+    edit_time = (time.perf_counter() - start) / args.edits
+    client.close()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.uvm', delete=False, encoding='utf-8') as file:
+        file.write(generate_program(args.statements))
+    try:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, 'main.py', file.name], cwd=ROOT,
+                       stdout=subprocess.DEVNULL, check=False)
+        process_time = time.perf_counter() - start
+    finally:
+        os.unlink(file.name)
+
+    print(f"Операторов: {args.statements}")
+    print(f"Открытие документа на сервере  {open_time * 1000:9.1f} мс")
+    print(f"Правка на сервере              {edit_time * 1000:9.1f} мс")
+    print(f"Запуск main.py на проверку     {process_time * 1000:9.1f} мс  "
+          f"({process_time / edit_time:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
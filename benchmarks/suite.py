@@ -0,0 +1,155 @@
+"""Набор замеров фаз компиляции на синтетических программах.
+
+Результаты сохраняются в JSON (--output) и сравниваются с сохраненной
+базой (--baseline): замер медленнее базы больше чем на --tolerance
+считается регрессией, и процесс завершается с кодом 1.
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --baseline baseline.json
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import sys
+import time
+
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.generator import SHAPES, generate_program
+from src.ast_builder import ASTBuilder
+from src.compiler import Compiler, COMPILER_VERSION
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic_analyzer import SemanticAnalyzer
+
+
+# Размер по умолчанию: число операторов (объявлений для declarations)
+DEFAULT_SIZES = {
+    'declarations': 20_000,
+    'statements': 10_000,
+    'expressions': 500,
+    'nested': 2_000,
+    'comments': 5_000,
+}
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    # Как в timeit: сборщик мусора отключается, чтобы его запуски не добавляли шума
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+
+def compile_quietly(code: str):
+    # Compiler.compile сообщает о ходе компиляции через print
+    with contextlib.redirect_stdout(io.StringIO()):
+        if Compiler.compile(code) is None:
+            raise SyntaxError("Синтетическая программа не компилируется")
+
+
+def measure(code: str, repeat: int) -> Dict[str, float]:
+    tokens = Lexer(code).tokenize()
+    return {
+        'lexer': best_time(lambda: Lexer(code).tokenize(), repeat),
+        'parser': best_time(lambda: Parser(tokens).parse(), repeat),
+        'semantic': best_time(lambda: SemanticAnalyzer(tokens).analyze(), repeat),
+        'ast_builder': best_time(lambda: ASTBuilder(tokens, strict=True).parse(), repeat),
+        'compile': best_time(lambda: compile_quietly(code), repeat),
+    }
+
+
+def run_suite(shapes: List[str], scale: float, repeat: int, seed: int) -> dict:
+    results = {}
+    for shape in shapes:
+        size = max(1, int(DEFAULT_SIZES[shape] * scale))
+        code = generate_program(shape, size, seed=seed)
+        results[shape] = {
+            'size': size,
+            'characters': len(code),
+            'tokens': len(Lexer(code).tokenize()),
+            'seconds': measure(code, repeat),
+        }
+        print(f"{shape:<14} {size:>7} {len(code):>10} симв.  " + '  '.join(
+            f"{name}={seconds * 1000:.1f}мс" for name, seconds in results[shape]['seconds'].items()),
+            file=sys.stderr)
+    return {
+        'meta': {
+            'compiler_version': COMPILER_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'scale': scale,
+            'repeat': repeat,
+            'seed': seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Сравнение с базой; возвращает описания регрессий"""
+    regressions = []
+    print(f"{'Форма':<14} {'Фаза':<12} {'База, мс':>10} {'Сейчас, мс':>11} {'Отношение':>10}")
+    for shape, result in current['results'].items():
+        base = baseline['results'].get(shape)
+        if base is None or base['size'] != result['size']:
+            # Программы разного размера сравнивать бессмысленно
+            continue
+        for phase, seconds in result['seconds'].items():
+            base_seconds = base['seconds'].get(phase)
+            if not base_seconds:
+                continue
+            ratio = seconds / base_seconds
+            mark = ''
+            if ratio > 1 + tolerance:
+                mark = '  регрессия'
+                regressions.append(f"{shape}/{phase}: {ratio:.2f}x")
+            elif ratio < 1 - tolerance:
+                mark = '  ускорение'
+            print(f"{shape:<14} {phase:<12} {base_seconds * 1000:>10.2f} {seconds * 1000:>11.2f} "
+                  f"{ratio:>9.2f}x{mark}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Замеры фаз компиляции на синтетических программах')
+    parser.add_argument('--shapes', nargs='+', choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument('--scale', type=float, default=1.0, help='Множитель размеров программ')
+    parser.add_argument('--repeat', type=int, default=3, help='Число повторов, берется лучшее время')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Файл JSON для сохранения результатов')
+    parser.add_argument('--baseline', help='Файл JSON с результатами для сравнения')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='Допустимое замедление относительно базы (доля)')
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.shapes, args.scale, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(current, file, ensure_ascii=False, indent=2)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline = json.load(file)
+    regressions = compare(current, baseline, args.tolerance)
+    if regressions:
+        print(f"Регрессии ({len(regressions)}): {', '.join(regressions)}")
+        return 1
+    print("Регрессий нет")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Программы с тысячами переменных: интернирование имен и номера идентификаторов"""
+import argparse
+import io
+import random
+import time
+
+from src.ast_builder import ASTBuilder
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.tokens.token_type import TokenType
+from src.type_checker import TypeChecker
+
+
+def generate_program(variables: int, statements: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    names = [f"var{index}" for index in range(variables)]
+    declarations = ' '.join(f"{', '.join(names[start:start + 50])} : %;"
+                            for start in range(0, variables, 50))
+    body = ';\n'.join(f"{rng.choice(names)} as {rng.choice(names)} plus {rng.choice(names)} plus 1"
+                      for _ in range(statements))
+    return f"program var {declarations} begin\n{body}\nend."
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Интернирование идентификаторов')
+    parser.add_argument('--variables', type=int, default=5000)
+    parser.add_argument('--statements', type=int, default=50_000)
+    args = parser.parse_args()
+
+    code = generate_program(args.variables, args.statements)
+    lexer = Lexer(code)
+    tokens, lex_time = timed(lexer.tokenize)
+    root, build_time = timed(lambda: ASTBuilder(tokens, strict=True).parse())
+    _, check_time = timed(lambda: TypeChecker().check(root))
+    _, run_time = timed(lambda: Interpreter(output_stream=io.StringIO()).run(root))
+
+    identifiers = [token for token in tokens if token.type == TokenType.IDENTIFIER]
+    print(f"Переменных: {len(lexer.symbols)}, вхождений идентификаторов: {len(identifiers)}, "
+          f"различных строк: {len({id(token.value) for token in identifiers})}")
+    print(f"Лексический анализ  {lex_time:8.3f} с")
+    print(f"Построение AST      {build_time:8.3f} с")
+    print(f"Проверка типов      {check_time:8.3f} с")
+    print(f"Исполнение (AST)    {run_time:8.3f} с")
+
+    # Поиск значения переменной: по новой подстроке (хеш считается заново)
+    # и по номеру идентификатора в списке
+    fresh_names = [code[token.offset:token.offset + len(token.value)] for token in identifiers]
+    by_name = {name: 0 for name in lexer.symbols}
+    _, name_time = timed(lambda: [by_name[name] for name in fresh_names])
+    by_symbol = [0] * len(lexer.symbols)
+    symbols = [token.symbol for token in identifiers]
+    _, symbol_time = timed(lambda: [by_symbol[symbol] for symbol in symbols])
+    print(f"Поиск по строке     {name_time:8.3f} с")
+    print(f"Поиск по номеру     {symbol_time:8.3f} с  ({name_time / symbol_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
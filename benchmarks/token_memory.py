@@ -0,0 +1,67 @@
+"""Замер памяти на один токен: список Token против TokenBuffer"""
+import argparse
+import gc
+import tracemalloc
+
+from src.lexer import Lexer
+from src.tokens.token import Token
+
+
+SAMPLE_STATEMENTS = """
+    x as 10;
+    y as y plus x mult 2;
+    if x LT y then z as x plus y else z as x min y;
+    while x GT 0 do x as x min 1;
+    write(z, result);
+"""
+
+
+class DictToken:
+    # Токен в прежнем виде, с __dict__ на каждом экземпляре
+    def __init__(self, type, value, offset, source_map, literal, symbol):
+        self.type = type
+        self.value = value
+        self.offset = offset
+        self.source_map = source_map
+        self.literal = literal
+        self.symbol = symbol
+
+
+def generate_program(statements: int) -> str:
+    body = SAMPLE_STATEMENTS * (statements // 5)
+    return f"program var x, y, z, result : %; begin {body} write(x) end."
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Память токенов')
+    parser.add_argument('--statements', type=int, default=100_000)
+    args = parser.parse_args()
+
+    code = generate_program(args.statements)
+    count = len(Lexer(code).tokenize_buffer())
+
+    results = {
+        'Token с __dict__': measure(
+            lambda: [DictToken(t.type, t.value, t.offset, t.source_map, t.literal, t.symbol)
+                     for t in Lexer(code).tokenize()]),
+        'Token с __slots__': measure(lambda: Lexer(code).tokenize()),
+        'TokenBuffer': measure(lambda: Lexer(code).tokenize_buffer()),
+    }
+
+    print(f"Токенов: {count}, размер исходного текста: {len(code)} символов")
+    for name, size in results.items():
+        print(f"{name:<20} {size / count:8.1f} байт/токен")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,53 @@
-from src.compiler import Compiler
+from src.compiler import Compiler, COMPILER_VERSION
+from src.compile_cache import CompileCache
+from src.compile_stats import CompileStats
+from src.diagnostics import DEFAULT_MAX_ERRORS
+from src.batch import compile_batch, expand_sources
+from src.bytecode.bytecode_compiler import BytecodeCompiler
+from src.bytecode.disassembler import disassemble
+from src.ast_nodes.serialization import dump_ast, iter_ast_json
+from src.language_server import serve_stdio
 import argparse
+import json
+import sys
 
 
 def parse_args():
     parser = argparse.ArgumentParser(description='UVM Assembler')
+    parser.add_argument('sources', nargs='*', help='Файлы, каталоги или glob-шаблоны для пакетной компиляции')
     parser.add_argument('--build-ast-verbose', '-v', action='store_true', help='Флаг вывода Абстрактного Синтаксического Дерева')
+    parser.add_argument('--ast-format', choices=['text', 'compact', 'line', 'dot'], default='text', help='Формат вывода AST для --build-ast-verbose: дерево, краткое дерево, одна строка или Graphviz DOT')
+    parser.add_argument('--ast-depth', type=int, default=None, help='Наибольшая глубина выводимых узлов AST')
+    parser.add_argument('--legacy-pipeline', action='store_true', help='Трехпроходная компиляция: Parser, SemanticAnalyzer, ASTBuilder')
+    parser.add_argument('--cache-dir', help='Каталог дискового кэша результатов компиляции')
+    parser.add_argument('--cache-size', type=int, default=64, help='Предельный размер кэша в мегабайтах')
+    parser.add_argument('--optimize', '-O', action='store_true', help='Оптимизация AST: свертка констант и анализ потока данных')
+    parser.add_argument('--run', action='store_true', help='Выполнить программу после компиляции')
+    parser.add_argument('--backend', choices=['ast', 'vm', 'python'], default='ast', help='Способ исполнения для --run: обход AST, байт-код или трансляция в Python')
+    parser.add_argument('--disassemble', action='store_true', help='Вывести байт-код программы')
+    parser.add_argument('--dump-ast', metavar='FILE', help='Сохранить AST в файл: JSON для .json, иначе двоичный формат')
+    parser.add_argument('--workers', '-j', type=int, default=None, help='Число процессов пакетной компиляции (по умолчанию - число ядер)')
+    parser.add_argument('--max-errors', type=int, default=DEFAULT_MAX_ERRORS, help='Сколько ошибок собрать за одну компиляцию (1 - остановка на первой)')
+    parser.add_argument('--stats', action='store_true', help='Время, память и объем данных по фазам компиляции')
+    parser.add_argument('--profile', action='store_true', help='Профиль компиляции (cProfile)')
+    parser.add_argument('--lsp', action='store_true', help='Запустить языковой сервер (LSP) на stdin/stdout')
+    parser.add_argument('--pattern', default='*', help='Шаблон имен файлов при обходе каталогов')
     
     return parser.parse_args()
 
+def run_batch(args):
+    # Пакетный режим: по одной строке JSON на файл
+    paths = expand_sources(args.sources, args.pattern)
+    failed = 0
+    for result in compile_batch(paths, workers=args.workers,
+                                legacy_pipeline=args.legacy_pipeline,
+                                cache_dir=args.cache_dir,
+                                cache_bytes=args.cache_size * 1024 * 1024,
+                                max_errors=args.max_errors, stats=args.stats):
+        failed += result['status'] != 'ok'
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+    return 1 if failed else 0
+
 def main():
     sample_code = """
     { Пример программы }
@@ -38,7 +78,42 @@ def main():
     end.
     """
     args = parse_args()
-    Compiler.compile(sample_code, ast_verbose=args.build_ast_verbose)
+    if args.lsp:
+        serve_stdio()
+    if args.sources:
+        sys.exit(run_batch(args))
+    
+    cache = None
+    if args.cache_dir:
+        cache = CompileCache(args.cache_dir, COMPILER_VERSION, args.cache_size * 1024 * 1024)
+    
+    # В stats.root остается дерево компиляции для --disassemble и --dump-ast
+    stats = CompileStats(trace_memory=args.stats, profile=args.profile)
+    
+    tokens = Compiler.compile(sample_code, ast_verbose=args.build_ast_verbose,
+                              legacy_pipeline=args.legacy_pipeline, cache=cache, run=args.run,
+                              backend=args.backend, optimize=args.optimize,
+                              max_errors=args.max_errors, stats=stats,
+                              ast_format=args.ast_format, ast_max_depth=args.ast_depth)
+    
+    if args.stats:
+        print(stats.format())
+    if args.profile:
+        print(stats.format_profile())
+    
+    if args.disassemble and tokens is not None:
+        print(disassemble(BytecodeCompiler().compile(stats.root)))
+    
+    if args.dump_ast and tokens is not None:
+        if args.dump_ast.endswith('.json'):
+            with open(args.dump_ast, 'w', encoding='utf-8') as file:
+                file.writelines(iter_ast_json(stats.root, indent=2))
+        else:
+            with open(args.dump_ast, 'wb') as file:
+                file.write(dump_ast(stats.root, tokens))
+    
+    if cache is not None:
+        print(f"Кэш: попаданий {cache.hits}, промахов {cache.misses}")
 
 if __name__ == "__main__":
     main()
@@ -1,339 +1,161 @@
 from src.ast_nodes.ast_node_type import NodeType
 from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.printer import TextPrinter
 
 from src.tokens.token import Token
 from src.tokens.token_type import TokenType
 
+from src.diagnostics import Diagnostics
 from src.parser import Parser
+from src.type_checker import DECLARED_TYPES
 
-from typing import List, Optional
+from typing import Iterable, List, Optional, TextIO
 
 
 class ASTBuilder(Parser):
-    def __init__(self, tokens: List[Token]):
-        super().__init__(tokens)
+    """Построение AST тем же разбором по таблице LL(1), что и в Parser"""
+
+    def __init__(self, tokens: Iterable[Token], strict: bool = False,
+                 diagnostics: Optional[Diagnostics] = None):
+        super().__init__(tokens, diagnostics)
         self.root = None
+        # В строгом режиме построитель проверяет синтаксис так же, как Parser,
+        # и отдельный проход Parser.parse() не нужен
+        self.strict = strict
+        # Действия правил грамматики: значения правой части -> узел
+        self._actions = {
+            'variables': self._build_variables,
+            'assignment': self._build_assignment,
+            'conditional': self._build_conditional,
+            'fixed_loop': self._build_fixed_loop,
+            'conditional_loop': self._build_conditional_loop,
+            'input': self._build_input,
+            'output': self._build_output,
+        }
 
     def parse(self):
-        self.root = ASTNode(NodeType.PROGRAM)
-        
-        # Пропускаем 'program'
-        self._match(TokenType.PROGRAM)
-        
-        # Пропускаем 'var'
-        self._match(TokenType.VAR)
+        self.root = ASTNode(NodeType.PROGRAM, children=[], token=self.stream.peek())
         
         # Добавляем объявления переменных
-        var_declarations = self._build_variable_declarations()
+        var_declarations = self.parse_header()
         self.root.children.extend(var_declarations)
         
-        # Пропускаем 'begin'
-        self._match(TokenType.BEGIN)
-        
         # Добавляем операторы
-        statements = self._build_statements()
-        self.root.children.extend(statements)
+        self.root.children.extend(statement for statement, _, _ in self.iter_statements())
         
         # Пропускаем 'end'
-        self._match(TokenType.END)
+        self.parse_end()
         
         return self.root
 
-    def _build_variable_declarations(self) -> List[ASTNode]:
-        declarations = []
-        
-        while not self._check(TokenType.BEGIN):
-            identifiers = []
-            while True:
-                if not self._check(TokenType.IDENTIFIER):
-                    break
-                
-                identifiers.append(self._advance().value)
-                
-                if not self._match(TokenType.COMMA):
-                    break
-            
-            # Пропускаем двоеточие
-            self._match(TokenType.COLON)
-            
-            # Получаем тип
-            var_type = self._advance().type
-            
-            # Создаем узел объявления переменных
-            for identifier in identifiers:
-                decl_node = ASTNode(
-                    type=NodeType.VARIABLE_DECLARATION, 
-                    value=identifier,
-                    children=[ASTNode(type=NodeType.IDENTIFIER, value=str(var_type))]
-                )
-                declarations.append(decl_node)
-            
-            # Пропускаем точку с запятой
-            self._match(TokenType.SEMICOLON)
-        
-        return declarations
-
-    def _build_statements(self) -> List[ASTNode]:
-        statements = []
-        
-        while not self._check(TokenType.END):
-            statement = self._build_statement()
-            if statement:
-                statements.append(statement)
-            
-            # Необязательная точка с запятой между операторами
-            self._match(TokenType.SEMICOLON)
-        
-        return statements
-
-    def _build_statement(self) -> Optional[ASTNode]:
-        if self._check(TokenType.IDENTIFIER):
-            return self._build_assignment()
-        elif self._check(TokenType.IF):
-            return self._build_conditional()
-        elif self._check(TokenType.FOR):
-            return self._build_fixed_loop()
-        elif self._check(TokenType.WHILE):
-            return self._build_conditional_loop()
-        elif self._check(TokenType.READ):
-            return self._build_input()
-        elif self._check(TokenType.WRITE):
-            return self._build_output()
-        
-        return None
+    def _reduce(self, name: str, values: list):
+        return self._actions[name](*values)
+
+    def _build_variables(self, identifiers: List[Optional[Token]], colon: Optional[Token],
+                         var_type: Optional[Token]) -> List[ASTNode]:
+        return [
+            ASTNode(
+                type=NodeType.VARIABLE_DECLARATION, 
+                value=identifier.value,
+                token=identifier,
+                value_type=DECLARED_TYPES[var_type.type] if var_type is not None else None,
+                symbol=identifier.symbol
+            )
+            for identifier in identifiers if identifier is not None
+        ]
 
-    def _build_assignment(self) -> ASTNode:
-        variable = self._advance().value
-        
-        # Пропускаем 'as'
-        self._match(TokenType.AS)
-        
-        # Разбираем выражение
-        expression = self._build_expression()
-        
+    def _build_assignment(self, variable: Token, as_token: Optional[Token],
+                          expression: ASTNode) -> ASTNode:
         return ASTNode(
             type=NodeType.ASSIGNMENT,
-            value=variable,
-            children=[expression]
+            value=variable.value,
+            children=[expression],
+            token=variable,
+            symbol=variable.symbol
         )
 
-    def _build_expression(self) -> ASTNode:
-        left_operand = self._build_operand()
-        
-        # Проверяем операции отношения
-        while self._check_types([
-            TokenType.NE, TokenType.EQ, TokenType.LT,
-            TokenType.LE, TokenType.GT, TokenType.GE
-        ]):
-            operator = self._advance().type
-            right_operand = self._build_operand()
-            
-            left_operand = ASTNode(
-                type=NodeType.BINARY_OPERATION,
-                value=str(operator),
-                children=[left_operand, right_operand]
-            )
-        
-        return left_operand
-
-    def _build_operand(self) -> ASTNode:
-        left_summand = self._build_summand()
-        
-        while self._check_types([TokenType.PLUS, TokenType.MIN, TokenType.OR]):
-            operator = self._advance().type
-            right_summand = self._build_summand()
-            
-            left_summand = ASTNode(
-                type=NodeType.BINARY_OPERATION,
-                value=str(operator),
-                children=[left_summand, right_summand]
-            )
-        
-        return left_summand
-
-    def _build_conditional(self) -> ASTNode:
-        # Пропускаем 'if'
-        self._match(TokenType.IF)
-        
-        # Разбираем условие
-        condition = self._build_expression()
-        
-        # Пропускаем 'then'
-        self._match(TokenType.THEN)
-        
-        # Разбираем оператор в случае истины
-        true_branch = self._build_statement()
-        
-        # Необязательный else
-        false_branch = None
-        if self._match(TokenType.ELSE):
-            false_branch = self._build_statement()
-        
+    def _build_conditional(self, start: Token, condition: ASTNode, then: Optional[Token],
+                           true_branch: ASTNode, false_branch: Optional[ASTNode]) -> ASTNode:
         return ASTNode(
             type=NodeType.CONDITIONAL,
-            children=[condition, true_branch, false_branch] if false_branch else [condition, true_branch]
+            children=[condition, true_branch, false_branch] if false_branch else [condition, true_branch],
+            token=start
         )
 
-    def _build_fixed_loop(self) -> ASTNode:
-        # Пропускаем 'for'
-        self._match(TokenType.FOR)
-        
-        # Начальное присваивание
-        initial_assignment = self._build_assignment()
-        
-        # Пропускаем 'to'
-        self._match(TokenType.TO)
-        
-        # Разбираем выражение завершения цикла
-        end_condition = self._build_expression()
-        
-        # Пропускаем 'do'
-        self._match(TokenType.DO)
-        
-        # Разбираем тело цикла
-        loop_body = self._build_statement()
-        
+    def _build_fixed_loop(self, start: Token, initial_assignment: ASTNode, to: Optional[Token],
+                          end_condition: ASTNode, do: Optional[Token], loop_body: ASTNode) -> ASTNode:
         return ASTNode(
             type=NodeType.LOOP,
             value='for',
-            children=[initial_assignment, end_condition, loop_body]
+            children=[initial_assignment, end_condition, loop_body],
+            token=start
         )
 
-    def _build_conditional_loop(self) -> ASTNode:
-        # Пропускаем 'while'
-        self._match(TokenType.WHILE)
-        
-        # Разбираем условие цикла
-        condition = self._build_expression()
-        
-        # Пропускаем 'do'
-        self._match(TokenType.DO)
-        
-        # Разбираем тело цикла
-        loop_body = self._build_statement()
-        
+    def _build_conditional_loop(self, start: Token, condition: ASTNode, do: Optional[Token],
+                                loop_body: ASTNode) -> ASTNode:
         return ASTNode(
             type=NodeType.LOOP,
             value='while',
-            children=[condition, loop_body]
+            children=[condition, loop_body],
+            token=start
         )
 
-    def _build_input(self) -> ASTNode:
-        # Пропускаем 'read'
-        self._match(TokenType.READ)
-        
-        # Пропускаем '('
-        self._match(TokenType.LPAREN)
-        
-        # Список переменных для ввода
-        input_vars = []
-        
-        while True:
-            if not self._check(TokenType.IDENTIFIER):
-                break
-            
-            input_vars.append(ASTNode(
-                type=NodeType.IDENTIFIER, 
-                value=self._advance().value
-            ))
-            
-            if not self._match(TokenType.COMMA):
-                break
-        
-        # Пропускаем ')'
-        self._match(TokenType.RPAREN)
-        
+    def _build_input(self, start: Token, lparen: Optional[Token], variables: List[Optional[Token]],
+                     rparen: Optional[Token]) -> ASTNode:
         return ASTNode(
             type=NodeType.INPUT,
-            children=input_vars
+            children=[
+                ASTNode(
+                    type=NodeType.IDENTIFIER, 
+                    value=variable.value,
+                    token=variable,
+                    symbol=variable.symbol
+                )
+                for variable in variables if variable is not None
+            ],
+            token=start
         )
 
-    def _build_output(self) -> ASTNode:
-        # Пропускаем 'write'
-        self._match(TokenType.WRITE)
-        
-        # Пропускаем '('
-        self._match(TokenType.LPAREN)
-        
-        # Список выражений для вывода
-        output_expressions = []
-        
-        while True:
-            output_expressions.append(self._build_expression())
-            
-            if not self._match(TokenType.COMMA):
-                break
-        
-        # Пропускаем ')'
-        self._match(TokenType.RPAREN)
-        
+    def _build_output(self, start: Token, lparen: Optional[Token], expressions: List[ASTNode],
+                      rparen: Optional[Token]) -> ASTNode:
         return ASTNode(
             type=NodeType.OUTPUT,
-            children=output_expressions
+            children=expressions,
+            token=start
         )
 
-    def _build_summand(self) -> ASTNode:
-        left_multiplier = self._build_multiplier()
-        
-        while self._check_types([TokenType.MULT, TokenType.DIV, TokenType.AND]):
-            operator = self._advance().type
-            right_multiplier = self._build_multiplier()
-            
-            left_multiplier = ASTNode(
-                type=NodeType.BINARY_OPERATION,
-                value=str(operator),
-                children=[left_multiplier, right_multiplier]
-            )
-        
-        return left_multiplier
-
-    def _build_multiplier(self) -> ASTNode:
-        if self._check(TokenType.IDENTIFIER):
+    def _operand(self, token: Token) -> ASTNode:
+        if token.type == TokenType.IDENTIFIER:
             return ASTNode(
                 type=NodeType.IDENTIFIER, 
-                value=self._advance().value
-            )
-        elif self._check(TokenType.INTEGER):
-            return ASTNode(
-                type=NodeType.LITERAL, 
-                value=self._advance().value,
-                children=[ASTNode(type=NodeType.IDENTIFIER, value='integer')]
-            )
-        elif self._check(TokenType.FLOAT):
-            return ASTNode(
-                type=NodeType.LITERAL, 
-                value=self._advance().value,
-                children=[ASTNode(type=NodeType.IDENTIFIER, value='float')]
-            )
-        elif self._check(TokenType.BOOLEAN):
-            return ASTNode(
-                type=NodeType.LITERAL, 
-                value=self._advance().value,
-                children=[ASTNode(type=NodeType.IDENTIFIER, value='boolean')]
-            )
-        elif self._check(TokenType.UNARY_NEGATION):
-            operator = self._advance().type
-            operand = self._build_multiplier()
-            
-            return ASTNode(
-                type=NodeType.UNARY_OPERATION,
-                value=str(operator),
-                children=[operand]
+                value=token.value,
+                token=token,
+                symbol=token.symbol
             )
-        elif self._match(TokenType.LPAREN):
-            expression = self._build_expression()
-            
-            # Пропускаем ')'
-            self._match(TokenType.RPAREN)
-            
-            return expression
-        else:
-            raise SyntaxError("Неожиданный множитель в выражении")
+        return ASTNode(
+            type=NodeType.LITERAL, 
+            value=token.value,
+            token=token,
+            value_type=token.type,
+            literal=token.value == 'true' if token.type == TokenType.BOOLEAN else token.literal
+        )
+
+    def _unary(self, operator: Token, operand: ASTNode) -> ASTNode:
+        return ASTNode(
+            type=NodeType.UNARY_OPERATION,
+            value=operator.type,
+            children=[operand],
+            token=operator
+        )
+
+    def _binary(self, operator: Token, left: ASTNode, right: ASTNode) -> ASTNode:
+        return ASTNode(
+            type=NodeType.BINARY_OPERATION,
+            value=operator.type,
+            children=[left, right],
+            token=operator
+        )
     
-    def print_ast(self, node: ASTNode, level: int = 0):
+    def print_ast(self, node: ASTNode, level: int = 0, stream: Optional[TextIO] = None):
         """Вспомогательный метод для печати дерева"""
-        indent = "  " * level
-        print(f"{indent}{node.type.name}: {node.value if node.value is not None else ''}")
-        
-        for child in node.children:
-            self.print_ast(child, level + 1)
+        TextPrinter(stream).print(node, level)
@@ -1,14 +1,43 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Union
 from src.ast_nodes.ast_node_type import NodeType
+from src.tokens.token import Token
+from src.tokens.token_type import TokenType
 
 
-@dataclass
+@dataclass(slots=True)
 class ASTNode:
+    # Без __dict__ узел занимает заметно меньше памяти на больших программах
     type: NodeType
-    value: Optional[str] = None
-    children: List['ASTNode'] = None
+    # Имя переменной, текст литерала, вид цикла или TokenType операции
+    value: Union[str, TokenType, None] = None
+    # Листья делят один пустой кортеж; изменяемые списки только у узлов с детьми
+    children: Sequence['ASTNode'] = ()
+    # Токен, с которого начинается конструкция; позиция берется из него без копирования
+    token: Optional[Token] = field(default=None, repr=False, compare=False)
+    # Тип выражения, выведенный TypeChecker; у литералов задается при построении
+    value_type: Optional[TokenType] = field(default=None, repr=False, compare=False)
+    # Значение литерала (int, float или bool), чтобы не разбирать текст повторно
+    literal: Union[int, float, bool, None] = field(default=None, repr=False, compare=False)
+    # Номер переменной в SymbolTable у объявлений, присваиваний и идентификаторов
+    symbol: Optional[int] = field(default=None, repr=False, compare=False)
 
-    def __post_init__(self):
-        if self.children is None:
-            self.children = []
+    @property
+    def offset(self) -> Optional[int]:
+        return self.token.offset if self.token is not None else None
+
+    @property
+    def line(self) -> Optional[int]:
+        return self.token.line if self.token is not None else None
+
+    @property
+    def column(self) -> Optional[int]:
+        return self.token.column if self.token is not None else None
+
+    @property
+    def location(self) -> str:
+        return self.token.location if self.token is not None else ''
+
+    def error(self, message: str, error_type: type = SyntaxError) -> Exception:
+        """Ошибка с позицией токена узла, если она известна"""
+        return self.token.error(message, error_type) if self.token is not None else error_type(message)
@@ -0,0 +1,218 @@
+"""Печать AST в текстовый поток.
+
+Обход дерева один, явным стеком; формат задает подкласс ASTPrinter
+методами enter (узел) и leave (после детей узла). Строки копятся в
+буфере и уходят в поток одной записью на каждые BUFFER_PARTS частей,
+а не вызовом print на узел.
+"""
+import sys
+
+from typing import Dict, List, Optional, TextIO, Type
+
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.ast_node_type import NodeType
+from src.tokens.token_type import TokenType
+
+
+# Тип литерала и объявленной переменной хранится в value_type; текстовый
+# формат выводит его прежним дочерним узлом
+LITERAL_TYPE_NAMES = {
+    TokenType.INTEGER: 'integer',
+    TokenType.FLOAT: 'float',
+    TokenType.BOOLEAN: 'boolean'
+}
+DECLARATION_TYPE_NAMES = {
+    TokenType.INTEGER: str(TokenType.INTEGER_TYPE),
+    TokenType.FLOAT: str(TokenType.FLOAT_TYPE),
+    TokenType.BOOLEAN: str(TokenType.BOOLEAN_TYPE)
+}
+
+# Enum.name - свойство и заметно медленнее поиска в словаре
+NODE_NAMES = {node_type: node_type.name for node_type in NodeType}
+
+
+class ASTPrinter:
+    """Обход дерева с записью в поток; max_depth - глубина, глубже которой узлы не выводятся.
+
+    enter возвращает текст узла; остальные методы пишут через write.
+    """
+
+    # Число частей текста в буфере перед записью в поток
+    BUFFER_PARTS = 4096
+
+    def __init__(self, stream: Optional[TextIO] = None, max_depth: Optional[int] = None):
+        # Поток по умолчанию берется при печати, чтобы работала подмена sys.stdout
+        self.stream = stream
+        self.max_depth = max_depth
+        self._parts: List[str] = []
+
+    def print(self, root: Optional[ASTNode], level: int = 0):
+        stream = self.stream if self.stream is not None else sys.stdout
+        # Глубина корня: print_ast печатает поддерево с отступом level
+        self.level = level
+        self.begin(root)
+        max_depth = self.max_depth
+        parts = self._parts
+        enter = self.enter
+        # Элементы стека: (узел, глубина, после детей)
+        stack = [(root, level, False)] if root is not None else []
+        while stack:
+            node, depth, done = stack.pop()
+            if done:
+                self.leave(node, depth)
+                continue
+            parts.append(enter(node, depth))
+            if len(parts) >= self.BUFFER_PARTS:
+                self._flush(stream)
+            if not node.children:
+                continue
+            stack.append((node, depth, True))
+            if max_depth is not None and depth - level >= max_depth:
+                self.truncated(node, depth)
+                continue
+            for child in reversed(node.children):
+                if child is not None:
+                    stack.append((child, depth + 1, False))
+        self.end(root)
+        self._flush(stream)
+
+    def write(self, text: str):
+        self._parts.append(text)
+
+    def _flush(self, stream: TextIO):
+        if self._parts:
+            stream.write(''.join(self._parts))
+            self._parts.clear()
+
+    def begin(self, root: Optional[ASTNode]):
+        pass
+
+    def end(self, root: Optional[ASTNode]):
+        pass
+
+    def enter(self, node: ASTNode, depth: int) -> str:
+        raise NotImplementedError
+
+    def leave(self, node: ASTNode, depth: int):
+        """Вызывается после детей узла, у которого они есть"""
+
+    def truncated(self, node: ASTNode, depth: int):
+        """Дети узла не выводятся из-за max_depth"""
+
+
+class TextPrinter(ASTPrinter):
+    """Дерево с отступами, по строке на узел; формат ASTBuilder.print_ast"""
+
+    # Начала строк по типу узла
+    PREFIXES = {node_type: f"{name}: " for node_type, name in NODE_NAMES.items()}
+
+    def __init__(self, stream: Optional[TextIO] = None, max_depth: Optional[int] = None):
+        super().__init__(stream, max_depth)
+        self._indents: List[str] = []
+
+    def enter(self, node: ASTNode, depth: int) -> str:
+        indents = self._indents
+        while len(indents) <= depth + 1:
+            indents.append("  " * len(indents))
+        value = node.value
+        line = f"{indents[depth]}{self.PREFIXES[node.type]}{value if value is not None else ''}\n"
+        if node.type is NodeType.LITERAL:
+            line += f"{indents[depth + 1]}{NodeType.IDENTIFIER.name}: {LITERAL_TYPE_NAMES[node.value_type]}\n"
+        elif node.type is NodeType.VARIABLE_DECLARATION:
+            type_name = DECLARATION_TYPE_NAMES.get(node.value_type)
+            line += f"{indents[depth + 1]}{NodeType.IDENTIFIER.name}: {type_name if type_name is not None else ''}\n"
+        return line
+
+    def truncated(self, node: ASTNode, depth: int):
+        self.write(f"{'  ' * (depth + 1)}...\n")
+
+
+def compact_label(node: ASTNode) -> str:
+    """Тип узла и значение без лишних символов; у литерала и объявления еще тип"""
+    value = node.value
+    if value is None:
+        return NODE_NAMES[node.type]
+    if value.__class__ is TokenType:
+        value = value.name
+    if node.type is NodeType.LITERAL or node.type is NodeType.VARIABLE_DECLARATION:
+        return f"{NODE_NAMES[node.type]} {value}:{LITERAL_TYPE_NAMES.get(node.value_type, '')}"
+    return f"{NODE_NAMES[node.type]} {value}"
+
+
+class CompactPrinter(ASTPrinter):
+    """Дерево с отступом в один пробел и короткими строками узлов"""
+
+    def enter(self, node: ASTNode, depth: int) -> str:
+        return f"{' ' * depth}{compact_label(node)}\n"
+
+    def truncated(self, node: ASTNode, depth: int):
+        self.write(f"{' ' * (depth + 1)}...\n")
+
+
+class LinePrinter(ASTPrinter):
+    """Дерево одной строкой: узел(ребенок, ребенок)"""
+
+    def begin(self, root: Optional[ASTNode]):
+        # Перед узлом нужна запятая, если он не первый ребенок
+        self._first = True
+
+    def end(self, root: Optional[ASTNode]):
+        self.write("\n")
+
+    def enter(self, node: ASTNode, depth: int) -> str:
+        text = compact_label(node) if self._first else f", {compact_label(node)}"
+        self._first = bool(node.children)
+        return f"{text}(" if node.children else text
+
+    def leave(self, node: ASTNode, depth: int):
+        self.write(")")
+        self._first = False
+
+    def truncated(self, node: ASTNode, depth: int):
+        self.write("...")
+
+
+class DotPrinter(ASTPrinter):
+    """Граф Graphviz DOT: вершина на узел, ребро от родителя к ребенку"""
+
+    def begin(self, root: Optional[ASTNode]):
+        self._count = 0
+        # Номера вершин на пути от корня: родитель узла глубины d - _path[d - 1]
+        self._path: List[int] = []
+        self.write('digraph AST {\n    node [shape=box, fontname="monospace"];\n')
+
+    def end(self, root: Optional[ASTNode]):
+        self.write("}\n")
+
+    def enter(self, node: ASTNode, depth: int) -> str:
+        level = depth - self.level
+        text = self._vertex(compact_label(node), level)
+        del self._path[level:]
+        self._path.append(self._count - 1)
+        return text
+
+    def truncated(self, node: ASTNode, depth: int):
+        self.write(self._vertex("...", depth - self.level + 1, 'style=dashed, '))
+
+    def _vertex(self, label: str, level: int, style: str = '') -> str:
+        index = self._count
+        self._count += 1
+        label = label.replace('\\', '\\\\').replace('"', '\\"')
+        text = f'    n{index} [{style}label="{label}"];\n'
+        if level:
+            text += f"    n{self._path[level - 1]} -> n{index};\n"
+        return text
+
+
+PRINTERS: Dict[str, Type[ASTPrinter]] = {
+    'text': TextPrinter,
+    'compact': CompactPrinter,
+    'line': LinePrinter,
+    'dot': DotPrinter,
+}
+
+
+def print_ast(root: Optional[ASTNode], stream: Optional[TextIO] = None, style: str = 'text',
+              max_depth: Optional[int] = None):
+    """Печать дерева в поток (по умолчанию sys.stdout) в формате style из PRINTERS"""
+    PRINTERS[style](stream, max_depth).print(root)
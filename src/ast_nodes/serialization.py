@@ -0,0 +1,292 @@
+"""Двоичный и JSON форматы AST.
+
+Двоичный формат: заголовок MAGIC и версия, таблица строк (число строк,
+затем длина и UTF-8 каждой), число узлов и узлы в прямом порядке. Узел -
+код NodeType, байт флагов, поля, отмеченные флагами, и число детей.
+Целые числа записываются varint (7 бит на байт, старший бит - продолжение),
+номер токена - разностью с номером токена предыдущего узла.
+
+Загрузчик читает данные через memoryview без копирования и восстанавливает
+дерево на явном стеке, поэтому глубина дерева не ограничена.
+"""
+import json
+import struct
+
+from typing import Dict, Iterator, Optional, Sequence, Union
+
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.ast_node_type import NodeType
+from src.tokens.token import Token
+from src.tokens.token_type import TokenType
+
+
+MAGIC = b'UAST'
+FORMAT_VERSION = 1
+
+NODE_TYPES = list(NodeType)
+TOKEN_TYPES = list(TokenType)
+NODE_CODES = {node_type: code for code, node_type in enumerate(NODE_TYPES)}
+TOKEN_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}
+
+# Флаги узла: какие поля записаны после байта флагов
+VALUE_STRING = 0x01
+VALUE_OPERATOR = 0x02
+HAS_TOKEN = 0x04
+HAS_VALUE_TYPE = 0x08
+HAS_SYMBOL = 0x10
+# Два бита вида литерала: целое (zigzag varint), вещественное (8 байт), логическое (байт)
+LITERAL_MASK = 0x60
+LITERAL_INT = 0x20
+LITERAL_FLOAT = 0x40
+LITERAL_BOOL = 0x60
+HAS_CHILDREN = 0x80
+
+DOUBLE = struct.Struct('<d')
+
+
+def _write_varint(output: bytearray, value: int):
+    while value > 0x7F:
+        output.append(value & 0x7F | 0x80)
+        value >>= 7
+    output.append(value)
+
+
+def dump_ast(root: ASTNode, tokens: Optional[Sequence[Token]] = None) -> bytes:
+    """Двоичная запись дерева; токены узлов сохраняются номерами в tokens"""
+    token_indexes = {id(token): index for index, token in enumerate(tokens)} if tokens else {}
+    strings: Dict[str, int] = {}
+    body = bytearray()
+    count = 0
+    previous_token = 0
+
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        body.append(NODE_CODES[node.type])
+        # Байт флагов заполняется после полей
+        flags_position = len(body)
+        body.append(0)
+        flags = 0
+
+        value = node.value
+        if value.__class__ is TokenType:
+            flags = VALUE_OPERATOR
+            body.append(TOKEN_CODES[value])
+        elif value is not None:
+            flags = VALUE_STRING
+            _write_varint(body, strings.setdefault(value, len(strings)))
+
+        token_index = token_indexes.get(id(node.token))
+        if token_index is not None:
+            flags |= HAS_TOKEN
+            # Разность с номером токена предыдущего узла обычно умещается в байт
+            delta = token_index - previous_token
+            _write_varint(body, delta << 1 if delta >= 0 else (-delta << 1) - 1)
+            previous_token = token_index
+        if node.value_type is not None:
+            flags |= HAS_VALUE_TYPE
+            body.append(TOKEN_CODES[node.value_type])
+        if node.symbol is not None:
+            flags |= HAS_SYMBOL
+            _write_varint(body, node.symbol)
+
+        literal = node.literal
+        if literal is None:
+            pass
+        elif literal.__class__ is bool:
+            flags |= LITERAL_BOOL
+            body.append(literal)
+        elif literal.__class__ is int:
+            flags |= LITERAL_INT
+            _write_varint(body, literal << 1 if literal >= 0 else (-literal << 1) - 1)
+        else:
+            flags |= LITERAL_FLOAT
+            body += DOUBLE.pack(literal)
+
+        children = node.children
+        if children:
+            if None in children:
+                children = [child for child in children if child is not None]
+            flags |= HAS_CHILDREN
+            _write_varint(body, len(children))
+            stack.extend(reversed(children))
+        body[flags_position] = flags
+
+    output = bytearray(MAGIC)
+    output.append(FORMAT_VERSION)
+    _write_varint(output, len(strings))
+    for string in strings:
+        encoded = string.encode('utf-8')
+        _write_varint(output, len(encoded))
+        output += encoded
+    _write_varint(output, count)
+    output += body
+    return bytes(output)
+
+
+def _read_varint(view: memoryview, position: int):
+    # Многобайтовый varint: (значение, позиция после него)
+    result = shift = 0
+    while True:
+        byte = view[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+
+def load_ast(data: Union[bytes, bytearray, memoryview], tokens: Optional[Sequence[Token]] = None) -> ASTNode:
+    """Дерево из двоичной записи dump_ast; tokens - тот же поток, что при записи"""
+    view = memoryview(data)
+    if len(view) <= len(MAGIC) or view[:len(MAGIC)] != MAGIC or view[len(MAGIC)] != FORMAT_VERSION:
+        raise ValueError("Неизвестный формат AST")
+    position = len(MAGIC) + 1
+    node_types = NODE_TYPES
+    token_types = TOKEN_TYPES
+    read_varint = _read_varint
+
+    try:
+        strings = []
+        string_count, position = read_varint(view, position)
+        for _ in range(string_count):
+            length, position = read_varint(view, position)
+            strings.append(str(view[position:position + length], 'utf-8'))
+            position += length
+        count, position = read_varint(view, position)
+
+        # Узлы в прямом порядке и число детей каждого; связи строятся вторым проходом
+        nodes = []
+        counts = []
+        token_index = 0
+        for _ in range(count):
+            node_type = node_types[view[position]]
+            flags = view[position + 1]
+            position += 2
+
+            # Однобайтовые varint (меньше 128) читаются без вызова функции
+            value = token = value_type = literal = symbol = None
+            if flags & VALUE_STRING:
+                index = view[position]
+                if index < 0x80:
+                    position += 1
+                else:
+                    index, position = read_varint(view, position)
+                value = strings[index]
+            elif flags & VALUE_OPERATOR:
+                value = token_types[view[position]]
+                position += 1
+            if flags & HAS_TOKEN:
+                delta = view[position]
+                if delta < 0x80:
+                    position += 1
+                else:
+                    delta, position = read_varint(view, position)
+                token_index += delta >> 1 if not delta & 1 else -((delta + 1) >> 1)
+                if tokens is not None:
+                    token = tokens[token_index]
+            if flags & HAS_VALUE_TYPE:
+                value_type = token_types[view[position]]
+                position += 1
+            if flags & HAS_SYMBOL:
+                symbol = view[position]
+                if symbol < 0x80:
+                    position += 1
+                else:
+                    symbol, position = read_varint(view, position)
+
+            if flags & LITERAL_MASK:
+                literal_kind = flags & LITERAL_MASK
+                if literal_kind == LITERAL_INT:
+                    encoded, position = read_varint(view, position)
+                    literal = encoded >> 1 if not encoded & 1 else -((encoded + 1) >> 1)
+                elif literal_kind == LITERAL_FLOAT:
+                    literal = DOUBLE.unpack_from(view, position)[0]
+                    position += 8
+                else:
+                    literal = view[position] == 1
+                    position += 1
+
+            children_count = 0
+            if flags & HAS_CHILDREN:
+                children_count = view[position]
+                if children_count < 0x80:
+                    position += 1
+                else:
+                    children_count, position = read_varint(view, position)
+            nodes.append(ASTNode(node_type, value, (), token, value_type, literal, symbol))
+            counts.append(children_count)
+
+        # С конца прямого порядка дети каждого узла лежат на вершине стека,
+        # первый ребенок - сверху
+        stack = []
+        for index in range(count - 1, -1, -1):
+            node = nodes[index]
+            children_count = counts[index]
+            if children_count:
+                if children_count > len(stack):
+                    raise ValueError("Поврежденная запись AST")
+                node.children = stack[:-children_count - 1:-1]
+                del stack[-children_count:]
+            stack.append(node)
+    except (IndexError, KeyError, UnicodeDecodeError, struct.error) as error:
+        raise ValueError(f"Поврежденная запись AST: {error}") from None
+
+    if len(stack) != 1 or position != len(view):
+        raise ValueError("Поврежденная запись AST")
+    return stack[0]
+
+
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def _json_fields(node: ASTNode) -> dict:
+    fields = {'type': node.type.name}
+    if isinstance(node.value, TokenType):
+        fields['value'] = node.value.name
+    elif node.value is not None:
+        fields['value'] = node.value
+    if node.value_type is not None:
+        fields['value_type'] = node.value_type.name
+    if node.literal is not None:
+        fields['literal'] = node.literal
+    if node.symbol is not None:
+        fields['symbol'] = node.symbol
+    if node.token is not None:
+        fields['offset'] = node.offset
+        if node.token.source_map is not None:
+            fields['line'] = node.line
+            fields['column'] = node.column
+    return fields
+
+
+def iter_ast_json(root: ASTNode, indent: Optional[int] = None) -> Iterator[str]:
+    """Дерево в JSON по частям: объекты узлов с полем children; стек явный"""
+    newline = '\n' if indent is not None else ''
+    separator = ', ' if indent is None else ','
+    # Элементы стека: узел для записи или закрывающая скобка его списка детей
+    stack: list = [(root, 0)]
+    while stack:
+        item, depth = stack.pop()
+        pad = ' ' * (indent * depth) if indent is not None else ''
+        if isinstance(item, str):
+            yield item
+            continue
+
+        fields = _JSON_ENCODER.encode(_json_fields(item))[:-1]
+        children = [child for child in item.children if child is not None]
+        if not children:
+            yield f"{pad}{fields}, \"children\": []}}"
+            continue
+        yield f"{pad}{fields}, \"children\": [{newline}"
+        stack.append((f"{newline}{pad}]}}", depth))
+        for index in range(len(children) - 1, -1, -1):
+            if index < len(children) - 1:
+                stack.append((separator + newline, depth))
+            stack.append((children[index], depth + 1))
+
+
+def dump_ast_json(root: ASTNode, indent: Optional[int] = None) -> str:
+    """Дерево в JSON для отладки и внешних инструментов"""
+    return ''.join(iter_ast_json(root, indent))
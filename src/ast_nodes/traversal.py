@@ -0,0 +1,55 @@
+from typing import Any, Generator, Iterator, Optional, Tuple
+
+from src.ast_nodes.ast_node import ASTNode
+
+
+def walk(root: Optional[ASTNode]) -> Iterator[Tuple[ASTNode, int]]:
+    """Узлы дерева в прямом порядке вместе с глубиной; стек явный, без рекурсии"""
+    stack = [(root, 0)] if root is not None else []
+    while stack:
+        node, depth = stack.pop()
+        yield node, depth
+        # Дети кладутся в обратном порядке, чтобы первым выйти первому ребенку
+        for child in reversed(node.children):
+            if child is not None:
+                stack.append((child, depth + 1))
+
+
+def postorder(root: Optional[ASTNode]) -> Iterator[ASTNode]:
+    """Узлы дерева в обратном порядке: каждый узел после всех своих детей"""
+    stack = [(root, False)] if root is not None else []
+    while stack:
+        node, visited = stack.pop()
+        if visited:
+            yield node
+            continue
+        stack.append((node, True))
+        for child in reversed(node.children):
+            if child is not None:
+                stack.append((child, False))
+
+
+def count_nodes(root: Optional[ASTNode]) -> int:
+    return sum(1 for _ in walk(root))
+
+
+def trampoline(steps: Generator) -> Any:
+    """Рекурсивный обход без рекурсии Python.
+    
+    Вместо вызова себя для ребенка генератор отдает через yield генератор
+    подзадачи и получает ее результат; подзадачи лежат на явном стеке.
+    Возвращает результат внешнего генератора.
+    """
+    stack = [steps]
+    result = None
+    while True:
+        try:
+            subtask = stack[-1].send(result)
+        except StopIteration as stop:
+            stack.pop()
+            if not stack:
+                return stop.value
+            result = stop.value
+            continue
+        stack.append(subtask)
+        result = None
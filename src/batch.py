@@ -0,0 +1,87 @@
+import glob
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+
+from src.compile_cache import CompileCache
+from src.compile_stats import CompileStats
+from src.compiler import Compiler, COMPILER_VERSION
+from src.diagnostics import CompilationErrors, DEFAULT_MAX_ERRORS
+
+
+# Состояние процесса-исполнителя, создается один раз в _init_worker
+_worker_cache: Optional[CompileCache] = None
+_worker_legacy_pipeline = False
+_worker_max_errors = DEFAULT_MAX_ERRORS
+_worker_stats = False
+
+
+def expand_sources(sources: Iterable[str], pattern: str = '*') -> List[str]:
+    """Файлы, каталоги (с рекурсивным обходом по pattern) и glob-шаблоны -> список файлов"""
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            matches = glob.glob(os.path.join(source, '**', pattern), recursive=True)
+        elif glob.has_magic(source):
+            matches = glob.glob(source, recursive=True)
+        else:
+            matches = [source]
+        paths.extend(sorted(path for path in matches if not os.path.isdir(path)))
+    return paths
+
+
+def compile_file(path: str) -> dict:
+    start = time.perf_counter()
+    result = {'file': path}
+    stats = CompileStats(trace_memory=True) if _worker_stats else None
+    try:
+        with open(path, encoding='utf-8') as file:
+            code = file.read()
+        tokens, _ = Compiler.build(code, legacy_pipeline=_worker_legacy_pipeline,
+                                   cache=_worker_cache, max_errors=_worker_max_errors,
+                                   stats=stats)
+        result['status'] = 'ok'
+        result['tokens'] = len(tokens)
+    except CompilationErrors as e:
+        result['status'] = 'error'
+        result['error'] = str(e.errors[0])
+        result['errors'] = [str(error) for error in e.errors]
+        result['truncated'] = e.truncated
+    except SyntaxError as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+    except (OSError, UnicodeDecodeError) as e:
+        result['status'] = 'error'
+        result['error'] = f"Ошибка чтения файла: {e}"
+    
+    result['seconds'] = round(time.perf_counter() - start, 6)
+    if stats is not None:
+        result['stats'] = stats.as_dict()
+    return result
+
+
+def compile_batch(paths: List[str], workers: Optional[int] = None,
+                  legacy_pipeline: bool = False, cache_dir: Optional[str] = None,
+                  cache_bytes: int = 64 * 1024 * 1024, max_errors: int = DEFAULT_MAX_ERRORS,
+                  stats: bool = False) -> Iterator[dict]:
+    """Компиляция файлов в пуле процессов; результаты выдаются в порядке paths"""
+    workers = workers or os.cpu_count() or 1
+    # Крупные порции уменьшают накладные расходы на передачу задач между процессами
+    chunksize = max(1, len(paths) // (workers * 4))
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(legacy_pipeline, cache_dir, cache_bytes, max_errors,
+                                       stats)) as executor:
+        yield from executor.map(compile_file, paths, chunksize=chunksize)
+
+
+def _init_worker(legacy_pipeline: bool, cache_dir: Optional[str], cache_bytes: int,
+                 max_errors: int = DEFAULT_MAX_ERRORS, stats: bool = False):
+    global _worker_cache, _worker_legacy_pipeline, _worker_max_errors, _worker_stats
+    _worker_legacy_pipeline = legacy_pipeline
+    _worker_max_errors = max_errors
+    _worker_stats = stats
+    if cache_dir:
+        _worker_cache = CompileCache(cache_dir, COMPILER_VERSION, cache_bytes)
@@ -0,0 +1,189 @@
+from typing import Dict, Generator, Optional
+
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.ast_node_type import NodeType
+from src.ast_nodes.traversal import trampoline
+from src.bytecode.code_object import CodeObject
+from src.bytecode.opcode import Opcode
+from src.interpreter import literal_value
+from src.tokens.token_type import TokenType
+
+
+BINARY_OPCODES = {
+    TokenType.PLUS: Opcode.ADD,
+    TokenType.MIN: Opcode.SUB,
+    TokenType.MULT: Opcode.MUL,
+    TokenType.DIV: Opcode.DIV,
+    TokenType.NE: Opcode.NE,
+    TokenType.EQ: Opcode.EQ,
+    TokenType.LT: Opcode.LT,
+    TokenType.LE: Opcode.LE,
+    TokenType.GT: Opcode.GT,
+    TokenType.GE: Opcode.GE
+}
+
+
+class BytecodeCompiler:
+    """Трансляция AST в байт-код стековой машины.
+    
+    _statement и _expression - генераторы для trampoline: вложенные узлы
+    транслируются на явном стеке, и глубина AST не ограничена рекурсией.
+    """
+
+    def __init__(self):
+        self.code_object = CodeObject()
+        # Слоты переменных по номеру идентификатора (ASTNode.symbol)
+        self._slots: Dict[int, int] = {}
+        self._constants: Dict[tuple, int] = {}
+        self._offset = -1
+
+    def compile(self, root: ASTNode) -> CodeObject:
+        for node in root.children:
+            if node.type == NodeType.VARIABLE_DECLARATION:
+                self._declare(node.value, node.value_type, node.symbol)
+            else:
+                trampoline(self._statement(node))
+        
+        self._emit(Opcode.HALT)
+        if root.token is not None:
+            self.code_object.source_map = root.token.source_map
+        return self.code_object
+
+    def _declare(self, name: str, var_type: Optional[TokenType],
+                 symbol: Optional[int] = None) -> int:
+        # Скрытые слоты (symbol=None) не связаны с переменными программы
+        if symbol in self._slots:
+            return self._slots[symbol]
+        slot = len(self.code_object.names)
+        self.code_object.names.append(name)
+        self.code_object.slot_types.append(var_type)
+        if symbol is not None:
+            self._slots[symbol] = slot
+        return slot
+
+    def _slot(self, node: ASTNode) -> int:
+        slot = self._slots.get(node.symbol)
+        if slot is None:
+            raise node.error(f"Необъявленная переменная: {node.value}")
+        return slot
+
+    def _constant(self, value) -> int:
+        # Ключ учитывает тип: 1, 1.0 и true не должны сливаться в одну константу
+        key = (type(value), value)
+        if key not in self._constants:
+            self._constants[key] = len(self.code_object.constants)
+            self.code_object.constants.append(value)
+        return self._constants[key]
+
+    def _emit(self, opcode: Opcode, argument: int = 0) -> int:
+        code = self.code_object.code
+        position = len(code)
+        code.append(opcode)
+        code.append(argument)
+        self.code_object.offsets.append(self._offset)
+        return position
+
+    def _patch(self, position: int, target: int):
+        self.code_object.code[position + 1] = target
+
+    def _here(self) -> int:
+        return len(self.code_object.code)
+
+    def _track(self, node: ASTNode):
+        if node.token is not None:
+            self._offset = node.token.offset
+
+    def _store(self, node: ASTNode):
+        slot = self._slot(node)
+        if self.code_object.slot_types[slot] == TokenType.FLOAT:
+            self._emit(Opcode.TO_FLOAT)
+        self._emit(Opcode.STORE_VAR, slot)
+
+    def _statement(self, node: Optional[ASTNode]) -> Generator:
+        if node is None:
+            return
+        self._track(node)
+        
+        if node.type == NodeType.ASSIGNMENT:
+            yield self._expression(node.children[0])
+            self._store(node)
+        elif node.type == NodeType.CONDITIONAL:
+            yield self._expression(node.children[0])
+            jump_to_else = self._emit(Opcode.JUMP_IF_FALSE)
+            yield self._statement(node.children[1])
+            if len(node.children) > 2:
+                jump_to_end = self._emit(Opcode.JUMP)
+                self._patch(jump_to_else, self._here())
+                yield self._statement(node.children[2])
+                self._patch(jump_to_end, self._here())
+            else:
+                self._patch(jump_to_else, self._here())
+        elif node.type == NodeType.LOOP and node.value == 'for':
+            yield self._fixed_loop(node)
+        elif node.type == NodeType.LOOP:
+            condition, loop_body = node.children
+            loop_start = self._here()
+            yield self._expression(condition)
+            jump_to_end = self._emit(Opcode.JUMP_IF_FALSE)
+            yield self._statement(loop_body)
+            self._emit(Opcode.JUMP, loop_start)
+            self._patch(jump_to_end, self._here())
+        elif node.type == NodeType.INPUT:
+            for child in node.children:
+                self._track(child)
+                self._emit(Opcode.READ, self._slot(child))
+        elif node.type == NodeType.OUTPUT:
+            for child in node.children:
+                yield self._expression(child)
+            self._emit(Opcode.WRITE, len(node.children))
+
+    def _fixed_loop(self, node: ASTNode) -> Generator:
+        initial_assignment, end_condition, loop_body = node.children
+        slot = self._slot(initial_assignment)
+        
+        yield self._statement(initial_assignment)
+        
+        # Граница вычисляется один раз и хранится в скрытом слоте
+        end_slot = self._declare(f"for#{self._here()}", None)
+        yield self._expression(end_condition)
+        self._emit(Opcode.STORE_VAR, end_slot)
+        
+        loop_start = self._here()
+        self._emit(Opcode.LOAD_VAR, slot)
+        self._emit(Opcode.LOAD_VAR, end_slot)
+        self._emit(Opcode.LE)
+        jump_to_end = self._emit(Opcode.JUMP_IF_FALSE)
+        yield self._statement(loop_body)
+        
+        self._emit(Opcode.LOAD_VAR, slot)
+        self._emit(Opcode.LOAD_CONST, self._constant(1))
+        self._emit(Opcode.ADD)
+        self._store(initial_assignment)
+        self._emit(Opcode.JUMP, loop_start)
+        self._patch(jump_to_end, self._here())
+
+    def _expression(self, node: ASTNode) -> Generator:
+        self._track(node)
+        
+        if node.type == NodeType.IDENTIFIER:
+            self._emit(Opcode.LOAD_VAR, self._slot(node))
+        elif node.type == NodeType.LITERAL:
+            self._emit(Opcode.LOAD_CONST, self._constant(literal_value(node)))
+        elif node.type == NodeType.UNARY_OPERATION:
+            yield self._expression(node.children[0])
+            self._emit(Opcode.NOT)
+        else:
+            operator_type = node.value
+            yield self._expression(node.children[0])
+            
+            # and/or по короткой схеме: при известном результате правая часть пропускается
+            if operator_type in (TokenType.AND, TokenType.OR):
+                opcode = (Opcode.JUMP_IF_FALSE_OR_POP if operator_type == TokenType.AND
+                          else Opcode.JUMP_IF_TRUE_OR_POP)
+                jump_to_end = self._emit(opcode)
+                yield self._expression(node.children[1])
+                self._patch(jump_to_end, self._here())
+            else:
+                yield self._expression(node.children[1])
+                self._track(node)
+                self._emit(BINARY_OPCODES[operator_type])
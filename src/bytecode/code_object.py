@@ -0,0 +1,21 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from src.tokens.token_type import TokenType
+
+
+@dataclass
+class CodeObject:
+    """Результат трансляции: линейный байт-код и его таблицы.
+    
+    Каждая инструкция занимает два элемента code: код операции и аргумент
+    (0, если аргумент не нужен). Переменные адресуются номером слота.
+    """
+    code: array = field(default_factory=lambda: array('i'))
+    constants: List[object] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    slot_types: List[Optional[TokenType]] = field(default_factory=list)
+    # Смещение в исходном тексте для каждой инструкции (-1, если неизвестно)
+    offsets: array = field(default_factory=lambda: array('i'))
+    source_map: Optional[object] = None
@@ -0,0 +1,28 @@
+from src.bytecode.code_object import CodeObject
+from src.bytecode.opcode import Opcode
+
+
+# Инструкции, аргумент которых не используется
+NO_ARGUMENT = {
+    Opcode.TO_FLOAT, Opcode.ADD, Opcode.SUB, Opcode.MUL, Opcode.DIV,
+    Opcode.NE, Opcode.EQ, Opcode.LT, Opcode.LE, Opcode.GT, Opcode.GE,
+    Opcode.NOT, Opcode.HALT
+}
+
+
+def disassemble(code_object: CodeObject) -> str:
+    lines = []
+    code = code_object.code
+    for position in range(0, len(code), 2):
+        opcode = Opcode(code[position])
+        argument = code[position + 1]
+        
+        line = f"{position:06d} {opcode.name:<22}"
+        if opcode not in NO_ARGUMENT:
+            line += f"{argument:<6}"
+            if opcode == Opcode.LOAD_CONST:
+                line += f"({code_object.constants[argument]!r})"
+            elif opcode in (Opcode.LOAD_VAR, Opcode.STORE_VAR, Opcode.READ):
+                line += f"({code_object.names[argument]})"
+        lines.append(line.rstrip())
+    return '\n'.join(lines)
@@ -0,0 +1,37 @@
+from enum import IntEnum
+
+class Opcode(IntEnum):
+    # Стек и переменные
+    LOAD_CONST = 0
+    LOAD_VAR = 1
+    STORE_VAR = 2
+    TO_FLOAT = 3
+    
+    # Арифметика
+    ADD = 4
+    SUB = 5
+    MUL = 6
+    DIV = 7
+    
+    # Сравнения
+    NE = 8
+    EQ = 9
+    LT = 10
+    LE = 11
+    GT = 12
+    GE = 13
+    
+    # Логика
+    NOT = 14
+    JUMP_IF_FALSE_OR_POP = 15
+    JUMP_IF_TRUE_OR_POP = 16
+    
+    # Переходы
+    JUMP = 17
+    JUMP_IF_FALSE = 18
+    
+    # Ввод и вывод
+    READ = 19
+    WRITE = 20
+    
+    HALT = 21
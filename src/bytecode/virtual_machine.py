@@ -0,0 +1,152 @@
+import sys
+
+from typing import Iterator, List, Optional, TextIO
+
+from src.bytecode.code_object import CodeObject
+from src.bytecode.opcode import Opcode
+from src.interpreter import DEFAULT_VALUES, format_value, integer_div, parse_input_value, read_words
+
+
+# Коды операций как целые константы модуля: сравнение int в цикле дешевле, чем IntEnum
+LOAD_CONST = int(Opcode.LOAD_CONST)
+LOAD_VAR = int(Opcode.LOAD_VAR)
+STORE_VAR = int(Opcode.STORE_VAR)
+TO_FLOAT = int(Opcode.TO_FLOAT)
+ADD = int(Opcode.ADD)
+SUB = int(Opcode.SUB)
+MUL = int(Opcode.MUL)
+DIV = int(Opcode.DIV)
+NE = int(Opcode.NE)
+EQ = int(Opcode.EQ)
+LT = int(Opcode.LT)
+LE = int(Opcode.LE)
+GT = int(Opcode.GT)
+GE = int(Opcode.GE)
+NOT = int(Opcode.NOT)
+JUMP_IF_FALSE_OR_POP = int(Opcode.JUMP_IF_FALSE_OR_POP)
+JUMP_IF_TRUE_OR_POP = int(Opcode.JUMP_IF_TRUE_OR_POP)
+JUMP = int(Opcode.JUMP)
+JUMP_IF_FALSE = int(Opcode.JUMP_IF_FALSE)
+READ = int(Opcode.READ)
+WRITE = int(Opcode.WRITE)
+HALT = int(Opcode.HALT)
+
+
+class VirtualMachine:
+    """Стековая машина, исполняющая байт-код BytecodeCompiler"""
+
+    def __init__(self, input_stream: Optional[TextIO] = None,
+                 output_stream: Optional[TextIO] = None):
+        self.input_stream = input_stream if input_stream is not None else sys.stdin
+        self.output_stream = output_stream if output_stream is not None else sys.stdout
+        self._input_words: Iterator[str] = read_words(self.input_stream)
+        self.slots: List[object] = []
+
+    def run(self, code_object: CodeObject) -> dict:
+        self.slots = [DEFAULT_VALUES.get(var_type, 0) for var_type in code_object.slot_types]
+        self._execute(code_object)
+        # Скрытые слоты (границы циклов for) в результат не попадают
+        return {name: value for name, value, var_type
+                in zip(code_object.names, self.slots, code_object.slot_types)
+                if var_type is not None}
+
+    def _execute(self, code_object: CodeObject):
+        code = code_object.code.tolist()
+        constants = code_object.constants
+        slots = self.slots
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+        
+        while True:
+            opcode = code[pc]
+            argument = code[pc + 1]
+            pc += 2
+            
+            # Ветви упорядочены по частоте в типичных циклах
+            if opcode == LOAD_VAR:
+                push(slots[argument])
+            elif opcode == LOAD_CONST:
+                push(constants[argument])
+            elif opcode == STORE_VAR:
+                slots[argument] = pop()
+            elif opcode == JUMP_IF_FALSE:
+                if not pop():
+                    pc = argument
+            elif opcode == JUMP:
+                pc = argument
+            elif opcode == ADD:
+                right = pop()
+                stack[-1] = stack[-1] + right
+            elif opcode == SUB:
+                right = pop()
+                stack[-1] = stack[-1] - right
+            elif opcode == MUL:
+                right = pop()
+                stack[-1] = stack[-1] * right
+            elif opcode == LE:
+                right = pop()
+                stack[-1] = stack[-1] <= right
+            elif opcode == LT:
+                right = pop()
+                stack[-1] = stack[-1] < right
+            elif opcode == GT:
+                right = pop()
+                stack[-1] = stack[-1] > right
+            elif opcode == GE:
+                right = pop()
+                stack[-1] = stack[-1] >= right
+            elif opcode == EQ:
+                right = pop()
+                stack[-1] = stack[-1] == right
+            elif opcode == NE:
+                right = pop()
+                stack[-1] = stack[-1] != right
+            elif opcode == DIV:
+                right = pop()
+                if right == 0:
+                    raise self._error(code_object, pc - 2, "Деление на ноль")
+                stack[-1] = integer_div(stack[-1], right)
+            elif opcode == TO_FLOAT:
+                stack[-1] = float(stack[-1])
+            elif opcode == NOT:
+                stack[-1] = not stack[-1]
+            elif opcode == JUMP_IF_FALSE_OR_POP:
+                if stack[-1]:
+                    pop()
+                else:
+                    pc = argument
+            elif opcode == JUMP_IF_TRUE_OR_POP:
+                if stack[-1]:
+                    pc = argument
+                else:
+                    pop()
+            elif opcode == READ:
+                slots[argument] = self._read(code_object, argument, pc - 2)
+            elif opcode == WRITE:
+                values = stack[len(stack) - argument:]
+                del stack[len(stack) - argument:]
+                self.output_stream.write(' '.join(map(format_value, values)) + '\n')
+            elif opcode == HALT:
+                return
+            else:
+                raise self._error(code_object, pc - 2, f"Неизвестная инструкция: {opcode}")
+
+    def _read(self, code_object: CodeObject, slot: int, position: int):
+        name = code_object.names[slot]
+        word = next(self._input_words, None)
+        if word is None:
+            raise self._error(code_object, position, f"Недостаточно входных данных для {name}")
+        try:
+            return parse_input_value(word, code_object.slot_types[slot])
+        except ValueError:
+            raise self._error(code_object, position,
+                              f"Неверное входное значение для {name}: {word}") from None
+
+    @staticmethod
+    def _error(code_object: CodeObject, position: int, message: str) -> RuntimeError:
+        offset = code_object.offsets[position // 2]
+        if offset < 0 or code_object.source_map is None:
+            return RuntimeError(message)
+        return code_object.source_map.error(message, offset, RuntimeError)
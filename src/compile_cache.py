@@ -0,0 +1,130 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+from typing import List, Optional, Tuple
+
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.serialization import dump_ast, load_ast
+from src.source_map import SourceMap
+from src.tokens.token import Token
+from src.tokens.token_type import TokenType
+
+
+class CompileCache:
+    """Дисковый кэш результатов компиляции с ключом по хешу исходного текста.
+    
+    Хранит поток токенов и AST в двоичном формате serialization. Объем
+    ограничен max_bytes, при переполнении удаляются записи, к которым
+    дольше всего не обращались (по mtime файла).
+    """
+
+    SUFFIX = '.ast'
+
+    def __init__(self, directory: str, version: str, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.version = version
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Объем записей: обход каталога при первой записи, затем размеры своих
+        # записей. Записи других процессов видны при следующем обходе, который
+        # нужен только после превышения max_bytes
+        self._total: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, code: str) -> str:
+        digest = hashlib.sha256(self.version.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(code.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, code: str) -> Optional[Tuple[List[Token], ASTNode]]:
+        path = self._path(self.key(code))
+        try:
+            with open(path, 'rb') as file:
+                token_records, ast_data = pickle.load(file)
+            source_map = SourceMap(code)
+            # pickle сохраняет общие строки: все вхождения имени снова ссылаются на одну
+            tokens = [Token(TokenType[name], value, offset, source_map, literal, symbol)
+                      for name, value, offset, literal, symbol in token_records]
+            root = load_ast(ast_data, tokens)
+            # Обновление времени доступа для вытеснения давно не используемых записей
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, KeyError):
+            # Поврежденная запись считается промахом и удаляется
+            self._remove(path)
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return tokens, root
+
+    def put(self, code: str, tokens: List[Token], root: ASTNode):
+        token_records = [(token.type.name, token.value, token.offset, token.literal, token.symbol)
+                         for token in tokens]
+        payload = pickle.dumps((token_records, dump_ast(root, tokens)),
+                               protocol=pickle.HIGHEST_PROTOCOL)
+        
+        # Запись через временный файл, чтобы параллельный читатель не увидел половину
+        path = self._path(self.key(code))
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(payload)
+        # Тот же исходный текст мог записать параллельный процесс: замененная запись
+        # вычитается из объема
+        try:
+            replaced = os.stat(path).st_size
+        except OSError:
+            replaced = 0
+        os.replace(temp_path, path)
+        
+        if self._total is None:
+            self._total = sum(size for _, size, _ in self._entries())
+        else:
+            self._total += len(payload) - replaced
+        if self._total > self.max_bytes:
+            self._evict()
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    # Запись успел удалить другой процесс
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            self.evictions += 1
+            total -= size
+        self._total = total
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
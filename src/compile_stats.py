@@ -0,0 +1,155 @@
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.traversal import count_nodes
+
+
+class PhaseStats:
+    """Замер одной фазы компиляции"""
+    __slots__ = ('name', 'seconds', 'peak_memory', 'details', 'failed')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        # Пик выделенной памяти в байтах за фазу; None, если память не отслеживалась
+        self.peak_memory: Optional[int] = None
+        # Счетчики фазы: число токенов, узлов, удаленных оптимизатором присваиваний и т.п.
+        self.details: Dict[str, object] = {}
+        self.failed = False
+
+    def as_dict(self) -> dict:
+        return {'name': self.name, 'seconds': self.seconds, 'peak_memory': self.peak_memory,
+                'details': dict(self.details), 'failed': self.failed}
+
+
+class CompileHooks:
+    """Точки подключения внешнего сбора метрик; по умолчанию ничего не делают"""
+
+    def phase_started(self, name: str):
+        pass
+
+    def phase_finished(self, phase: PhaseStats):
+        pass
+
+    def compile_finished(self, stats: 'CompileStats'):
+        pass
+
+
+class CompileStats:
+    """Время, объем данных и память по фазам одной компиляции.
+
+    Заполняется компилятором (Compiler.build, Compiler.compile). Память
+    отслеживается через tracemalloc только при trace_memory: это заметно
+    замедляет компиляцию. При profile вся компиляция выполняется под cProfile.
+    """
+
+    def __init__(self, trace_memory: bool = False, profile: bool = False,
+                 hooks: Iterable[CompileHooks] = ()):
+        self.trace_memory = trace_memory
+        self.hooks = list(hooks)
+        self.phases: List[PhaseStats] = []
+        self.tokens = 0
+        # Итоговое дерево; число узлов считается только по запросу
+        self.root: Optional[ASTNode] = None
+        self._nodes: Optional[int] = None
+        self.seconds = 0.0
+        self.peak_memory: Optional[int] = None
+        self.profile: Optional[pstats.Stats] = None
+        self._profiler = cProfile.Profile() if profile else None
+        self._started_tracing = False
+        self._memory_baseline = 0
+        self._start: Optional[float] = None
+        # Вложенные start/finish (compile вызывает build) замеряются внешней парой
+        self._depth = 0
+
+    @property
+    def nodes(self) -> int:
+        if self._nodes is None:
+            self._nodes = count_nodes(self.root)
+        return self._nodes
+
+    def start(self):
+        self._depth += 1
+        if self._depth > 1:
+            return
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.trace_memory:
+            self._memory_baseline = tracemalloc.get_traced_memory()[0]
+        if self._profiler is not None:
+            self._profiler.enable()
+        self._start = time.perf_counter()
+
+    def finish(self):
+        self._depth -= 1
+        if self._depth > 0:
+            return
+        self.seconds += time.perf_counter() - self._start
+        self._start = None
+        if self._profiler is not None:
+            self._profiler.disable()
+            self.profile = pstats.Stats(self._profiler)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        for hook in self.hooks:
+            hook.compile_finished(self)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseStats]:
+        phase = PhaseStats(name)
+        for hook in self.hooks:
+            hook.phase_started(name)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield phase
+        except BaseException:
+            phase.failed = True
+            raise
+        finally:
+            phase.seconds = time.perf_counter() - start
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1]
+                phase.peak_memory = peak - baseline
+                self.peak_memory = max(self.peak_memory or 0, peak - self._memory_baseline)
+            self.phases.append(phase)
+            for hook in self.hooks:
+                hook.phase_finished(phase)
+
+    def as_dict(self) -> dict:
+        return {'seconds': self.seconds, 'tokens': self.tokens, 'nodes': self.nodes,
+                'peak_memory': self.peak_memory,
+                'phases': [phase.as_dict() for phase in self.phases]}
+
+    def format(self) -> str:
+        lines = [f"{'Фаза':<14} {'Время, мс':>10} {'Память, КБ':>11}  Данные"]
+        for phase in self.phases:
+            memory = '-' if phase.peak_memory is None else f"{phase.peak_memory / 1024:.1f}"
+            details = ', '.join(f"{key}={value}" for key, value in phase.details.items())
+            if phase.failed:
+                details = f"ошибка{', ' + details if details else ''}"
+            lines.append(f"{phase.name:<14} {phase.seconds * 1000:>10.3f} {memory:>11}  {details}")
+        memory = '-' if self.peak_memory is None else f"{self.peak_memory / 1024:.1f}"
+        lines.append(f"{'Всего':<14} {self.seconds * 1000:>10.3f} {memory:>11}  "
+                     f"токенов={self.tokens}, узлов={self.nodes}")
+        return '\n'.join(lines)
+
+    def format_profile(self, limit: int = 25, sort: str = 'cumulative') -> str:
+        if self.profile is None:
+            return ''
+        output = io.StringIO()
+        self.profile.stream = output
+        self.profile.sort_stats(sort).print_stats(limit)
+        return output.getvalue()
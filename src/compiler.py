@@ -2,34 +2,218 @@ from src.lexer import Lexer
 from src.parser import Parser
 from src.semantic_analyzer import SemanticAnalyzer
 from src.ast_builder import ASTBuilder
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.printer import print_ast
+from src.compile_cache import CompileCache
+from src.interpreter import Interpreter
+from src.bytecode.bytecode_compiler import BytecodeCompiler
+from src.bytecode.virtual_machine import VirtualMachine
+from src.python_backend import transpile
+from src.optimizer import ConstantFolder
+from src.dataflow.data_flow_optimizer import DataFlowOptimizer
+from src.diagnostics import CompilationErrors, DEFAULT_MAX_ERRORS, Diagnostics
+from src.compile_stats import CompileHooks, CompileStats
+from src.tokens.token import Token
+
+from typing import Callable, Iterable, List, Optional, Tuple
+
+# Входит в ключ кэша: при изменении компилятора старые записи не используются
+COMPILER_VERSION = '1.5'
 
 class Compiler:
     @staticmethod
-    def compile(code: str, ast_verbose: bool = False):
+    def compile(code: str, ast_verbose: bool = False, legacy_pipeline: bool = False,
+                cache: Optional[CompileCache] = None, run: bool = False,
+                backend: str = 'ast', optimize: bool = False,
+                max_errors: int = DEFAULT_MAX_ERRORS, stats: Optional[CompileStats] = None, ast_format: str = 'text',
+                ast_max_depth: Optional[int] = None):
+        # Замеры в stats охватывают и исполнение программы (фаза execute)
+        stats = stats if stats is not None else CompileStats()
+        stats.start()
         try:
-            # Лексический анализ
+            return Compiler._compile(code, ast_verbose, legacy_pipeline, cache, run,
+                                     backend, optimize, max_errors, stats, ast_format,
+                                     ast_max_depth)
+        finally:
+            stats.finish()
+
+    @staticmethod
+    def _compile(code: str, ast_verbose: bool, legacy_pipeline: bool,
+                 cache: Optional[CompileCache], run: bool, backend: str,
+                 optimize: bool, max_errors: int, stats: CompileStats, ast_format: str,
+                 ast_max_depth: Optional[int]):
+        try:
+            tokens, ast_root = Compiler.build(code, legacy_pipeline, cache, log=print,
+                                              optimize=optimize, max_errors=max_errors,
+                                              stats=stats)
+            
+            if ast_verbose:
+                print_ast(ast_root, style=ast_format, max_depth=ast_max_depth)
+        
+        except CompilationErrors as e:
+            for error in e.errors:
+                print(f"Ошибка компиляции: {error}")
+            if e.truncated:
+                print(f"Компиляция остановлена после {len(e.errors)} ошибок")
+            return None
+        except SyntaxError as e:
+            print(f"Ошибка компиляции: {e}")
+            return None
+        
+        if run:
+            try:
+                with stats.phase('execute') as phase:
+                    phase.details['backend'] = backend
+                    Compiler.execute(ast_root, backend)
+            except (SyntaxError, RuntimeError) as e:
+                print(f"Ошибка выполнения: {e}")
+        
+        return tokens
+
+    @staticmethod
+    def execute(ast_root: ASTNode, backend: str = 'ast') -> dict:
+        # ast - обход дерева, vm - байт-код на стековой машине,
+        # python - трансляция в функцию Python
+        if backend == 'vm':
+            return VirtualMachine().run(BytecodeCompiler().compile(ast_root))
+        if backend == 'python':
+            return transpile(ast_root).run()
+        return Interpreter().run(ast_root)
+
+    @staticmethod
+    def build(code: str, legacy_pipeline: bool = False, cache: Optional[CompileCache] = None,
+              log: Optional[Callable[[str], None]] = None,
+              optimize: bool = False, max_errors: int = 1,
+              stats: Optional[CompileStats] = None) -> Tuple[List[Token], ASTNode]:
+        # В отличие от compile, ошибки не перехватываются, а сообщения о ходе
+        # компиляции передаются в log (по умолчанию не выводятся).
+        # При max_errors > 1 разбор продолжается после ошибок, и все найденные
+        # (не больше max_errors) выбрасываются вместе исключением CompilationErrors.
+        # Замеры фаз записываются в stats, если он передан
+        log = log or (lambda message: None)
+        stats = stats if stats is not None else CompileStats()
+        stats.start()
+        try:
+            return Compiler._build(code, legacy_pipeline, cache, log, optimize, max_errors, stats)
+        finally:
+            stats.finish()
+
+    @staticmethod
+    def measure(code: str, trace_memory: bool = False, profile: bool = False,
+                hooks: Iterable[CompileHooks] = (), **options) -> CompileStats:
+        """Компиляция с замерами; ошибки компиляции не перехватываются"""
+        stats = CompileStats(trace_memory, profile, hooks)
+        Compiler.build(code, stats=stats, **options)
+        return stats
+
+    @staticmethod
+    def _build(code: str, legacy_pipeline: bool, cache: Optional[CompileCache], log,
+               optimize: bool, max_errors: int, stats: CompileStats) -> Tuple[List[Token], ASTNode]:
+        if cache is not None:
+            with stats.phase('cache') as phase:
+                cached = cache.get(code)
+                phase.details['hit'] = cached is not None
+            if cached is not None:
+                log("Результат компиляции взят из кэша.")
+                tokens, ast_root = cached
+                stats.tokens = len(tokens)
+                if optimize:
+                    ast_root = Compiler._optimize(ast_root, log, stats)
+                stats.root = ast_root
+                return tokens, ast_root
+        
+        # Лексический анализ
+        with stats.phase('lexer') as phase:
             lexer = Lexer(code)
             tokens = lexer.tokenize()
-            # pprint(tokens)
-            print("Лексический анализ завершен.")
-            
-            # Синтаксический анализ
-            parser = Parser(tokens)
+            phase.details['tokens'] = stats.tokens = len(tokens)
+        # pprint(tokens)
+        log("Лексический анализ завершен.")
+        
+        diagnostics = Diagnostics(max_errors) if max_errors > 1 else None
+        if legacy_pipeline:
+            ast_root = Compiler._run_three_passes(tokens, log, diagnostics, stats)
+        else:
+            ast_root = Compiler._run_single_pass(tokens, log, diagnostics, stats)
+        if diagnostics is not None:
+            diagnostics.check()
+        
+        # В кэше хранится неоптимизированное дерево: ключ не зависит от флагов
+        if cache is not None:
+            with stats.phase('cache_store'):
+                cache.put(code, tokens, ast_root)
+        
+        if optimize:
+            ast_root = Compiler._optimize(ast_root, log, stats)
+        stats.root = ast_root
+        
+        return tokens, ast_root
+
+    @staticmethod
+    def _optimize(ast_root: ASTNode, log, stats: CompileStats) -> ASTNode:
+        with stats.phase('optimizer') as phase:
+            optimizer = ConstantFolder()
+            ast_root = optimizer.optimize(ast_root)
+            phase.details['eliminated'] = optimizer.eliminated
+        log(f"Оптимизация завершена, удалено узлов: {optimizer.eliminated}.")
+        
+        with stats.phase('dataflow') as phase:
+            data_flow = DataFlowOptimizer()
+            ast_root = data_flow.optimize(ast_root)
+            phase.details.update(dead_stores=data_flow.dead_stores,
+                                 common_subexpressions=data_flow.common_subexpressions,
+                                 hoisted=data_flow.hoisted)
+        log(f"Анализ потока данных завершен: удалено присваиваний: {data_flow.dead_stores}, "
+            f"общих подвыражений: {data_flow.common_subexpressions}, "
+            f"вынесено из циклов: {data_flow.hoisted}.")
+        return ast_root
+
+    @staticmethod
+    def _run_single_pass(tokens, log, diagnostics: Optional[Diagnostics],
+                         stats: CompileStats) -> ASTNode:
+        # Синтаксический анализ совмещен с построением AST
+        with stats.phase('parser'):
+            ast_builder = ASTBuilder(tokens, strict=True, diagnostics=diagnostics)
+            ast_root = ast_builder.parse()
+        if Compiler._succeeded(diagnostics):
+            log("Синтаксический анализ завершен.")
+        
+        # Семантический анализ по готовому дереву; после синтаксических ошибок
+        # проверяются операторы, которые удалось разобрать
+        with stats.phase('semantic'):
+            semantic_analyzer = SemanticAnalyzer(diagnostics=diagnostics)
+            semantic_analyzer.analyze_tree(ast_root)
+        if Compiler._succeeded(diagnostics):
+            log("Семантический анализ завершен.")
+        
+        return ast_root
+
+    @staticmethod
+    def _succeeded(diagnostics: Optional[Diagnostics]) -> bool:
+        # О завершении фазы сообщается, только если ошибок пока нет: без сбора
+        # ошибок компиляция остановилась бы раньше сообщения
+        return diagnostics is None or not diagnostics.errors
+
+    @staticmethod
+    def _run_three_passes(tokens, log, diagnostics: Optional[Diagnostics],
+                          stats: CompileStats) -> ASTNode:
+        # Синтаксический анализ
+        with stats.phase('parser'):
+            parser = Parser(tokens, diagnostics)
             parser.parse()
-            print("Синтаксический анализ завершен.")
-            
-            # Семантический анализ
-            semantic_analyzer = SemanticAnalyzer(tokens)
+            if diagnostics is not None:
+                # Проверки по токенам рассчитаны на синтаксически правильную программу
+                diagnostics.check()
+        log("Синтаксический анализ завершен.")
+        
+        # Семантический анализ
+        with stats.phase('semantic'):
+            semantic_analyzer = SemanticAnalyzer(tokens, diagnostics)
             semantic_analyzer.analyze()
-            print("Семантический анализ завершен.")
+        if Compiler._succeeded(diagnostics):
+            log("Семантический анализ завершен.")
 
+        with stats.phase('ast'):
             ast_builder = ASTBuilder(tokens)
             ast_root = ast_builder.parse()
-            if ast_verbose:
-                ast_builder.print_ast(ast_root)
-            
-            return tokens
-        
-        except SyntaxError as e:
-            print(f"Ошибка компиляции: {e}")
-            return None
+        return ast_root
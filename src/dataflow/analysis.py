@@ -0,0 +1,48 @@
+from typing import Dict, FrozenSet, Iterable, Set, Tuple
+
+from src.dataflow.cfg import ControlFlowGraph
+
+
+def reaching_definitions(cfg: ControlFlowGraph) -> Dict[int, Set[Tuple[int, int]]]:
+    """Определения (номер идентификатора, номер вершины), достигающие входа каждой вершины"""
+    gen = {node.index: {(symbol, node.index) for symbol in node.defs} for node in cfg.nodes}
+    reach_in: Dict[int, Set[Tuple[int, int]]] = {node.index: set() for node in cfg.nodes}
+    reach_out: Dict[int, Set[Tuple[int, int]]] = {node.index: set(gen[node.index]) for node in cfg.nodes}
+    
+    worklist = list(cfg.nodes)
+    while worklist:
+        node = worklist.pop()
+        incoming = set()
+        for predecessor in node.predecessors:
+            incoming |= reach_out[predecessor.index]
+        reach_in[node.index] = incoming
+        
+        outgoing = gen[node.index] | {definition for definition in incoming
+                                      if definition[0] not in node.defs}
+        if outgoing != reach_out[node.index]:
+            reach_out[node.index] = outgoing
+            worklist.extend(node.successors)
+    
+    return reach_in
+
+
+def liveness(cfg: ControlFlowGraph, live_at_exit: Iterable[int] = ()) -> Dict[int, FrozenSet[int]]:
+    """Номера переменных, живых на выходе каждой вершины"""
+    live_in: Dict[int, FrozenSet[int]] = {node.index: frozenset(node.uses) for node in cfg.nodes}
+    live_out: Dict[int, FrozenSet[int]] = {node.index: frozenset() for node in cfg.nodes}
+    live_in[cfg.exit.index] = frozenset(live_at_exit)
+    
+    worklist = list(cfg.nodes)
+    while worklist:
+        node = worklist.pop()
+        if node is cfg.exit:
+            continue
+        outgoing = frozenset().union(*(live_in[successor.index] for successor in node.successors))
+        live_out[node.index] = outgoing
+        
+        incoming = node.uses | (outgoing - node.defs)
+        if incoming != live_in[node.index]:
+            live_in[node.index] = frozenset(incoming)
+            worklist.extend(node.predecessors)
+    
+    return live_out
@@ -0,0 +1,148 @@
+from typing import Dict, Generator, List, Optional, Set
+
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.ast_node_type import NodeType
+from src.ast_nodes.traversal import trampoline, walk
+
+
+def expression_variables(node: Optional[ASTNode]) -> Set[int]:
+    """Номера идентификаторов (ASTNode.symbol), используемых в выражении"""
+    return {child.symbol for child, _ in walk(node) if child.type == NodeType.IDENTIFIER}
+
+
+class CFGNode:
+    """Вершина графа потока управления: один оператор или часть составной конструкции.
+
+    defs и uses - номера идентификаторов (ASTNode.symbol).
+    """
+
+    def __init__(self, index: int, kind: str, ast_node: Optional[ASTNode],
+                 defs: Set[int], uses: Set[int]):
+        self.index = index
+        # assignment, input, output, branch, loop_header, loop_init, loop_step, entry, exit
+        self.kind = kind
+        self.ast_node = ast_node
+        self.defs = defs
+        self.uses = uses
+        self.successors: List['CFGNode'] = []
+        self.predecessors: List['CFGNode'] = []
+        # Цикл (узел LOOP AST), в теле которого находится вершина; для вложенных - внутренний
+        self.loop: Optional[ASTNode] = None
+
+    def __repr__(self):
+        return f"CFGNode({self.index}, {self.kind}, defs={sorted(self.defs)}, uses={sorted(self.uses)})"
+
+
+class ControlFlowGraph:
+    """Граф потока управления по структурированному AST.
+    
+    Каждый оператор - отдельная вершина; условный оператор и циклы
+    раскладываются на вершины ветвления, заголовка и шага цикла.
+    """
+
+    def __init__(self, root: ASTNode):
+        self.nodes: List[CFGNode] = []
+        # Вершина для каждого оператора AST (для for - вершина начального присваивания)
+        self.by_ast: Dict[int, CFGNode] = {}
+        # Все вершины, лежащие внутри цикла, включая заголовок и шаг
+        self.loop_nodes: Dict[int, List[CFGNode]] = {}
+        self._loop_stack: List[ASTNode] = []
+        
+        # Вход определяет все объявленные переменные значениями по умолчанию
+        declared = {node.symbol for node in root.children
+                    if node.type == NodeType.VARIABLE_DECLARATION}
+        self.entry = self._new('entry', None, declared, set())
+        statements = [node for node in root.children
+                      if node.type != NodeType.VARIABLE_DECLARATION]
+        exits = self._sequence(statements, [self.entry])
+        self.exit = self._new('exit', None, set(), set())
+        self._connect(exits, self.exit)
+
+    def _new(self, kind: str, ast_node: Optional[ASTNode], defs: Set[int], uses: Set[int]) -> CFGNode:
+        node = CFGNode(len(self.nodes), kind, ast_node, defs, uses)
+        self.nodes.append(node)
+        if self._loop_stack:
+            node.loop = self._loop_stack[-1]
+            for loop in self._loop_stack:
+                self.loop_nodes[id(loop)].append(node)
+        return node
+
+    @staticmethod
+    def _connect(sources: List[CFGNode], target: CFGNode):
+        for source in sources:
+            source.successors.append(target)
+            target.predecessors.append(source)
+
+    def _sequence(self, statements: List[Optional[ASTNode]], entries: List[CFGNode]) -> List[CFGNode]:
+        for statement in statements:
+            entries = trampoline(self._statement(statement, entries))
+        return entries
+
+    def _statement(self, node: Optional[ASTNode], entries: List[CFGNode]) -> Generator:
+        """Добавляет оператор в граф; возвращает вершины, из которых управление идет дальше.
+
+        Генератор для trampoline: вложенные операторы обходятся без рекурсии.
+        """
+        if node is None:
+            return entries
+        
+        if node.type == NodeType.ASSIGNMENT:
+            vertex = self._new('assignment', node, {node.symbol},
+                               expression_variables(node.children[0]))
+        elif node.type == NodeType.INPUT:
+            vertex = self._new('input', node, {child.symbol for child in node.children}, set())
+        elif node.type == NodeType.OUTPUT:
+            uses = set()
+            for child in node.children:
+                uses |= expression_variables(child)
+            vertex = self._new('output', node, set(), uses)
+        elif node.type == NodeType.CONDITIONAL:
+            branch = self._new('branch', node, set(), expression_variables(node.children[0]))
+            self.by_ast[id(node)] = branch
+            self._connect(entries, branch)
+            exits = yield self._statement(node.children[1], [branch])
+            if len(node.children) > 2:
+                exits = exits + (yield self._statement(node.children[2], [branch]))
+            else:
+                exits = exits + [branch]
+            return exits
+        elif node.type == NodeType.LOOP:
+            return (yield self._loop(node, entries))
+        else:
+            return entries
+        
+        self.by_ast[id(node)] = vertex
+        self._connect(entries, vertex)
+        return [vertex]
+
+    def _loop(self, node: ASTNode, entries: List[CFGNode]) -> Generator:
+        if node.value == 'for':
+            initial_assignment, end_condition, loop_body = node.children
+            variable = initial_assignment.symbol
+            # Начальное присваивание и граница вычисляются один раз, до цикла
+            init = self._new('loop_init', node, {variable},
+                             expression_variables(initial_assignment.children[0])
+                             | expression_variables(end_condition))
+            self.by_ast[id(node)] = init
+            self._connect(entries, init)
+            entries = [init]
+            header_uses = {variable}
+        else:
+            loop_body = node.children[1]
+            header_uses = expression_variables(node.children[0])
+        
+        self.loop_nodes[id(node)] = []
+        self._loop_stack.append(node)
+        header = self._new('loop_header', node, set(), header_uses)
+        self._connect(entries, header)
+        body_exits = yield self._statement(loop_body, [header])
+        if node.value == 'for':
+            step = self._new('loop_step', node, {variable}, {variable})
+            self._connect(body_exits, step)
+            body_exits = [step]
+        self._connect(body_exits, header)
+        self._loop_stack.pop()
+        
+        if node.value != 'for':
+            self.by_ast[id(node)] = header
+        return [header]
@@ -0,0 +1,336 @@
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.ast_node_type import NodeType
+from src.ast_nodes.traversal import walk
+from src.dataflow.analysis import liveness, reaching_definitions
+from src.dataflow.cfg import ControlFlowGraph
+from src.interpreter import literal_value
+from src.tokens.token_type import TokenType
+
+
+# Типы выражений, которые можно сохранить во временной переменной
+TEMPORARY_TYPES = {TokenType.INTEGER, TokenType.FLOAT, TokenType.BOOLEAN}
+
+OPERATION_TYPES = {NodeType.BINARY_OPERATION, NodeType.UNARY_OPERATION}
+
+# Место вхождения выражения: (родитель, индекс в children, номер оператора верхнего уровня)
+Occurrence = Tuple[ASTNode, int, int]
+
+
+class ExpressionTable:
+    """Сведения о подвыражениях: ключ, номера используемых переменных, чистота.
+
+    Ключ - номер структуры (операция и ключи операндов) в общей таблице:
+    равные ключи - одинаковые вычисления, и сравнение ключей не уходит
+    в глубину дерева. Сведения вычисляются снизу вверх на явном стеке,
+    запоминаются по id узла и верны, пока выражения не меняются.
+    """
+
+    def __init__(self):
+        self._structures: Dict[tuple, int] = {}
+        self._facts: Dict[int, Tuple[int, FrozenSet[int], bool]] = {}
+
+    def key(self, node: ASTNode) -> int:
+        return self._lookup(node)[0]
+
+    def variables(self, node: ASTNode) -> FrozenSet[int]:
+        return self._lookup(node)[1]
+
+    def is_pure(self, node: ASTNode) -> bool:
+        """Выражение нельзя вычислить с ошибкой: деление только на ненулевой литерал"""
+        return self._lookup(node)[2]
+
+    def _lookup(self, node: ASTNode) -> Tuple[int, FrozenSet[int], bool]:
+        facts = self._facts
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if id(current) in facts:
+                stack.pop()
+                continue
+            pending = [child for child in current.children if id(child) not in facts]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            facts[id(current)] = self._combine(current)
+        return facts[id(node)]
+
+    def _combine(self, node: ASTNode) -> Tuple[int, FrozenSet[int], bool]:
+        if node.type == NodeType.IDENTIFIER:
+            return self._number((node.type, node.symbol)), frozenset((node.symbol,)), True
+        if node.type not in OPERATION_TYPES:
+            return self._number((node.type, node.value)), frozenset(), True
+        
+        operands = [self._facts[id(child)] for child in node.children]
+        pure = all(operand_pure for _, _, operand_pure in operands)
+        if node.type == NodeType.BINARY_OPERATION and node.value == TokenType.DIV:
+            divisor = node.children[1]
+            if divisor.type != NodeType.LITERAL or literal_value(divisor) == 0:
+                pure = False
+        variables = frozenset().union(*(operand_variables for _, operand_variables, _ in operands))
+        return self._number((node.value, tuple(key for key, _, _ in operands))), variables, pure
+
+    def _number(self, structure: tuple) -> int:
+        return self._structures.setdefault(structure, len(self._structures))
+
+
+def subtree_ids(node: ASTNode) -> Set[int]:
+    return {id(child) for child, _ in walk(node)}
+
+
+class DataFlowOptimizer:
+    """Оптимизации на графе потока управления.
+
+    Удаляет мертвые присваивания (по живости переменных), выносит общие
+    подвыражения соседних операторов и инвариантные выражения циклов
+    во временные переменные. Наблюдаемым поведением программы считаются
+    только read и write; переменные из live_at_exit сохраняются живыми
+    и после завершения программы. Анализы работают с номерами
+    идентификаторов (ASTNode.symbol), имена нужны только для live_at_exit.
+
+    Присваивание временной переменной ставится только между операторами
+    верхнего уровня: тело if и цикла - один оператор, и составного оператора,
+    куда можно поставить присваивание перед вложенным, в языке нет. Поэтому
+    общие подвыражения ищутся только в подряд идущих присваиваниях и выводах
+    верхнего уровня (в том числе внутри одного оператора), а повторы внутри
+    тел if и циклов остаются. Инварианты выносятся только перед циклами
+    верхнего уровня: выражение, инвариантное лишь для вложенного цикла
+    (зависящее от переменной внешнего), остается на месте; инварианты
+    внешнего цикла выносятся и из вложенных.
+    """
+
+    def __init__(self, live_at_exit: Iterable[str] = ()):
+        self.live_at_exit = set(live_at_exit)
+        self.dead_stores = 0
+        self.common_subexpressions = 0
+        self.hoisted = 0
+        self._temporaries = 0
+        self._next_symbol = 0
+
+    def optimize(self, root: ASTNode) -> ASTNode:
+        # Временные переменные получают номера после всех объявленных
+        declarations = [node for node in root.children if node.type == NodeType.VARIABLE_DECLARATION]
+        self._next_symbol = 1 + max((node.symbol for node in declarations), default=-1)
+        live_at_exit = {node.symbol for node in declarations if node.value in self.live_at_exit}
+        self._eliminate_dead_stores(root, live_at_exit)
+        self._eliminate_common_subexpressions(root)
+        self._hoist_invariants(root)
+        return root
+
+    # Удаление мертвых присваиваний
+
+    def _eliminate_dead_stores(self, root: ASTNode, live_at_exit: Set[int]):
+        # Удаление присваивания может сделать мертвыми другие, поэтому до неподвижной точки
+        while True:
+            cfg = ControlFlowGraph(root)
+            live_out = liveness(cfg, live_at_exit)
+            table = ExpressionTable()
+            dead = set()
+            for node in cfg.nodes:
+                if (node.kind == 'assignment' and not node.defs & live_out[node.index]
+                        and table.is_pure(node.ast_node.children[0])):
+                    dead.add(id(node.ast_node))
+
+            removed = self._remove_statements(root, dead)
+            if not removed:
+                return
+            self.dead_stores += removed
+
+    def _remove_statements(self, root: ASTNode, dead: Set[int]) -> int:
+        removed = 0
+        statements = []
+        for node in root.children:
+            if id(node) in dead:
+                removed += 1
+                continue
+            removed += self._remove_nested(node, dead)
+            statements.append(node)
+        root.children = statements
+        return removed
+
+    @staticmethod
+    def _remove_nested(node: ASTNode, dead: Set[int]) -> int:
+        # Вложенный оператор удалить нельзя (пустого оператора нет), кроме ветви else
+        removed = 0
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.type == NodeType.CONDITIONAL:
+                if len(node.children) > 2 and id(node.children[2]) in dead:
+                    node.children = node.children[:2]
+                    removed += 1
+                stack.extend(node.children[1:])
+            elif node.type == NodeType.LOOP:
+                stack.append(node.children[-1])
+        return removed
+
+    # Общие подвыражения
+
+    def _eliminate_common_subexpressions(self, root: ASTNode):
+        """Повторные вычисления в подряд идущих присваиваниях и выводах верхнего уровня.
+
+        Тела if и циклов не просматриваются: присваивание временной переменной
+        перед вложенным оператором поставить некуда.
+        """
+        groups: List[List[Occurrence]] = []
+        window: Dict[int, List[Occurrence]] = {}
+        table = ExpressionTable()
+
+        def close(keys):
+            for key in keys:
+                occurrences = window.pop(key)
+                if len(occurrences) > 1:
+                    groups.append(occurrences)
+
+        def uses(occurrences: List[Occurrence]) -> FrozenSet[int]:
+            parent, index, _ = occurrences[0]
+            return table.variables(parent.children[index])
+
+        for position, node in enumerate(root.children):
+            if node.type not in (NodeType.ASSIGNMENT, NodeType.OUTPUT):
+                close(list(window))
+                continue
+            for index in range(len(node.children)):
+                self._collect(node, index, position, window, table)
+            if node.type == NodeType.ASSIGNMENT:
+                # Присваивание прекращает доступность выражений с этой переменной
+                close([key for key, occurrences in window.items() if node.symbol in uses(occurrences)])
+        close(list(window))
+
+        self.common_subexpressions += self._replace_groups(root, groups, '_cse', 2)
+
+    @staticmethod
+    def _collect(parent: ASTNode, index: int, position: int,
+                 window: Dict[int, List[Occurrence]], table: ExpressionTable):
+        # Вхождения добавляются после вхождений своих подвыражений
+        stack = [(parent, index, False)]
+        while stack:
+            parent, index, visited = stack.pop()
+            node = parent.children[index]
+            if node.type not in OPERATION_TYPES:
+                continue
+            if not visited:
+                stack.append((parent, index, True))
+                stack.extend((node, child_index, False) for child_index in reversed(range(len(node.children))))
+            elif node.value_type in TEMPORARY_TYPES and table.is_pure(node):
+                window.setdefault(table.key(node), []).append((parent, index, position))
+
+    def _replace_groups(self, root: ASTNode, groups: List[List[Occurrence]],
+                        prefix: str, min_occurrences: int) -> int:
+        """Заменяет каждую группу одинаковых выражений временной переменной.
+
+        Присваивание временной переменной ставится перед первым оператором группы.
+        Сначала заменяются самые большие выражения; вложенные в них вхождения
+        других групп при этом исчезают.
+        """
+        groups.sort(key=lambda group: -len(subtree_ids(group[0][0].children[group[0][1]])))
+        replaced: Set[int] = set()
+        inserted: Dict[int, List[ASTNode]] = {}
+        declarations = []
+        count = 0
+
+        for group in groups:
+            group = [occurrence for occurrence in group
+                     if id(occurrence[0].children[occurrence[1]]) not in replaced]
+            if len(group) < min_occurrences:
+                continue
+
+            expression = group[0][0].children[group[0][1]]
+            self._temporaries += 1
+            name = f"{prefix}{self._temporaries}"
+            symbol = self._next_symbol
+            self._next_symbol += 1
+            declarations.append(ASTNode(
+                type=NodeType.VARIABLE_DECLARATION,
+                value=name,
+                token=expression.token,
+                value_type=expression.value_type,
+                symbol=symbol
+            ))
+            inserted.setdefault(min(position for _, _, position in group), []).append(ASTNode(
+                type=NodeType.ASSIGNMENT,
+                value=name,
+                children=[expression],
+                token=expression.token,
+                symbol=symbol
+            ))
+
+            for parent, index, _ in group:
+                replaced |= subtree_ids(parent.children[index])
+                parent.children[index] = ASTNode(
+                    type=NodeType.IDENTIFIER,
+                    value=name,
+                    token=parent.children[index].token,
+                    value_type=expression.value_type,
+                    symbol=symbol
+                )
+            count += 1
+
+        statements = []
+        for position, node in enumerate(root.children):
+            statements.extend(inserted.get(position, ()))
+            statements.append(node)
+        # Объявления временных переменных идут после объявлений программы
+        first_statement = next((position for position, node in enumerate(statements)
+                                if node.type != NodeType.VARIABLE_DECLARATION), len(statements))
+        root.children = statements[:first_statement] + declarations + statements[first_statement:]
+        return count
+
+    # Вынос инвариантов циклов
+
+    def _hoist_invariants(self, root: ASTNode):
+        """Выносит из циклов верхнего уровня выражения, не зависящие от итерации.
+
+        Выражение инвариантно, если все достигающие его определения
+        используемых переменных лежат вне цикла.
+        """
+        cfg = ControlFlowGraph(root)
+        reach_in = reaching_definitions(cfg)
+        groups: Dict[tuple, List[Occurrence]] = {}
+        table = ExpressionTable()
+
+        for position, node in enumerate(root.children):
+            if node.type != NodeType.LOOP:
+                continue
+            inside = {vertex.index for vertex in cfg.loop_nodes[id(node)]}
+            for vertex in cfg.loop_nodes[id(node)]:
+                for parent, index in self._expressions(vertex, node):
+                    self._collect_invariants(parent, index, position, reach_in[vertex.index],
+                                             inside, groups, table)
+
+        self.hoisted += self._replace_groups(root, list(groups.values()), '_inv', 1)
+
+    @staticmethod
+    def _expressions(vertex, loop: ASTNode) -> List[Tuple[ASTNode, int]]:
+        """Выражения, вычисляемые в вершине на каждой итерации цикла loop"""
+        node = vertex.ast_node
+        if vertex.kind in ('assignment', 'output'):
+            return [(node, index) for index in range(len(node.children))]
+        if vertex.kind == 'branch' or vertex.kind == 'loop_header' and node.value == 'while':
+            return [(node, 0)]
+        if vertex.kind == 'loop_init' and node is not loop:
+            # Начальное значение и граница вложенного for вычисляются на каждой итерации внешнего
+            return [(node.children[0], 0), (node, 1)]
+        return []
+
+    @staticmethod
+    def _collect_invariants(parent: ASTNode, index: int, position: int,
+                            reaching: Set[Tuple[int, int]], inside: Set[int],
+                            groups: Dict[tuple, List[Occurrence]], table: ExpressionTable):
+        stack = [(parent, index)]
+        while stack:
+            parent, index = stack.pop()
+            node = parent.children[index]
+            if node.type not in OPERATION_TYPES:
+                continue
+
+            variables = table.variables(node)
+            invariant = all(vertex not in inside for symbol, vertex in reaching if symbol in variables)
+            if invariant and node.value_type in TEMPORARY_TYPES and table.is_pure(node):
+                # Выносится наибольшее инвариантное выражение
+                # Одинаковые выражения разных циклов выносятся отдельно
+                groups.setdefault((position, table.key(node)), []).append((parent, index, position))
+                continue
+            stack.extend((node, child_index) for child_index in reversed(range(len(node.children))))
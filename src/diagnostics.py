@@ -0,0 +1,40 @@
+from typing import List
+
+
+# Предел числа ошибок одной компиляции по умолчанию для Compiler.compile,
+# пакетной компиляции и командной строки
+DEFAULT_MAX_ERRORS = 20
+
+class CompilationErrors(SyntaxError):
+    """Все ошибки, найденные за одну компиляцию"""
+
+    def __init__(self, errors: List[SyntaxError], truncated: bool = False):
+        super().__init__('\n'.join(str(error) for error in errors))
+        self.errors = errors
+        # Компиляция остановлена на пределе числа ошибок, дальше могли быть еще
+        self.truncated = truncated
+
+
+class Diagnostics:
+    """Ограниченный список ошибок, общий для всех фаз компиляции.
+
+    Фазы сообщают об ошибке через report и продолжают разбор с ближайшей
+    точки синхронизации. Когда ошибок становится limit, компиляция
+    прерывается исключением CompilationErrors.
+    """
+
+    def __init__(self, limit: int = DEFAULT_MAX_ERRORS):
+        self.limit = limit
+        self.errors: List[SyntaxError] = []
+
+    def report(self, error: SyntaxError):
+        # Прерывание по пределу проходит через обработчики фаз без изменений
+        if isinstance(error, CompilationErrors):
+            raise error
+        self.errors.append(error)
+        if len(self.errors) >= self.limit:
+            raise CompilationErrors(self.errors, truncated=True)
+
+    def check(self):
+        if self.errors:
+            raise CompilationErrors(self.errors)
@@ -0,0 +1,242 @@
+"""Грамматика языка в виде данных.
+
+По правилам GRAMMAR вычисляются множества FIRST и FOLLOW и таблица
+разбора LL(1): для нетерминала и типа текущего токена она сразу дает
+правую часть, которую нужно разбирать. Parser выбирает правило одним
+поиском в словаре и не перебирает альтернативы.
+
+Заголовок программы и циклы объявлений и операторов Parser ведет сам,
+с восстановлением после ошибок; по таблице разбираются их элементы,
+правила ENTRY_FOLLOW.
+"""
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Union
+
+from src.tokens.token_type import TokenType
+
+
+class Terminal:
+    """Обязательный токен одного из типов types"""
+    __slots__ = ('types', 'message')
+
+    def __init__(self, types: Union[TokenType, Iterable[TokenType]], message: str = ''):
+        self.types = frozenset([types] if isinstance(types, TokenType) else types)
+        # Текст ошибки при отсутствии токена; {token} - токен, найденный вместо него
+        self.message = message
+
+
+class Repeat:
+    """Один или больше item через separator; значение - список значений item"""
+    __slots__ = ('item', 'separator')
+
+    def __init__(self, item: Union[Terminal, str], separator: Terminal):
+        self.item = item
+        self.separator = separator
+
+
+class Tail:
+    """Необязательная часть: keyword и нетерминал item после него; без keyword значение - None"""
+    __slots__ = ('keyword', 'item')
+
+    def __init__(self, keyword: Terminal, item: str):
+        self.keyword = keyword
+        self.item = item
+
+
+class Production:
+    """Правая часть правила; после ее разбора вызывается действие с именем name"""
+    __slots__ = ('name', 'symbols')
+
+    def __init__(self, name: str, symbols: tuple):
+        self.name = name
+        self.symbols = symbols
+
+    def __repr__(self):
+        return f"Production({self.name})"
+
+
+class Rule:
+    """Альтернативы нетерминала; message - ошибка, если ни одна не подходит к токену"""
+    __slots__ = ('alternatives', 'message')
+
+    def __init__(self, alternatives: List[tuple], message: str = ''):
+        self.alternatives = alternatives
+        self.message = message
+
+
+Symbol = Union[Terminal, str, Repeat, Tail]
+
+# Обязательные слова программы, разделители объявлений и операторов
+PROGRAM_START = Terminal(TokenType.PROGRAM, "Программа должна начинаться с 'program'")
+DECLARATIONS_START = Terminal(TokenType.VAR, "Ожидается объявление переменных после 'program'")
+STATEMENTS_START = Terminal(TokenType.BEGIN, "Ожидается 'begin' перед началом операторов")
+PROGRAM_END = Terminal(TokenType.END, "Программа должна заканчиваться на 'end.'")
+DECLARATION_END = Terminal(TokenType.SEMICOLON, "Ожидается ';' после объявления типа")
+STATEMENT_SEPARATOR = Terminal(TokenType.SEMICOLON, "Требуется точка с запятой между операторами")
+
+IDENTIFIER = Terminal(TokenType.IDENTIFIER, "Ожидается идентификатор")
+COMMA = Terminal(TokenType.COMMA)
+DECLARED_TYPES = frozenset({TokenType.INTEGER_TYPE, TokenType.FLOAT_TYPE, TokenType.BOOLEAN_TYPE})
+
+# Множители выражения и токены, которые могут стоять перед ними
+OPERAND_TYPES = frozenset({TokenType.IDENTIFIER, TokenType.INTEGER, TokenType.FLOAT, TokenType.BOOLEAN})
+PREFIX_TYPES = frozenset({TokenType.UNARY_NEGATION, TokenType.LPAREN})
+CLOSING_PAREN = Terminal(TokenType.RPAREN, "Ожидается ')' в конце выражения")
+
+GRAMMAR: Dict[str, Rule] = {
+    'variables': Rule([(Repeat(IDENTIFIER, COMMA),
+                        Terminal(TokenType.COLON, "Ожидается ':' после списка идентификаторов"),
+                        Terminal(DECLARED_TYPES, "Неверный тип данных"))],
+                      "Ожидается идентификатор"),
+
+    'statement': Rule([('assignment',), ('conditional',), ('fixed_loop',), ('conditional_loop',),
+                       ('input',), ('output',)],
+                      "Неожиданный оператор"),
+    'assignment': Rule([(IDENTIFIER, Terminal(TokenType.AS, "Ожидается 'as' в операторе присваивания"),
+                         'expression')],
+                       "Ожидается идентификатор"),
+    'conditional': Rule([(Terminal(TokenType.IF), 'expression',
+                          Terminal(TokenType.THEN, "Ожидается 'then', получено: {token}"),
+                          'statement', Tail(Terminal(TokenType.ELSE), 'statement'))]),
+    'fixed_loop': Rule([(Terminal(TokenType.FOR), 'assignment', Terminal(TokenType.TO, "Ожидается 'to'"),
+                         'expression', Terminal(TokenType.DO, "Ожидается 'do'"), 'statement')]),
+    'conditional_loop': Rule([(Terminal(TokenType.WHILE), 'expression',
+                               Terminal(TokenType.DO, "Ожидается 'do'"), 'statement')]),
+    'input': Rule([(Terminal(TokenType.READ), Terminal(TokenType.LPAREN, "Ожидается '('"),
+                    Repeat(IDENTIFIER, COMMA), Terminal(TokenType.RPAREN, "Ожидается ')'"))]),
+    'output': Rule([(Terminal(TokenType.WRITE), Terminal(TokenType.LPAREN, "Ожидается '('"),
+                     Repeat('expression', COMMA), Terminal(TokenType.RPAREN, "Ожидается ')'"))]),
+
+    # Уровни выражения от слабых операций к сильным; Parser разбирает
+    # выражения по приоритетам, выведенным из этих правил
+    'expression': Rule([(Repeat('operand', Terminal({TokenType.NE, TokenType.EQ, TokenType.LT,
+                                                      TokenType.LE, TokenType.GT, TokenType.GE})),)]),
+    'operand': Rule([(Repeat('summand', Terminal({TokenType.PLUS, TokenType.MIN, TokenType.OR})),)]),
+    'summand': Rule([(Repeat('multiplier', Terminal({TokenType.MULT, TokenType.DIV, TokenType.AND})),)]),
+    'multiplier': Rule([(Terminal(OPERAND_TYPES),),
+                        (Terminal(TokenType.UNARY_NEGATION), 'multiplier'),
+                        (Terminal(TokenType.LPAREN), 'expression', CLOSING_PAREN)],
+                       "Неожиданный множитель в выражении"),
+}
+
+# Правила, которые Parser разбирает из своих циклов, и токены после них:
+# ';' после объявления, ';' или 'end' после оператора
+ENTRY_FOLLOW: Dict[str, FrozenSet[TokenType]] = {
+    'variables': DECLARATION_END.types,
+    'statement': STATEMENT_SEPARATOR.types | PROGRAM_END.types,
+}
+EXPRESSION_LEVELS = ('expression', 'operand', 'summand')
+
+# Пустая цепочка в FIRST
+EPSILON = None
+
+
+def _symbol_first(symbol: Symbol, first: Dict[str, Set]) -> Set:
+    if isinstance(symbol, Terminal):
+        return set(symbol.types)
+    if isinstance(symbol, str):
+        return first[symbol]
+    if isinstance(symbol, Repeat):
+        return _symbol_first(symbol.item, first)
+    return set(symbol.keyword.types) | {EPSILON}
+
+
+def _sequence_first(symbols: tuple, first: Dict[str, Set]) -> Set:
+    result = set()
+    for symbol in symbols:
+        symbol_first = _symbol_first(symbol, first)
+        result |= symbol_first - {EPSILON}
+        if EPSILON not in symbol_first:
+            return result
+    result.add(EPSILON)
+    return result
+
+
+def compute_first(grammar: Dict[str, Rule]) -> Dict[str, FrozenSet]:
+    """FIRST каждого нетерминала; EPSILON - нетерминал может быть пустым"""
+    first = {name: set() for name in grammar}
+    changed = True
+    while changed:
+        changed = False
+        for name, rule in grammar.items():
+            for alternative in rule.alternatives:
+                added = _sequence_first(alternative, first) - first[name]
+                if added:
+                    first[name] |= added
+                    changed = True
+    return {name: frozenset(types) for name, types in first.items()}
+
+
+def compute_follow(grammar: Dict[str, Rule], first: Dict[str, FrozenSet],
+                   entries: Dict[str, FrozenSet] = ENTRY_FOLLOW) -> Dict[str, FrozenSet]:
+    """FOLLOW каждого нетерминала; entries - токены после правил, разбираемых извне"""
+    follow = {name: set(entries.get(name, ())) for name in grammar}
+
+    def add(symbol: Symbol, types: Set) -> bool:
+        if isinstance(symbol, str):
+            added = types - follow[symbol]
+            follow[symbol] |= added
+            return bool(added)
+        if isinstance(symbol, Repeat):
+            return add(symbol.item, types | symbol.separator.types)
+        if isinstance(symbol, Tail):
+            return add(symbol.item, types)
+        return False
+
+    changed = True
+    while changed:
+        changed = False
+        for name, rule in grammar.items():
+            for alternative in rule.alternatives:
+                for index, symbol in enumerate(alternative):
+                    trailer = _sequence_first(alternative[index + 1:], first)
+                    types = trailer - {EPSILON}
+                    if EPSILON in trailer:
+                        types |= follow[name]
+                    changed |= add(symbol, types)
+    return {name: frozenset(types) for name, types in follow.items()}
+
+
+def build_table(grammar: Dict[str, Rule], first: Dict[str, FrozenSet],
+                follow: Dict[str, FrozenSet]) -> Dict[str, Dict[Optional[TokenType], Production]]:
+    """Таблица LL(1): нетерминал -> тип текущего токена -> правая часть.
+
+    Альтернатива из одного нетерминала (цепное правило) сразу заменяется
+    правыми частями этого нетерминала, чтобы разбор не тратил на нее шаг.
+    """
+    table: Dict[str, Dict[Optional[TokenType], Production]] = {}
+
+    def fill(name: str) -> Dict[Optional[TokenType], Production]:
+        if name in table:
+            return table[name]
+        entries = table[name] = {}
+        for alternative in grammar[name].alternatives:
+            if len(alternative) == 1 and isinstance(alternative[0], str):
+                choices = fill(alternative[0]).items()
+            else:
+                production = Production(name, alternative)
+                alternative_first = _sequence_first(alternative, first)
+                types = alternative_first - {EPSILON}
+                if EPSILON in alternative_first:
+                    types |= follow[name]
+                choices = [(token_type, production) for token_type in types]
+            for token_type, production in choices:
+                if entries.get(token_type, production) is not production:
+                    raise ValueError(f"Грамматика не LL(1): {name} по {token_type}")
+                entries[token_type] = production
+        return entries
+
+    for name in grammar:
+        fill(name)
+    return table
+
+
+FIRST = compute_first(GRAMMAR)
+FOLLOW = compute_follow(GRAMMAR, FIRST)
+TABLE = build_table(GRAMMAR, FIRST, FOLLOW)
+
+# Приоритеты бинарных операций по уровням выражения: чем глубже уровень, тем сильнее
+BINARY_PRECEDENCE: Dict[TokenType, int] = {
+    token_type: level
+    for level, name in enumerate(EXPRESSION_LEVELS, 1)
+    for token_type in GRAMMAR[name].alternatives[0][0].separator.types
+}
@@ -0,0 +1,453 @@
+from bisect import bisect_left
+from operator import attrgetter
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+from src.ast_builder import ASTBuilder
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.ast_node_type import NodeType
+from src.lexer import Lexer
+from src.source_map import SourceMap
+from src.symbol_table import SymbolTable
+from src.tokens.token import Token
+from src.tokens.token_type import TokenType
+from src.type_checker import TypeChecker
+
+
+token_offset = attrgetter('offset')
+statement_start = attrgetter('start')
+statement_end = attrgetter('end')
+
+
+def used_symbols(node: Optional[ASTNode]) -> FrozenSet[int]:
+    # Номера всех переменных, упомянутых в операторе
+    symbols: Set[int] = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        if node.symbol is not None:
+            symbols.add(node.symbol)
+        stack.extend(node.children)
+    return frozenset(symbols)
+
+
+def clear_types(node: Optional[ASTNode]):
+    # Сброс выведенных типов перед повторной проверкой; тип литерала задан построителем
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node is not None and node.type != NodeType.LITERAL:
+            node.value_type = None
+            stack.extend(node.children)
+
+
+class StatementEntry:
+    """Оператор верхнего уровня и занимаемые им токены"""
+    __slots__ = ('start', 'end', 'node', 'symbols', 'error')
+
+    def __init__(self, start: int, end: int, node: ASTNode):
+        # Номер первого токена и токена после разделителя
+        self.start = start
+        self.end = end
+        self.node = node
+        self.symbols = used_symbols(node)
+        # Ошибка проверки типов, если есть
+        self.error: Optional[SyntaxError] = None
+
+
+class IncrementalCompiler:
+    """Перекомпиляция программы после правок текста.
+
+    Хранит токены, объявления и операторы верхнего уровня предыдущей версии.
+    При правке заново разбираются только лексемы от затронутого места до
+    первого токена, совпадающего со старым; затем заново строятся операторы
+    от затронутого до первой границы оператора, совпадающей со старой
+    (';', 'begin', 'end.'). Проверка типов повторяется для новых операторов
+    и для операторов, использующих переменные с измененным объявлением.
+
+    Диагностика совпадает с первой ошибкой полной компиляции (Compiler.build).
+
+    Сдвиг смещений токенов и номеров токенов операторов после правки
+    откладывается: хранится пара (номер, сдвиг) - элементы с этого номера
+    отстают на сдвиг. Он досчитывается при чтении элементов или при
+    следующей правке, поэтому правка стоит пропорционально расстоянию до
+    предыдущей, а не длине программы. Наружу (tokens, root, declarations,
+    token_at) отдаются досчитанные токены.
+    """
+
+    def __init__(self, code: str):
+        self.code = code
+        self.symbols = SymbolTable()
+        # Один SourceMap на все версии текста: токены видят актуальные позиции
+        self.source_map = SourceMap(code)
+        self._tokens: List[Token] = []
+        self.declarations: List[ASTNode] = []
+        self.statements: List[StatementEntry] = []
+        # Отложенные сдвиги смещений токенов и номеров токенов в операторах
+        self._offset_shift = (0, 0)
+        self._index_shift = (0, 0)
+        # Операторы с ошибкой проверки типов; удаленные из statements отсеиваются в diagnostics
+        self._errors: Dict[int, StatementEntry] = {}
+        self.symbol_table: Dict[int, TokenType] = {}
+        # Номер токена после 'begin'
+        self.header_end = 0
+        self.syntax_error: Optional[SyntaxError] = None
+        # Токены [начало, конец), разбор которых не удался; входят в следующую правку
+        self._dirty: Optional[Tuple[int, int]] = None
+        self._lexed = False
+        self._rebuild()
+
+    @property
+    def tokens(self) -> List[Token]:
+        self._settle_offsets(len(self._tokens))
+        return self._tokens
+
+    @property
+    def root(self) -> ASTNode:
+        tokens = self.tokens
+        root = ASTNode(NodeType.PROGRAM, token=tokens[0] if tokens else None)
+        root.children = self.declarations + [entry.node for entry in self.statements]
+        return root
+
+    @property
+    def lexed(self) -> bool:
+        # После лексической ошибки токены относятся к прошлой версии текста
+        return self._lexed
+
+    @property
+    def diagnostics(self) -> List[SyntaxError]:
+        if self.syntax_error is not None:
+            return [self.syntax_error]
+        first, first_index = None, len(self.statements)
+        for key, entry in list(self._errors.items()):
+            index = self._entry_index(entry)
+            if index is None:
+                del self._errors[key]
+            elif index < first_index:
+                first, first_index = entry, index
+        if first is None:
+            return []
+        # Сообщение строится заново: позиция могла сместиться после правок выше.
+        # Токены оператора получают настоящие смещения только на время проверки
+        shift_from, shift = self._offset_shift
+        stale = self._tokens[max(self._entry_start(first_index), shift_from):
+                             self._entry_end(first_index)] if shift else []
+        for token in stale:
+            token.offset += shift
+        try:
+            self._record(first, self._check(TypeChecker(self.symbol_table), first))
+        finally:
+            for token in stale:
+                token.offset -= shift
+        return [first.error]
+
+    def token_at(self, offset: int) -> Optional[Token]:
+        """Токен, содержащий смещение offset или заканчивающийся на нем"""
+        tokens = self._tokens
+        index = self._token_index(offset + 1) - 1
+        if index < 0:
+            return None
+        self._settle_offsets(index + 1)
+        token = tokens[index]
+        return token if offset <= token.offset + len(token.value) else None
+
+    def edit(self, start: int, end: int, text: str) -> List[SyntaxError]:
+        """Замена символов [start, end) текста на text; возвращает диагностику"""
+        delta = len(text) - (end - start)
+        self.code = self.code[:start] + text + self.code[end:]
+        self.source_map.replace(start, end, text)
+
+        if not self._lexed:
+            return self._rebuild()
+
+        try:
+            first, old_stop, relexed = self._relex(start, end, start + len(text), delta)
+        except SyntaxError as error:
+            # После лексической ошибки состояние восстанавливается полной перекомпиляцией
+            self._lexed = False
+            self.syntax_error = error
+            return self.diagnostics
+
+        # _relex досчитал сдвиг до first; токены после замененных сдвигаются на delta
+        tokens = self._tokens
+        shift_from, shift = self._offset_shift
+        if not shift:
+            shift_from = first
+        elif shift_from > old_stop and delta:
+            for token in tokens[old_stop:shift_from]:
+                token.offset += delta
+        tokens[first:old_stop] = relexed
+        token_delta = len(relexed) - (old_stop - first)
+        self._offset_shift = (max(first + len(relexed), shift_from + token_delta), shift + delta)
+
+        self._reparse(first, old_stop, token_delta)
+        self._settle_offsets(self.header_end)
+        return self.diagnostics
+
+    def _rebuild(self) -> List[SyntaxError]:
+        lexer = Lexer(self.code, symbols=self.symbols)
+        lexer.source_map = self.source_map
+        try:
+            self._tokens = list(lexer.scan())
+        except SyntaxError as error:
+            self._lexed = False
+            self.syntax_error = error
+            return self.diagnostics
+
+        self._lexed = True
+        self._offset_shift = (0, 0)
+        self._index_shift = (0, 0)
+        self._errors = {}
+        self.declarations = []
+        self.statements = []
+        self.symbol_table = {}
+        self.header_end = 0
+        self._dirty = (0, len(self._tokens))
+        self._reparse(0, 0, 0)
+        return self.diagnostics
+
+    def _relex(self, start: int, end: int, new_end: int,
+               delta: int) -> Tuple[int, int, List[Token]]:
+        """Новые токены вместо старых [first, old_stop); сдвиг до first досчитывается"""
+        tokens = self._tokens
+
+        # Токен, касающийся начала правки, может слиться с вставленным текстом
+        first = self._token_index(start)
+        self._settle_offsets(first)
+        while first > 0 and tokens[first - 1].offset + len(tokens[first - 1].value) >= start:
+            first -= 1
+        position = tokens[first - 1].offset + len(tokens[first - 1].value) if first > 0 else 0
+
+        lexer = Lexer(self.code, symbols=self.symbols)
+        lexer.source_map = self.source_map
+        old_index = self._token_index(end)
+        relexed = []
+        for token in lexer.scan(position):
+            if token.offset >= new_end:
+                # После правки текст прежний: совпавший токен означает, что дальше все совпадет
+                old_offset = token.offset - delta
+                while old_index < len(tokens) and self._token_offset(old_index) < old_offset:
+                    old_index += 1
+                if old_index < len(tokens):
+                    old_token = tokens[old_index]
+                    if (self._token_offset(old_index) == old_offset and old_token.type == token.type
+                            and old_token.value == token.value):
+                        return first, old_index, relexed
+            relexed.append(token)
+        return first, len(tokens), relexed
+
+    def _reparse(self, first: int, old_stop: int, token_delta: int):
+        """Повторный разбор после замены старых токенов [first, old_stop)"""
+        # Границы в старой нумерации токенов, включая ранее не разобранный участок
+        region_start, region_end = first, old_stop
+        if self._dirty is not None:
+            region_start = min(region_start, self._dirty[0])
+            region_end = max(region_end, self._dirty[1])
+        # Решение о разделителе после оператора зависит от двух следующих токенов
+        region_start = max(0, region_start - 2)
+        new_region_end = region_end + token_delta
+
+        def moved(index: int) -> int:
+            return index + token_delta if index >= region_end else index
+
+        old_statements = self.statements
+        header_changed = region_start < self.header_end or self.header_end == 0
+        self.syntax_error = None
+        self._dirty = None
+
+        if header_changed:
+            builder = ASTBuilder(self._settled_tokens(0), strict=True)
+            try:
+                declarations = builder.parse_header()
+            except SyntaxError as error:
+                self._fail(error, 0, builder.current_pos, 0, region_end, token_delta)
+                return
+            self.header_end = builder.current_pos
+            position = self.header_end
+            reuse_from = 0
+            changed_symbols = self._declare(declarations)
+        else:
+            # Первый оператор, задетый правкой; до него все операторы прежние
+            reuse_from = self._statement_index(region_start + 1)
+            self._settle_indexes(reuse_from)
+            if reuse_from < len(old_statements):
+                position = self._entry_start(reuse_from)
+            else:
+                position = self._entry_end(reuse_from - 1) if old_statements else self.header_end
+            changed_symbols = frozenset()
+
+        # Операторы от position до совпадения границы со старой после измененного участка
+        builder = ASTBuilder(self._settled_tokens(position), strict=True)
+        parsed: List[StatementEntry] = []
+        resume = len(old_statements)
+        candidate = reuse_from
+        try:
+            for node, start, end in builder.iter_statements():
+                parsed.append(StatementEntry(position + start, position + end, node))
+                boundary = position + end
+                while candidate < len(old_statements) and (
+                        self._entry_start(candidate) < region_end
+                        or moved(self._entry_start(candidate)) < boundary):
+                    candidate += 1
+                if (candidate < len(old_statements)
+                        and moved(self._entry_start(candidate)) == boundary):
+                    resume = candidate
+                    break
+            else:
+                builder.parse_end()
+        except SyntaxError as error:
+            self._fail(error, position, position + builder.current_pos, reuse_from,
+                       region_end, token_delta)
+            return
+
+        self._replace_statements(reuse_from, resume, parsed, token_delta)
+        if not header_changed:
+            self.header_end = moved(self.header_end)
+
+        checker = TypeChecker(self.symbol_table)
+        for entry in parsed:
+            self._record(entry, self._check(checker, entry))
+        if changed_symbols:
+            # Новые объявления задевают всю программу: сдвиги досчитываются целиком
+            self._settle_offsets(len(self._tokens))
+            for index, entry in enumerate(self.statements):
+                if entry.symbols & changed_symbols and not reuse_from <= index < reuse_from + len(parsed):
+                    self._record(entry, self._check(checker, entry))
+
+    def _fail(self, error: SyntaxError, position: int, failed_at: int,
+              reuse_from: int, region_end: int, token_delta: int):
+        # Операторы после ошибки сохраняются как предварительные: их границы
+        # совпадают со старыми, а участок между ними разбирается при следующей правке
+        def moved(index: int) -> int:
+            return index + token_delta if index >= region_end else index
+
+        self.syntax_error = error
+        dirty_end = failed_at + 1
+        keep = len(self.statements)
+        for index in range(reuse_from, len(self.statements)):
+            start = self._entry_start(index)
+            if start >= region_end and moved(start) >= dirty_end:
+                keep = index
+                break
+        if keep < len(self.statements):
+            dirty_end = moved(self._entry_start(keep))
+        else:
+            dirty_end = max(dirty_end, len(self._tokens))
+        self._replace_statements(reuse_from, keep, [], token_delta)
+        # Неразобранное начало программы будет разобрано заново целиком
+        self.header_end = moved(self.header_end) if position > 0 else 0
+        self._dirty = (position, dirty_end)
+
+    def _replace_statements(self, start: int, stop: int, entries: List[StatementEntry],
+                            token_delta: int):
+        """Замена операторов [start, stop) на entries; номера токенов следующих сдвигаются на token_delta.
+
+        Сдвиг до start к этому моменту досчитан.
+        """
+        statements = self.statements
+        shift_from, shift = self._index_shift
+        if not shift:
+            shift_from = start
+        elif shift_from > stop and token_delta:
+            for entry in statements[stop:shift_from]:
+                entry.start += token_delta
+                entry.end += token_delta
+        statements[start:stop] = entries
+        entry_delta = len(entries) - (stop - start)
+        self._index_shift = (max(start + len(entries), shift_from + entry_delta), shift + token_delta)
+
+    # Отложенные сдвиги
+
+    def _settle_offsets(self, stop: int):
+        # Досчитывает сдвиг смещений у токенов с номерами до stop
+        shift_from, shift = self._offset_shift
+        stop = min(stop, len(self._tokens))
+        if stop > shift_from:
+            if shift:
+                for token in self._tokens[shift_from:stop]:
+                    token.offset += shift
+            self._offset_shift = (stop, shift if stop < len(self._tokens) else 0)
+
+    def _settled_tokens(self, position: int) -> Iterator[Token]:
+        # Разбор читает токены по одному, сдвиг досчитывается по мере чтения
+        tokens = self._tokens
+        for index in range(position, len(tokens)):
+            self._settle_offsets(index + 1)
+            yield tokens[index]
+
+    def _token_offset(self, index: int) -> int:
+        shift_from, shift = self._offset_shift
+        return self._tokens[index].offset + (shift if index >= shift_from else 0)
+
+    def _token_index(self, offset: int) -> int:
+        # Номер первого токена, начинающегося не раньше offset
+        tokens = self._tokens
+        shift_from, shift = self._offset_shift
+        if shift_from < len(tokens) and offset > tokens[shift_from].offset + shift:
+            return bisect_left(tokens, offset - shift, lo=shift_from, key=token_offset)
+        return bisect_left(tokens, offset, hi=shift_from, key=token_offset)
+
+    def _settle_indexes(self, stop: int):
+        # Досчитывает сдвиг номеров токенов у операторов с номерами до stop
+        statements = self.statements
+        shift_from, shift = self._index_shift
+        stop = min(stop, len(statements))
+        if stop > shift_from:
+            if shift:
+                for entry in statements[shift_from:stop]:
+                    entry.start += shift
+                    entry.end += shift
+            self._index_shift = (stop, shift if stop < len(statements) else 0)
+
+    def _entry_start(self, index: int) -> int:
+        shift_from, shift = self._index_shift
+        return self.statements[index].start + (shift if index >= shift_from else 0)
+
+    def _entry_end(self, index: int) -> int:
+        shift_from, shift = self._index_shift
+        return self.statements[index].end + (shift if index >= shift_from else 0)
+
+    def _statement_index(self, token_index: int) -> int:
+        # Номер первого оператора, кончающегося не раньше token_index
+        statements = self.statements
+        shift_from, shift = self._index_shift
+        if shift_from < len(statements) and token_index > statements[shift_from].end + shift:
+            return bisect_left(statements, token_index - shift, lo=shift_from, key=statement_end)
+        return bisect_left(statements, token_index, hi=shift_from, key=statement_end)
+
+    def _entry_index(self, entry: StatementEntry) -> Optional[int]:
+        # Номер оператора в statements; None, если его там уже нет
+        statements = self.statements
+        shift_from = self._index_shift[0]
+        for index in (bisect_left(statements, entry.start, hi=shift_from, key=statement_start),
+                      bisect_left(statements, entry.start, lo=shift_from, key=statement_start)):
+            if index < len(statements) and statements[index] is entry:
+                return index
+        return None
+
+    def _record(self, entry: StatementEntry, error: Optional[SyntaxError]):
+        entry.error = error
+        if error is None:
+            self._errors.pop(id(entry), None)
+        else:
+            self._errors[id(entry)] = entry
+
+    def _declare(self, declarations: List[ASTNode]) -> FrozenSet[int]:
+        """Новые объявления; возвращает номера переменных с изменившимся типом"""
+        checker = TypeChecker({})
+        for node in declarations:
+            checker.declare(node)
+        old_table, self.symbol_table = self.symbol_table, checker.symbol_table
+        self.declarations = declarations
+        return frozenset(symbol for symbol in old_table.keys() | self.symbol_table.keys()
+                         if old_table.get(symbol) != self.symbol_table.get(symbol))
+
+    @staticmethod
+    def _check(checker: TypeChecker, entry: StatementEntry) -> Optional[SyntaxError]:
+        clear_types(entry.node)
+        try:
+            checker.check_statement(entry.node)
+        except SyntaxError as error:
+            return error
+        return None
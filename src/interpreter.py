@@ -0,0 +1,326 @@
+import operator
+import sys
+
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.ast_node_type import NodeType
+from src.lexer import decode_number
+from src.tokens.token_type import TokenType
+
+
+def integer_div(left, right):
+    # div: для целых - деление нацело с отбрасыванием дробной части
+    if isinstance(left, int) and isinstance(right, int):
+        quotient = abs(left) // abs(right)
+        return quotient if (left >= 0) == (right >= 0) else -quotient
+    return left / right
+
+
+BINARY_OPERATORS = {
+    TokenType.PLUS: operator.add,
+    TokenType.MIN: operator.sub,
+    TokenType.MULT: operator.mul,
+    TokenType.DIV: integer_div,
+    TokenType.NE: operator.ne,
+    TokenType.EQ: operator.eq,
+    TokenType.LT: operator.lt,
+    TokenType.LE: operator.le,
+    TokenType.GT: operator.gt,
+    TokenType.GE: operator.ge
+}
+
+# Глубина рекурсивного обхода, после которой поддерево обходится на явном
+# стеке: рекурсия быстрее на обычных программах, стек не ограничивает глубину.
+# Семантика операций у обоих обходов общая: _apply, _branch, _start_for
+RECURSION_DEPTH = 100
+
+# Продолжения на явном стеке: что сделать, когда вычислены операнды
+# или выполнено тело
+APPLY, NEGATE, SHORT_CIRCUIT, FOR_STEP, FOR_CHECK, WHILE_CHECK = range(6)
+
+DEFAULT_VALUES = {
+    TokenType.INTEGER: 0,
+    TokenType.FLOAT: 0.0,
+    TokenType.BOOLEAN: False
+}
+
+
+def literal_value(node: ASTNode):
+    # Значение литерала, вычисленное лексером; текст разбирается только
+    # у узлов, созданных без токена
+    if node.literal is not None:
+        return node.literal
+    if node.value_type == TokenType.BOOLEAN:
+        return node.value == 'true'
+    return decode_number(node.value)
+
+
+def parse_input_value(word: str, var_type: TokenType):
+    # Разбор значения для read по объявленному типу переменной
+    if var_type == TokenType.BOOLEAN:
+        if word not in ('true', 'false'):
+            raise ValueError(word)
+        return word == 'true'
+    try:
+        value = decode_number(word)
+    except SyntaxError:
+        raise ValueError(word) from None
+    if var_type == TokenType.FLOAT:
+        return float(value)
+    if not isinstance(value, int):
+        raise ValueError(word)
+    return value
+
+
+def read_words(stream: TextIO) -> Iterator[str]:
+    # Значения для read разделяются пробельными символами
+    for line in stream:
+        yield from line.split()
+
+
+def format_value(value) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+class Interpreter:
+    """Исполнение программы обходом AST.
+    
+    Ввод и вывод (read/write) подключаются через произвольные текстовые потоки.
+    Вложенность глубже RECURSION_DEPTH обходится на явных стеках, поэтому
+    глубина программы ограничена только памятью.
+    """
+
+    def __init__(self, input_stream: Optional[TextIO] = None,
+                 output_stream: Optional[TextIO] = None):
+        self.input_stream = input_stream if input_stream is not None else sys.stdin
+        self.output_stream = output_stream if output_stream is not None else sys.stdout
+        # Значения и типы переменных хранятся по номеру идентификатора (ASTNode.symbol)
+        self.values: List[object] = []
+        self.types: List[Optional[TokenType]] = []
+        self.names: Dict[int, str] = {}
+        self._input_words: Iterator[str] = read_words(self.input_stream)
+        self._statements = {
+            NodeType.ASSIGNMENT: self._execute_assignment,
+            NodeType.CONDITIONAL: self._execute_conditional,
+            NodeType.LOOP: self._execute_loop,
+            NodeType.INPUT: self._execute_input,
+            NodeType.OUTPUT: self._execute_output
+        }
+
+    @property
+    def variables(self) -> Dict[str, object]:
+        return {name: self.values[symbol] for symbol, name in self.names.items()}
+
+    def run(self, root: ASTNode) -> Dict[str, object]:
+        for node in root.children:
+            if node.type == NodeType.VARIABLE_DECLARATION:
+                self._declare(node)
+            else:
+                self.execute(node)
+        return self.variables
+
+    def _declare(self, node: ASTNode):
+        symbol = node.symbol
+        if symbol >= len(self.values):
+            missing = symbol + 1 - len(self.values)
+            self.values.extend([None] * missing)
+            self.types.extend([None] * missing)
+        var_type = node.value_type
+        self.types[symbol] = var_type
+        self.values[symbol] = DEFAULT_VALUES[var_type]
+        self.names[symbol] = node.value
+
+    def execute(self, node: Optional[ASTNode], depth: int = 0):
+        if node is None:
+            return
+        if depth >= RECURSION_DEPTH:
+            self._execute_deep(node)
+        else:
+            self._statements[node.type](node, depth + 1)
+
+    def _execute_deep(self, node: ASTNode):
+        """То же, что execute, на явном стеке: для операторов глубже RECURSION_DEPTH"""
+        # Элементы стека: оператор или продолжение цикла (вид, узел цикла, граница for)
+        stack = [node]
+        evaluate = self.evaluate
+        values = self.values
+        while stack:
+            item = stack.pop()
+            if item is None:
+                continue
+            if item.__class__ is not tuple:
+                node_type = item.type
+                if node_type is NodeType.CONDITIONAL:
+                    stack.append(self._branch(item))
+                elif node_type is NodeType.LOOP:
+                    if item.value == 'for':
+                        stack.append((FOR_CHECK, item, self._start_for(item)))
+                    else:
+                        stack.append((WHILE_CHECK, item, None))
+                else:
+                    self._statements[node_type](item)
+                continue
+
+            action, loop, end_value = item
+            if action is WHILE_CHECK:
+                condition, loop_body = loop.children
+                if evaluate(condition):
+                    stack.append(item)
+                    stack.append(loop_body)
+                continue
+            symbol = loop.children[0].symbol
+            if action is FOR_STEP:
+                values[symbol] += 1
+            if values[symbol] <= end_value:
+                stack.append((FOR_STEP, loop, end_value))
+                stack.append(loop.children[2])
+
+    def evaluate(self, node: ASTNode, depth: int = 0):
+        node_type = node.type
+        
+        if node_type == NodeType.IDENTIFIER:
+            return self._variable(node)
+        
+        if node_type == NodeType.LITERAL:
+            return literal_value(node)
+        
+        if depth >= RECURSION_DEPTH:
+            return self._evaluate_deep(node)
+        depth += 1
+        
+        if node_type == NodeType.UNARY_OPERATION:
+            return not self.evaluate(node.children[0], depth)
+        
+        operator_type = node.value
+        left = self.evaluate(node.children[0], depth)
+        
+        # Логические операции вычисляются по короткой схеме
+        if operator_type == TokenType.AND:
+            return left and self.evaluate(node.children[1], depth)
+        if operator_type == TokenType.OR:
+            return left or self.evaluate(node.children[1], depth)
+        
+        return self._apply(node, left, self.evaluate(node.children[1], depth))
+
+    def _evaluate_deep(self, node: ASTNode):
+        """То же, что evaluate, на явном стеке: для выражений глубже RECURSION_DEPTH"""
+        # Стек работ: узлы для вычисления и продолжения (действие, узел);
+        # значения операндов копятся в results
+        results = []
+        stack = [node]
+        while stack:
+            item = stack.pop()
+            if item.__class__ is not tuple:
+                node_type = item.type
+                if node_type is NodeType.IDENTIFIER:
+                    results.append(self._variable(item))
+                elif node_type is NodeType.LITERAL:
+                    results.append(literal_value(item))
+                elif node_type is NodeType.UNARY_OPERATION:
+                    stack.append((NEGATE, item))
+                    stack.append(item.children[0])
+                elif item.value is TokenType.AND or item.value is TokenType.OR:
+                    stack.append((SHORT_CIRCUIT, item))
+                    stack.append(item.children[0])
+                else:
+                    stack.append((APPLY, item))
+                    stack.append(item.children[1])
+                    stack.append(item.children[0])
+                continue
+
+            action, item = item
+            if action is APPLY:
+                right = results.pop()
+                results[-1] = self._apply(item, results[-1], right)
+            elif action is NEGATE:
+                results[-1] = not results[-1]
+            # Логические операции вычисляются по короткой схеме: правый
+            # операнд нужен, только если левый не решает результат
+            elif bool(results[-1]) is (item.value is TokenType.AND):
+                results.pop()
+                stack.append(item.children[1])
+        return results[0]
+
+    # Общая семантика рекурсивного обхода и обхода на явном стеке
+
+    def _apply(self, node: ASTNode, left, right):
+        try:
+            return BINARY_OPERATORS[node.value](left, right)
+        except ZeroDivisionError:
+            raise self._error("Деление на ноль", node) from None
+
+    def _branch(self, node: ASTNode) -> Optional[ASTNode]:
+        # Выполняемая ветка условного оператора; None, если ветки else нет
+        if self.evaluate(node.children[0]):
+            return node.children[1]
+        return node.children[2] if len(node.children) > 2 else None
+
+    def _start_for(self, node: ASTNode):
+        # Начальное присваивание for; граница вычисляется один раз, переменная цикла растет на 1
+        initial_assignment, end_condition, _ = node.children
+        self._execute_assignment(initial_assignment)
+        return self.evaluate(end_condition)
+
+    def _variable(self, node: ASTNode):
+        symbol = node.symbol
+        # У необъявленной переменной нет значения (None или номер за концом списка)
+        value = self.values[symbol] if symbol < len(self.values) else None
+        if value is None:
+            raise self._error(f"Необъявленная переменная: {node.value}", node)
+        return value
+
+    def _type(self, node: ASTNode) -> Optional[TokenType]:
+        # Тип объявленной переменной; None для необъявленной
+        symbol = node.symbol
+        return self.types[symbol] if symbol < len(self.types) else None
+
+    def _assign(self, node: ASTNode, value):
+        var_type = self._type(node)
+        if var_type is None:
+            raise self._error(f"Необъявленная переменная: {node.value}", node)
+        # Вещественная переменная хранит float и при присваивании целого
+        self.values[node.symbol] = float(value) if var_type == TokenType.FLOAT else value
+
+    def _execute_assignment(self, node: ASTNode, depth: int = 0):
+        self._assign(node, self.evaluate(node.children[0]))
+
+    def _execute_conditional(self, node: ASTNode, depth: int):
+        self.execute(self._branch(node), depth)
+
+    def _execute_loop(self, node: ASTNode, depth: int):
+        if node.value == 'for':
+            end_value = self._start_for(node)
+            symbol = node.children[0].symbol
+            loop_body = node.children[2]
+            values = self.values
+            while values[symbol] <= end_value:
+                self.execute(loop_body, depth)
+                values[symbol] += 1
+        else:
+            condition, loop_body = node.children
+            while self.evaluate(condition):
+                self.execute(loop_body, depth)
+
+    def _execute_input(self, node: ASTNode, depth: int = 0):
+        for child in node.children:
+            word = next(self._input_words, None)
+            if word is None:
+                raise self._error(f"Недостаточно входных данных для {child.value}", child)
+            self._assign(child, self._parse_input(child, word))
+
+    def _execute_output(self, node: ASTNode, depth: int = 0):
+        values = [format_value(self.evaluate(child)) for child in node.children]
+        self.output_stream.write(' '.join(values) + '\n')
+
+    def _parse_input(self, node: ASTNode, word: str):
+        try:
+            return parse_input_value(word, self._type(node))
+        except ValueError:
+            raise self._error(f"Неверное входное значение для {node.value}: {word}", node) from None
+
+    @staticmethod
+    def _error(message: str, node: ASTNode) -> RuntimeError:
+        return node.error(message, RuntimeError)
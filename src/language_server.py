@@ -0,0 +1,343 @@
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+from bisect import bisect_right
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from src.ast_nodes.ast_node import ASTNode
+from src.incremental import IncrementalCompiler
+from src.source_map import error_offset
+from src.tokens.token import Token
+from src.tokens.token_type import TokenType
+
+
+# Коды ошибок JSON-RPC
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+SERVER_NOT_INITIALIZED = -32002
+
+# Серьезность диагностики LSP
+SEVERITY_ERROR = 1
+
+# Слово типа в объявлении и название типа по типу переменной
+TYPE_NAMES = {
+    TokenType.INTEGER: (TokenType.INTEGER_TYPE.value, 'целый'),
+    TokenType.FLOAT: (TokenType.FLOAT_TYPE.value, 'действительный'),
+    TokenType.BOOLEAN: (TokenType.BOOLEAN_TYPE.value, 'логический')
+}
+
+
+def utf16_length(text: str) -> int:
+    # Позиции LSP считаются в кодовых единицах UTF-16
+    return len(text) + sum(1 for char in text if ord(char) > 0xFFFF)
+
+
+def read_message(reader: BinaryIO) -> Optional[dict]:
+    """Сообщение JSON-RPC с заголовком Content-Length; None в конце потока"""
+    length = None
+    while True:
+        line = reader.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode('ascii').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    if length is None:
+        return None
+    return json.loads(reader.read(length).decode('utf-8'))
+
+
+def write_message(writer: BinaryIO, message: dict):
+    body = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    writer.write(b'Content-Length: %d\r\n\r\n' % len(body))
+    writer.write(body)
+    writer.flush()
+
+
+class Document:
+    """Открытый документ: текст и состояние инкрементальной компиляции"""
+
+    def __init__(self, uri: str, version: int, text: str):
+        self.uri = uri
+        self.version = version
+        self.text = text
+        self.compiler = IncrementalCompiler(text)
+        # Правки, еще не переданные компилятору: (начало, конец, текст)
+        self.pending: List[Tuple[int, int, str]] = []
+        # Момент повторного анализа после последней правки
+        self.deadline: Optional[float] = None
+        self._line_starts: Optional[List[int]] = None
+
+    def line_starts(self) -> List[int]:
+        if self._line_starts is None:
+            starts = [0]
+            newline = self.text.find('\n')
+            while newline >= 0:
+                starts.append(newline + 1)
+                newline = self.text.find('\n', newline + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    def offset(self, position: dict) -> int:
+        """Позиция LSP (строка и столбец UTF-16 с нуля) -> смещение в тексте"""
+        starts = self.line_starts()
+        line = min(position['line'], len(starts) - 1)
+        offset = starts[line]
+        end = starts[line + 1] - 1 if line + 1 < len(starts) else len(self.text)
+        units = position['character']
+        while units > 0 and offset < end:
+            units -= 2 if ord(self.text[offset]) > 0xFFFF else 1
+            offset += 1
+        return offset
+
+    def position(self, offset: int) -> dict:
+        starts = self.line_starts()
+        line = bisect_right(starts, offset) - 1
+        return {'line': line, 'character': utf16_length(self.text[starts[line]:offset])}
+
+    def range(self, start: int, end: int) -> dict:
+        return {'start': self.position(start), 'end': self.position(end)}
+
+    def change(self, change: dict):
+        if 'range' not in change:
+            start, end = 0, len(self.text)
+        else:
+            start = self.offset(change['range']['start'])
+            end = self.offset(change['range']['end'])
+        text = change['text']
+        self.text = self.text[:start] + text + self.text[end:]
+        self._line_starts = None
+        self.pending.append((start, end, text))
+
+    def analyze(self) -> List[SyntaxError]:
+        # Правки передаются компилятору по одной, каждая перекомпилирует только свой участок
+        pending, self.pending = self.pending, []
+        self.deadline = None
+        for start, end, text in pending:
+            self.compiler.edit(start, end, text)
+        return self.compiler.diagnostics
+
+    def token_at(self, offset: int) -> Optional[Token]:
+        if not self.compiler.lexed:
+            return None
+        return self.compiler.token_at(offset)
+
+    def declaration(self, symbol: Optional[int]) -> Optional[ASTNode]:
+        # Первое объявление переменной; повторные объявления ее не меняют
+        for node in self.compiler.declarations:
+            if node.symbol == symbol:
+                return node
+        return None
+
+
+class LanguageServer:
+    """Сервер протокола LSP поверх stdin/stdout.
+
+    Держит в памяти токены, AST и таблицы типов открытых документов и после
+    правок перекомпилирует только измененные участки (IncrementalCompiler).
+    Повторный анализ откладывается на debounce секунд после последней правки:
+    серия быстрых правок дает одну публикацию диагностики. Поддерживаются
+    диагностика, подсказка с типом переменной (hover) и переход к объявлению.
+    """
+
+    def __init__(self, reader: BinaryIO, writer: BinaryIO, debounce: float = 0.2):
+        self.reader = reader
+        self.writer = writer
+        self.debounce = debounce
+        self.documents: Dict[str, Document] = {}
+        self.initialized = False
+        self.shutdown_requested = False
+        self._messages: queue.Queue = queue.Queue()
+        self._handlers = {
+            'initialize': self._initialize,
+            'shutdown': self._shutdown,
+            'textDocument/hover': self._hover,
+            'textDocument/definition': self._definition,
+        }
+        self._notifications = {
+            'initialized': lambda params: None,
+            'textDocument/didOpen': self._did_open,
+            'textDocument/didChange': self._did_change,
+            'textDocument/didClose': self._did_close,
+            'textDocument/didSave': lambda params: None,
+        }
+
+    def serve(self) -> int:
+        """Цикл обработки сообщений; возвращает код завершения процесса"""
+        # Чтение в отдельном потоке, чтобы отложенный анализ срабатывал без новых сообщений
+        threading.Thread(target=self._read, daemon=True).start()
+        while True:
+            try:
+                message = self._messages.get(timeout=self._timeout())
+            except queue.Empty:
+                message = False
+            if message is None or message and message.get('method') == 'exit':
+                return 0 if self.shutdown_requested else 1
+            if message:
+                self._dispatch(message)
+            # При непрерывном потоке сообщений срок анализа проверяется и без таймаута
+            self._analyze_due()
+
+    def _read(self):
+        while True:
+            try:
+                message = read_message(self.reader)
+            except (ValueError, UnicodeDecodeError):
+                continue
+            self._messages.put(message)
+            if message is None:
+                return
+
+    def _timeout(self) -> Optional[float]:
+        deadlines = [document.deadline for document in self.documents.values()
+                     if document.deadline is not None]
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def _analyze_due(self):
+        now = time.monotonic()
+        for document in list(self.documents.values()):
+            if document.deadline is not None and document.deadline <= now:
+                self._publish(document)
+
+    def _dispatch(self, message: dict):
+        method = message.get('method')
+        if 'id' not in message:
+            handler = self._notifications.get(method)
+            if handler is not None and (self.initialized or method == 'initialized'):
+                handler(message.get('params') or {})
+            return
+
+        handler = self._handlers.get(method)
+        if handler is None:
+            self._respond_error(message['id'], METHOD_NOT_FOUND, f"Неизвестный метод: {method}")
+            return
+        if not self.initialized and method != 'initialize':
+            self._respond_error(message['id'], SERVER_NOT_INITIALIZED, "Сервер не инициализирован")
+            return
+        try:
+            result = handler(message.get('params') or {})
+        except Exception as error:
+            self._respond_error(message['id'], INTERNAL_ERROR, str(error))
+            return
+        write_message(self.writer, {'jsonrpc': '2.0', 'id': message['id'], 'result': result})
+
+    def _respond_error(self, id, code: int, message: str):
+        write_message(self.writer, {'jsonrpc': '2.0', 'id': id,
+                                    'error': {'code': code, 'message': message}})
+
+    def _notify(self, method: str, params: dict):
+        write_message(self.writer, {'jsonrpc': '2.0', 'method': method, 'params': params})
+
+    # Запросы
+
+    def _initialize(self, params: dict) -> dict:
+        self.initialized = True
+        return {
+            'capabilities': {
+                # 2 - клиент присылает только измененные участки текста
+                'textDocumentSync': {'openClose': True, 'change': 2},
+                'hoverProvider': True,
+                'definitionProvider': True
+            },
+            'serverInfo': {'name': 'uvm-language-server'}
+        }
+
+    def _shutdown(self, params: dict):
+        self.shutdown_requested = True
+        return None
+
+    def _hover(self, params: dict) -> Optional[dict]:
+        document, token = self._token(params)
+        if token is None or token.type != TokenType.IDENTIFIER:
+            return None
+        declaration = document.declaration(token.symbol)
+        if declaration is None:
+            return None
+        keyword, type_name = TYPE_NAMES[declaration.value_type]
+        return {
+            'contents': {'kind': 'plaintext',
+                         'value': f"{token.value} : {keyword} ({type_name})"},
+            'range': document.range(token.offset, token.offset + len(token.value))
+        }
+
+    def _definition(self, params: dict) -> Optional[dict]:
+        document, token = self._token(params)
+        if token is None or token.type != TokenType.IDENTIFIER:
+            return None
+        declaration = document.declaration(token.symbol)
+        if declaration is None:
+            return None
+        start = declaration.token.offset
+        return {'uri': document.uri, 'range': document.range(start, start + len(declaration.token.value))}
+
+    def _token(self, params: dict) -> Tuple[Optional[Document], Optional[Token]]:
+        document = self.documents.get(params['textDocument']['uri'])
+        if document is None:
+            return None, None
+        # Запрос отвечает по актуальному тексту, не дожидаясь отложенного анализа
+        if document.pending:
+            self._publish(document)
+        return document, document.token_at(document.offset(params['position']))
+
+    # Уведомления
+
+    def _did_open(self, params: dict):
+        item = params['textDocument']
+        document = Document(item['uri'], item.get('version', 0), item['text'])
+        self.documents[document.uri] = document
+        self._publish(document)
+
+    def _did_change(self, params: dict):
+        document = self.documents.get(params['textDocument']['uri'])
+        if document is None:
+            return
+        document.version = params['textDocument'].get('version', document.version)
+        for change in params['contentChanges']:
+            document.change(change)
+        document.deadline = time.monotonic() + self.debounce
+
+    def _did_close(self, params: dict):
+        uri = params['textDocument']['uri']
+        if self.documents.pop(uri, None) is not None:
+            self._notify('textDocument/publishDiagnostics', {'uri': uri, 'diagnostics': []})
+
+    def _publish(self, document: Document):
+        diagnostics = [self._diagnostic(document, error) for error in document.analyze()]
+        self._notify('textDocument/publishDiagnostics', {
+            'uri': document.uri,
+            'version': document.version,
+            'diagnostics': diagnostics
+        })
+
+    @staticmethod
+    def _diagnostic(document: Document, error: SyntaxError) -> dict:
+        offset = error_offset(error)
+        if offset is None:
+            # Ошибка без позиции (например, неожиданный конец программы) - в конце текста
+            start = end = len(document.text)
+        else:
+            start = min(offset, len(document.text))
+            token = document.token_at(start)
+            end = token.offset + len(token.value) if token is not None and token.offset == start else start + 1
+        return {
+            'range': document.range(start, min(end, len(document.text))),
+            'severity': SEVERITY_ERROR,
+            'source': 'uvm',
+            'message': str(error)
+        }
+
+
+def serve_stdio(debounce: float = 0.2):
+    code = LanguageServer(sys.stdin.buffer, sys.stdout.buffer, debounce).serve()
+    sys.stdout.flush()
+    # Поток чтения заблокирован на stdin, обычное завершение интерпретатора на нем падает
+    os._exit(code)
@@ -1,17 +1,208 @@
 import re
 
-from typing import List
+from typing import Iterator, List, Optional, Tuple, Union
 
+from src.source_map import SourceMap
+from src.symbol_table import SymbolTable
 from src.tokens.token import Token
+from src.tokens.token_buffer import TokenBuffer
 from src.tokens.token_type import TokenType
 
+
+# Таблицы лексем строятся один раз при импорте модуля
+KEYWORDS = {
+    'program': TokenType.PROGRAM,
+    'var': TokenType.VAR,
+    'begin': TokenType.BEGIN,
+    'end.': TokenType.END,
+    'true': TokenType.BOOLEAN,
+    'false': TokenType.BOOLEAN,
+    'as': TokenType.AS,
+    'if': TokenType.IF,
+    'then': TokenType.THEN,
+    'else': TokenType.ELSE,
+    'for': TokenType.FOR,
+    'to': TokenType.TO,
+    'do': TokenType.DO,
+    'while': TokenType.WHILE,
+    'read': TokenType.READ,
+    'write': TokenType.WRITE
+}
+
+DATA_TYPES = {
+    '%': TokenType.INTEGER_TYPE,
+    '!': TokenType.FLOAT_TYPE,
+    '$': TokenType.BOOLEAN_TYPE
+}
+
+OPERATORS = {
+    '~': TokenType.UNARY_NEGATION,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    ';': TokenType.SEMICOLON,
+    ':': TokenType.COLON,
+    ',': TokenType.COMMA
+}
+
+# Порядок важен: операторы проверяются как префиксы в порядке объявления
+COMPLEX_OPERATORS = {
+    'NE': TokenType.NE,
+    'EQ': TokenType.EQ,
+    'LT': TokenType.LT,
+    'LE': TokenType.LE,
+    'GT': TokenType.GT,
+    'GE': TokenType.GE,
+    'plus': TokenType.PLUS,
+    'min': TokenType.MIN,
+    'or': TokenType.OR,
+    'mult': TokenType.MULT,
+    'div': TokenType.DIV,
+    'and': TokenType.AND
+}
+
+# Все однозначные лексемы (типы данных и операторы) в одной таблице
+SYMBOLS = {**DATA_TYPES, **OPERATORS, **COMPLEX_OPERATORS}
+
+# Единое регулярное выражение лексера. Порядок альтернатив повторяет
+# порядок проверок посимвольного лексера, поэтому поток токенов совпадает.
+TOKEN_PATTERN = re.compile(r'''
+    (?P<COMMENT>\{[^}]*\}?)
+  | (?P<SPACE>\s+)
+  | (?P<SYMBOL>[%!$~();:,]|''' + '|'.join(map(re.escape, COMPLEX_OPERATORS)) + r''')
+  | (?P<IDENTIFIER>[^\W\d_][^\W_]*(?:\.[^\W_]*)*)
+  | (?P<NUMBER>\d(?:[\dA-DFa-dfHhOo.]|[Ee](?:[+-]\d+)?)*)
+  | (?P<ERROR>.)
+''', re.VERBOSE | re.DOTALL)
+
+# Форматы чисел в одном выражении: альтернативы проверяются в прежнем порядке
+# (двоичные, восьмеричные, десятичные, вещественные, шестнадцатеричные),
+# имя совпавшей группы определяет тип токена и способ получения значения
+NUMBER_PATTERN = re.compile(r'''
+    (?P<BINARY>[01]+[Bb])
+  | (?P<OCTAL>[0-7]+[Oo])
+  | (?P<DECIMAL>\d+[Dd]?)
+  | (?P<REAL>\d*\.\d+(?:[Ee][+-]?\d+)?|\d+\.\d*(?:[Ee][+-]?\d+)?)
+  | (?P<HEX>[\dA-Fa-f]+[Hh])
+''', re.VERBOSE)
+
+NUMBER_FORMATS = {
+    'BINARY': (TokenType.INTEGER, lambda text: int(text[:-1], 2)),
+    'OCTAL': (TokenType.INTEGER, lambda text: int(text[:-1], 8)),
+    'DECIMAL': (TokenType.INTEGER, lambda text: int(text.rstrip('Dd'))),
+    'REAL': (TokenType.FLOAT, float),
+    'HEX': (TokenType.INTEGER, lambda text: int(text[:-1], 16))
+}
+
+
+def scan_number(value: str, source_map: Optional[SourceMap] = None,
+                offset: int = -1) -> Tuple[TokenType, Union[int, float]]:
+    # Тип и значение числового литерала за одно сопоставление
+    match = NUMBER_PATTERN.fullmatch(value)
+    if match is not None:
+        token_type, decode = NUMBER_FORMATS[match.lastgroup]
+        return token_type, decode(value)
+    
+    message = f"Неверный формат числа: {value}"
+    if source_map is not None:
+        raise source_map.error(message, offset)
+    raise SyntaxError(message)
+
+
+def classify_number(value: str, source_map: Optional[SourceMap] = None,
+                    offset: int = -1) -> TokenType:
+    # Определение типа числа
+    return scan_number(value, source_map, offset)[0]
+
+
+def decode_number(value: str) -> Union[int, float]:
+    # Значение числового литерала: int для целых форматов, float для вещественных
+    return scan_number(value)[1]
+
+
 class Lexer:
-    def __init__(self, code: str):
+    def __init__(self, code: str, legacy: bool = False, symbols: Optional[SymbolTable] = None):
         self.code = code
+        self.source_map = SourceMap(code)
+        # Таблица идентификаторов может быть общей для нескольких программ
+        self.symbols = symbols if symbols is not None else SymbolTable()
         self.tokens: List[Token] = []
         self.current_pos = 0
+        # Посимвольный лексер оставлен для сравнения результатов и скорости
+        self.legacy = legacy
     
     def tokenize(self) -> List[Token]:
+        if self.legacy:
+            return self._tokenize_legacy()
+        
+        self.tokens.extend(self.scan(self.current_pos))
+        self.current_pos = len(self.code)
+        return self.tokens
+    
+    def scan(self, position: int = 0) -> Iterator[Token]:
+        # Ленивый разбор с заданного смещения: инкрементальная перекомпиляция
+        # останавливается, как только новые токены совпадут со старыми
+        source_map = self.source_map
+        symbol_ids = self.symbols.ids
+        symbol_names = self.symbols.names
+        for match in TOKEN_PATTERN.finditer(self.code, position):
+            kind = match.lastgroup
+            
+            if kind == 'SPACE' or kind == 'COMMENT':
+                continue
+            
+            value = match.group()
+            start = match.start()
+            if kind == 'IDENTIFIER':
+                token_type = KEYWORDS.get(value)
+                if token_type is not None:
+                    yield Token(token_type, value, start, source_map)
+                    continue
+                # Все вхождения имени ссылаются на одну строку из таблицы
+                symbol = symbol_ids.get(value)
+                if symbol is None:
+                    symbol = self.symbols.intern(value)
+                yield Token(TokenType.IDENTIFIER, symbol_names[symbol], start,
+                            source_map, None, symbol)
+            elif kind == 'SYMBOL':
+                yield Token(SYMBOLS[value], value, start, source_map)
+            elif kind == 'NUMBER':
+                token_type, literal = scan_number(value, source_map, start)
+                yield Token(token_type, value, start, source_map, literal)
+            else:
+                self.current_pos = start
+                raise source_map.error(f"Неожиданный символ: {value}", start)
+    
+    def tokenize_buffer(self) -> TokenBuffer:
+        # Компактный вариант tokenize: лексемы не копируются, хранятся смещения
+        buffer = TokenBuffer(self.code, self.source_map, self.symbols)
+        append = buffer.append
+        intern = self.symbols.intern
+        for match in TOKEN_PATTERN.finditer(self.code, self.current_pos):
+            kind = match.lastgroup
+            
+            if kind == 'SPACE' or kind == 'COMMENT':
+                continue
+            
+            start, end = match.span()
+            if kind == 'IDENTIFIER':
+                value = match.group()
+                token_type = KEYWORDS.get(value, TokenType.IDENTIFIER)
+                if token_type == TokenType.IDENTIFIER:
+                    intern(value)
+                append(token_type, start, end)
+            elif kind == 'SYMBOL':
+                append(SYMBOLS[match.group()], start, end)
+            elif kind == 'NUMBER':
+                token_type, literal = scan_number(match.group(), self.source_map, start)
+                append(token_type, start, end, literal)
+            else:
+                self.current_pos = start
+                raise self.source_map.error(f"Неожиданный символ: {match.group()}", start)
+        
+        self.current_pos = len(self.code)
+        return buffer
+    
+    def _tokenize_legacy(self) -> List[Token]:
         while self.current_pos < len(self.code):
             char = self.code[self.current_pos]
             
@@ -45,7 +236,7 @@ class Lexer:
             
             
             # Неизвестный символ
-            raise SyntaxError(f"Неожиданный символ: {char}")
+            raise self.source_map.error(f"Неожиданный символ: {char}", self.current_pos)
         
         return self.tokens
     
@@ -60,13 +251,8 @@ class Lexer:
 
     def _handle_data_type(self, type_char: str):
         # Добавление токена типа данных
-        type_map = {
-            '%': TokenType.INTEGER_TYPE,
-            '!': TokenType.FLOAT_TYPE,
-            '$': TokenType.BOOLEAN_TYPE
-        }
-        
-        self.tokens.append(Token(type_map[type_char], type_char))
+        self.tokens.append(Token(DATA_TYPES[type_char], type_char,
+                                 self.current_pos, self.source_map))
         self.current_pos += 1
 
     def _handle_identifier(self):
@@ -79,28 +265,13 @@ class Lexer:
         
         value = self.code[start:self.current_pos]
         
-        keywords = {
-            # Существующие ключевые слова
-            'program': TokenType.PROGRAM,
-            'var': TokenType.VAR,
-            'begin': TokenType.BEGIN,
-            'end.': TokenType.END,
-            'true': TokenType.BOOLEAN,
-            'false': TokenType.BOOLEAN,
-            'as': TokenType.AS,
-            'if': TokenType.IF,
-            'then': TokenType.THEN,
-            'else': TokenType.ELSE,
-            'for': TokenType.FOR,
-            'to': TokenType.TO,
-            'do': TokenType.DO,
-            'while': TokenType.WHILE,
-            'read': TokenType.READ,
-            'write': TokenType.WRITE
-        }
-        
-        token_type = keywords.get(value, TokenType.IDENTIFIER)
-        self.tokens.append(Token(token_type, value))
+        token_type = KEYWORDS.get(value, TokenType.IDENTIFIER)
+        if token_type == TokenType.IDENTIFIER:
+            symbol = self.symbols.intern(value)
+            self.tokens.append(Token(token_type, self.symbols.names[symbol], start,
+                                     self.source_map, None, symbol))
+        else:
+            self.tokens.append(Token(token_type, value, start, self.source_map))
     
     def _handle_number(self):
         # Обработка различных форматов чисел
@@ -108,61 +279,31 @@ class Lexer:
         while (self.current_pos < len(self.code) and
                (self.code[self.current_pos].isdigit() or
                 self.code[self.current_pos] in 'ABCDEFabcdefHhOoBbDd.')):
+            # Знак порядка: 1.5E+3
+            if (self.code[self.current_pos] in 'Ee' and
+                    self.code[self.current_pos + 1:self.current_pos + 2] in ('+', '-') and
+                    self.code[self.current_pos + 2:self.current_pos + 3].isdigit()):
+                self.current_pos += 2
             self.current_pos += 1
         
         value = self.code[start:self.current_pos]
         
-        # Определение типа числа
-        if re.match(r'^[01]+[Bb]$', value):
-            self.tokens.append(Token(TokenType.INTEGER, value))
-        elif re.match(r'^[0-7]+[Oo]$', value):
-            self.tokens.append(Token(TokenType.INTEGER, value))
-        elif re.match(r'^\d+[Dd]?$', value):
-            self.tokens.append(Token(TokenType.INTEGER, value))
-        elif re.match(r'^\d*\.\d+([Ee][+-]?\d+)?$', value) or \
-             re.match(r'^\d+\.\d*([Ee][+-]?\d+)?$', value):
-            self.tokens.append(Token(TokenType.FLOAT, value))
-        elif re.match(r'^[\dA-Fa-f]+[Hh]$', value):
-            self.tokens.append(Token(TokenType.INTEGER, value))
-        else:
-            raise SyntaxError(f"Неверный формат числа: {value}")
+        token_type, literal = scan_number(value, self.source_map, start)
+        self.tokens.append(Token(token_type, value, start, self.source_map, literal))
     
     def _handle_operators(self) -> bool:
-        operators = {
-            '~': TokenType.UNARY_NEGATION,
-            '(': TokenType.LPAREN,
-            ')': TokenType.RPAREN,
-            ';': TokenType.SEMICOLON,
-            ':': TokenType.COLON,
-            ',': TokenType.COMMA
-        }
-        
-        complex_operators = {
-            'NE': TokenType.NE,
-            'EQ': TokenType.EQ,
-            'LT': TokenType.LT,
-            'LE': TokenType.LE,
-            'GT': TokenType.GT,
-            'GE': TokenType.GE,
-            'plus': TokenType.PLUS,
-            'min': TokenType.MIN,
-            'or': TokenType.OR,
-            'mult': TokenType.MULT,
-            'div': TokenType.DIV,
-            'and': TokenType.AND
-        }
-        
         # Простые операторы
-        if self.code[self.current_pos] in operators:
-            self.tokens.append(Token(operators[self.code[self.current_pos]],
-                                     self.code[self.current_pos]))
+        if self.code[self.current_pos] in OPERATORS:
+            self.tokens.append(Token(OPERATORS[self.code[self.current_pos]],
+                                     self.code[self.current_pos],
+                                     self.current_pos, self.source_map))
             self.current_pos += 1
             return True
         
         # Сложные операторы
-        for op, token_type in complex_operators.items():
+        for op, token_type in COMPLEX_OPERATORS.items():
             if self.code[self.current_pos:].startswith(op):
-                self.tokens.append(Token(token_type, op))
+                self.tokens.append(Token(token_type, op, self.current_pos, self.source_map))
                 self.current_pos += len(op)
                 return True
         return False
@@ -0,0 +1,167 @@
+from typing import Generator, List, Optional
+
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.ast_node_type import NodeType
+from src.ast_nodes.traversal import count_nodes, trampoline
+from src.interpreter import BINARY_OPERATORS, literal_value
+from src.lexer import classify_number
+from src.tokens.token_type import TokenType
+
+
+# Нейтральные элементы: (оператор, значение литерала, с какой стороны может стоять литерал)
+IDENTITIES = [
+    (TokenType.PLUS, 0, ('left', 'right')),
+    (TokenType.MIN, 0, ('right',)),
+    (TokenType.MULT, 1, ('left', 'right')),
+    (TokenType.DIV, 1, ('right',)),
+    (TokenType.AND, True, ('left', 'right')),
+    (TokenType.OR, False, ('left', 'right'))
+]
+
+
+class ConstantFolder:
+    """Свертка констант и алгебраические упрощения AST.
+    
+    Вычисляет поддеревья из одних литералов, убирает нейтральные операнды
+    (x plus 0, x mult 1, ~~x и т.п.) и ветви if с постоянным условием.
+    _statement и _expression - генераторы для trampoline, поэтому глубина
+    дерева не ограничена рекурсией.
+    """
+
+    def __init__(self):
+        self.eliminated = 0
+
+    def optimize(self, root: ASTNode) -> ASTNode:
+        before = count_nodes(root)
+        
+        statements: List[ASTNode] = []
+        for node in root.children:
+            if node.type == NodeType.VARIABLE_DECLARATION:
+                statements.append(node)
+                continue
+            node = trampoline(self._statement(node))
+            if node is not None:
+                statements.append(node)
+        root.children = statements
+        
+        self.eliminated += before - count_nodes(root)
+        return root
+
+    def _statement(self, node: Optional[ASTNode]) -> Generator:
+        """Упрощенный оператор; None - оператор можно удалить целиком"""
+        if node is None:
+            return None
+        
+        if node.type == NodeType.ASSIGNMENT:
+            node.children[0] = yield self._expression(node.children[0])
+        elif node.type == NodeType.CONDITIONAL:
+            condition = node.children[0] = yield self._expression(node.children[0])
+            for index in range(1, len(node.children)):
+                node.children[index] = yield self._nested(node.children[index])
+            
+            # Ветвь с постоянным условием выбирается на этапе компиляции
+            if condition.type == NodeType.LITERAL:
+                if literal_value(condition):
+                    return node.children[1]
+                return node.children[2] if len(node.children) > 2 else None
+        elif node.type == NodeType.LOOP and node.value == 'for':
+            node.children[0] = yield self._statement(node.children[0])
+            node.children[1] = yield self._expression(node.children[1])
+            node.children[2] = yield self._nested(node.children[2])
+        elif node.type == NodeType.LOOP:
+            condition = node.children[0] = yield self._expression(node.children[0])
+            node.children[1] = yield self._nested(node.children[1])
+            if condition.type == NodeType.LITERAL and not literal_value(condition):
+                return None
+        elif node.type == NodeType.OUTPUT:
+            children = []
+            for child in node.children:
+                children.append((yield self._expression(child)))
+            node.children = children
+        
+        return node
+
+    def _nested(self, node: Optional[ASTNode]) -> Generator:
+        # Вложенный оператор нельзя удалить: пустого оператора в языке нет
+        simplified = yield self._statement(node)
+        return simplified if simplified is not None else node
+
+    def _expression(self, node: ASTNode) -> Generator:
+        if node.type == NodeType.UNARY_OPERATION:
+            operand = node.children[0] = yield self._expression(node.children[0])
+            if operand.type == NodeType.LITERAL:
+                return self._literal(not literal_value(operand), node) or node
+            # ~~x = x
+            if operand.type == NodeType.UNARY_OPERATION:
+                return operand.children[0]
+            return node
+        
+        if node.type != NodeType.BINARY_OPERATION:
+            return node
+        
+        left = node.children[0] = yield self._expression(node.children[0])
+        right = node.children[1] = yield self._expression(node.children[1])
+        operator_type = node.value
+        
+        if left.type == NodeType.LITERAL and right.type == NodeType.LITERAL:
+            folded = self._fold(operator_type, literal_value(left), literal_value(right), node)
+            if folded is not None:
+                return folded
+        
+        return self._simplify(operator_type, node, left, right)
+
+    def _fold(self, operator_type: TokenType, left, right, node: ASTNode) -> Optional[ASTNode]:
+        if operator_type == TokenType.AND:
+            return self._literal(left and right, node)
+        if operator_type == TokenType.OR:
+            return self._literal(left or right, node)
+        try:
+            return self._literal(BINARY_OPERATORS[operator_type](left, right), node)
+        except (ZeroDivisionError, TypeError):
+            # Ошибка останется на этапе исполнения, как и без оптимизации
+            return None
+
+    def _simplify(self, operator_type: TokenType, node: ASTNode,
+                  left: ASTNode, right: ASTNode) -> ASTNode:
+        for identity_operator, identity, sides in IDENTITIES:
+            if operator_type != identity_operator:
+                continue
+            for side in sides:
+                constant, other = (left, right) if side == 'left' else (right, left)
+                if constant.type != NodeType.LITERAL:
+                    continue
+                value = literal_value(constant)
+                if type(value) is type(identity) and value == identity:
+                    return other
+                # 0.0 и 1.0 нейтральны, только если другой операнд уже вещественный
+                if (isinstance(value, float) and not isinstance(identity, bool)
+                        and value == identity and other.value_type == TokenType.FLOAT):
+                    return other
+        return node
+
+    @staticmethod
+    def _literal(value, node: ASTNode) -> Optional[ASTNode]:
+        """Литерал со значением value; None, если его нельзя записать в синтаксисе языка"""
+        if isinstance(value, bool):
+            text, value_type = ('true' if value else 'false'), TokenType.BOOLEAN
+        elif isinstance(value, int):
+            # Отрицательных литералов в языке нет
+            if value < 0:
+                return None
+            text, value_type = str(value), TokenType.INTEGER
+        else:
+            text = repr(value)
+            try:
+                if classify_number(text) != TokenType.FLOAT:
+                    return None
+            except SyntaxError:
+                return None
+            value_type = TokenType.FLOAT
+        
+        return ASTNode(
+            type=NodeType.LITERAL,
+            value=text,
+            token=node.token,
+            value_type=value_type,
+            literal=value
+        )
@@ -1,255 +1,303 @@
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple
 
+from src.diagnostics import Diagnostics
+from src.grammar import (BINARY_PRECEDENCE, CLOSING_PAREN, DECLARATION_END, DECLARATIONS_START,
+                         GRAMMAR, OPERAND_TYPES, PREFIX_TYPES, PROGRAM_END, PROGRAM_START,
+                         Repeat, STATEMENT_SEPARATOR, STATEMENTS_START, TABLE, Tail, Terminal)
 from src.tokens.token import Token
+from src.tokens.token_stream import TokenStream
 from src.tokens.token_type import TokenType
 
+
+# Точки синхронизации после ошибки в операторе
+STATEMENT_SYNC = (TokenType.SEMICOLON, TokenType.BEGIN, TokenType.END, TokenType.THEN, TokenType.DO)
+# Точки синхронизации после ошибки в объявлении переменных
+DECLARATION_SYNC = (TokenType.SEMICOLON, TokenType.BEGIN, TokenType.END)
+
+
 class Parser:
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
+    """Синтаксический анализатор по таблице LL(1) из src.grammar.
+    
+    Parser только проверяет программу: действия правил (_reduce) и узлы
+    выражений (_operand, _unary, _binary) возвращают None. ASTBuilder
+    разбирает тем же кодом и переопределяет их, чтобы строить дерево.
+    """
+
+    def __init__(self, tokens: Iterable[Token], diagnostics: Optional[Diagnostics] = None):
+        # Токены читаются через буфер предпросмотра, поэтому подходит и список,
+        # и ленивый поток (например, StreamingLexer)
+        self.stream = TokenStream(tokens)
         self.current_pos = 0
+        # Без diagnostics разбор прерывается на первой ошибке
+        self.diagnostics = diagnostics
+        # Нестрогий разбор пропускает отсутствующие обязательные токены
+        self.strict = True
+        # Разбор продолжен с ветви после 'then' ошибочного условия
+        self._after_then = False
     
     def parse(self):
-        # Начало разбора программы
-        if not self._match(TokenType.PROGRAM):
-            raise SyntaxError("Программа должна начинаться с 'program'")
-        
-        # Разбор объявления переменных
-        if not self._match(TokenType.VAR):
-            raise SyntaxError("Ожидается объявление переменных после 'program'")
-        
-        self._parse_variable_declarations()
+        self.parse_header()
+        for _ in self.iter_statements():
+            pass
+        self.parse_end()
+
+    def parse_header(self) -> list:
+        """Начало программы до 'begin' включительно; возвращает объявления переменных"""
+        self._require(PROGRAM_START)
+        self._require(DECLARATIONS_START)
+        declarations = self._parse_variable_declarations()
+        self._require(STATEMENTS_START)
+        return declarations
+
+    def parse_end(self):
+        self._require(PROGRAM_END)
+
+    def _parse_variable_declarations(self) -> list:
+        declarations = []
         
-        # Начало блока операторов
-        if not self._match(TokenType.BEGIN):
-            raise SyntaxError("Ожидается 'begin' перед началом операторов")
+        while not self._check(TokenType.BEGIN):
+            try:
+                # Объявления добавляются до проверки ';', чтобы пропущенная точка
+                # с запятой не делала переменные необъявленными
+                declarations.extend(self._parse_rule('variables') or ())
+                self._expect(DECLARATION_END)
+            except SyntaxError as error:
+                self._report(error)
+                if not self._skip_declaration():
+                    break
         
-        self._parse_statements()
+        return declarations
+
+    def iter_statements(self) -> Iterator[Tuple[object, int, int]]:
+        """Операторы до 'end.' по одному.
         
-        # Конец программы
-        if not self._match(TokenType.END):
-            raise SyntaxError("Программа должна заканчиваться на 'end.'")
-    
-    def _parse_variable_declarations(self):
-        while not self._check(TokenType.BEGIN):
-            # Парсинг списка идентификаторов
-            identifiers = []
-            while True:
-                if not self._check(TokenType.IDENTIFIER):
-                    raise SyntaxError("Ожидается идентификатор")
-                
-                identifiers.append(self._advance())
+        Вместе с оператором возвращаются номера его первого токена и токена
+        после разделителя (считая от начала потока, переданного анализатору).
+        """
+        while not self._check(TokenType.END):
+            start = self.current_pos
+            try:
+                statement = self._parse_rule('statement')
                 
-                # Выход из цикла, если нет запятой
-                if not self._match(TokenType.COMMA):
+                if self._skip_else():
+                    pass
+                elif self.strict:
+                    # Точка с запятой обязательна между операторами, кроме последнего
+                    if not self._check_next(TokenType.END) and not self._check(TokenType.END):
+                        self._expect(STATEMENT_SEPARATOR)
+                else:
+                    # Необязательная точка с запятой между операторами
+                    self._match(TokenType.SEMICOLON)
+            except SyntaxError as error:
+                # Ошибочный оператор пропускается целиком
+                self._report(error)
+                if not self._skip_statement():
                     break
+                continue
             
-            # Ожидание двоеточия и типа
-            if not self._match(TokenType.COLON):
-                raise SyntaxError("Ожидается ':' после списка идентификаторов")
-            
-            # Определение типа
-            if not self._check_types([TokenType.INTEGER_TYPE, 
-                                      TokenType.FLOAT_TYPE, 
-                                      TokenType.BOOLEAN_TYPE]):
-                raise SyntaxError("Неверный тип данных")
-            
-            self._advance()  # Пропуск типа
+            yield statement, start, self.current_pos
+
+    def _parse_rule(self, rule: str):
+        """Разбор нетерминала rule по таблице LL(1) без рекурсии.
+        
+        Правая часть выбирается одним поиском по типу текущего токена.
+        Вложенные правила разбираются на явном стеке кадров, их значения
+        (токены, списки, результаты действий) копятся в values; после
+        разбора правой части значения заменяются результатом _reduce.
+        """
+        values = []
+        # Кадр: [правая часть, номер следующего символа, начало ее значений в values]
+        frames = [self._enter(rule, values)]
+        while frames:
+            frame = frames[-1]
+            production, position, mark = frame
+            symbols = production.symbols
+            if position == len(symbols):
+                frames.pop()
+                result = self._reduce(production.name, values[mark:])
+                del values[mark:]
+                values.append(result)
+                continue
             
-            # Ожидание точки с запятой
-            if not self._match(TokenType.SEMICOLON):
-                raise SyntaxError("Ожидается ';' после объявления типа")
+            frame[1] = position + 1
+            symbol = symbols[position]
+            if symbol.__class__ is Terminal:
+                values.append(self._expect(symbol))
+            elif symbol.__class__ is str:
+                if symbol == 'expression':
+                    values.append(self._parse_expression())
+                else:
+                    frames.append(self._enter(symbol, values))
+            elif symbol.__class__ is Repeat:
+                values.append(self._parse_repeat(symbol))
+            elif symbol.__class__ is Tail:
+                token = self.stream.peek()
+                if token is not None and token.type in symbol.keyword.types:
+                    self._advance()
+                    frames.append(self._enter(symbol.item, values))
+                else:
+                    values.append(None)
+            else:
+                raise TypeError(f"Символ {symbol!r} не разбирается внутри оператора")
+        return values[0]
+
+    def _enter(self, rule: str, values: list) -> list:
+        token = self.stream.peek()
+        production = TABLE[rule].get(token.type if token is not None else None)
+        if production is None:
+            raise self._error(GRAMMAR[rule].message)
+        return [production, 0, len(values)]
+
+    def _parse_repeat(self, symbol: Repeat) -> list:
+        # Элементы повторения - токены и выражения, они разбираются без кадров
+        items = [self._parse_item(symbol.item)]
+        separators = symbol.separator.types
+        while True:
+            token = self.stream.peek()
+            if token is None or token.type not in separators:
+                return items
+            self._advance()
+            items.append(self._parse_item(symbol.item))
+
+    def _parse_item(self, item):
+        if item == 'expression':
+            return self._parse_expression()
+        return self._expect(item)
+
+    def _reduce(self, name: str, values: list):
+        # Действие после разбора правой части name; Parser дерево не строит
+        return None
     
-    def _parse_statements(self):
-        while not self._check(TokenType.END):
-            # Разбор оператора
-            self._parse_statement()
-            
-            # Проверка точки с запятой для всех, кроме последнего оператора
-            if not self._check_next(TokenType.END) and not self._check(TokenType.END):
-                if not self._match(TokenType.SEMICOLON):
-                    raise SyntaxError("Требуется точка с запятой между операторами")
+    def _parse_expression(self):
+        """Выражение без рекурсии: операции и скобки копятся на явном стеке.
+        
+        Возвращает корень выражения, построенный через _operand, _unary и
+        _binary; Parser узлов не строит, и результат - None. Глубина
+        вложенности скобок и '~' ограничена только памятью.
+        """
+        # Разобранные операнды и ожидающие операнда токены операций, '(' и '~'
+        operands = []
+        operators = []
+        open_parens = 0
+        while True:
+            # Операнд: цепочка '~' и '(' перед идентификатором или литералом
+            token = self.stream.peek()
+            while token is not None and token.type in PREFIX_TYPES:
+                if token.type == TokenType.LPAREN:
+                    open_parens += 1
+                operators.append(self._advance())
+                token = self.stream.peek()
+            if token is None or token.type not in OPERAND_TYPES:
+                raise self._error(GRAMMAR['multiplier'].message)
+            operands.append(self._operand(self._advance()))
+            self._reduce_unary(operands, operators)
             
-    
-    def _parse_statement(self):
-        # Расширим разбор операторов
-        if self._check(TokenType.IDENTIFIER):
-            self._parse_assignment()
-        elif self._check(TokenType.IF):
-            self._parse_conditional()
-        elif self._check(TokenType.FOR):
-            self._parse_fixed_loop()
-        elif self._check(TokenType.WHILE):
-            self._parse_conditional_loop()
-        elif self._check(TokenType.READ):
-            self._parse_input()
-        elif self._check(TokenType.WRITE):
-            self._parse_output()
-        else:
-            raise SyntaxError("Неожиданный оператор")
+            # Операция после операнда; ')' закрывает ближайшую открытую скобку
+            while True:
+                token = self.stream.peek()
+                token_type = token.type if token is not None else None
+                precedence = BINARY_PRECEDENCE.get(token_type)
+                if precedence is not None:
+                    self._reduce_binary(operands, operators, precedence)
+                    operators.append(self._advance())
+                    break
+                if token_type == TokenType.RPAREN and open_parens:
+                    self._reduce_binary(operands, operators, 0)
+                    operators.pop()
+                    open_parens -= 1
+                    self._advance()
+                    self._reduce_unary(operands, operators)
+                    continue
+                
+                # Конец выражения: у незакрытых скобок ожидается ')'
+                while operators:
+                    self._reduce_binary(operands, operators, 0)
+                    if operators:
+                        operators.pop()
+                        self._expect(CLOSING_PAREN)
+                        self._reduce_unary(operands, operators)
+                return operands.pop()
 
-    def _parse_assignment(self):
-        # Новый синтаксис присваивания с 'as'
-        variable = self._advance()  # Идентификатор
-        
-        if not self._match(TokenType.AS):
-            raise SyntaxError("Ожидается 'as' в операторе присваивания")
-        
-        # Парсинг выражения справа от 'as'
-        self._parse_expression()
+    def _reduce_binary(self, operands: list, operators: List[Token], precedence: int):
+        # Сворачивание бинарных операций с приоритетом не ниже precedence до ближайшей '('
+        while operators:
+            top = BINARY_PRECEDENCE.get(operators[-1].type)
+            if top is None or top < precedence:
+                return
+            operator = operators.pop()
+            right = operands.pop()
+            operands.append(self._binary(operator, operands.pop(), right))
 
-    def _parse_conditional(self):
-        # Условный оператор
-        if not self._match(TokenType.IF):
-            raise SyntaxError("Ожидается 'if'")
-        
-        # Условие
-        self._parse_expression()
-        if not self._match(TokenType.THEN):
-            raise SyntaxError(f"Ожидается 'then', получено: {self.tokens[self.current_pos]}")
-        
-        # Оператор в случае истины
-        self._parse_statement()
-        
-        # Необязательный else
-        if self._match(TokenType.ELSE):
-            self._parse_statement()
+    def _reduce_unary(self, operands: list, operators: List[Token]):
+        # '~' относится к множителю, который только что разобран целиком
+        while operators and operators[-1].type == TokenType.UNARY_NEGATION:
+            operands.append(self._unary(operators.pop(), operands.pop()))
 
-    def _parse_fixed_loop(self):
-        # Цикл с фиксированным числом повторений
-        if not self._match(TokenType.FOR):
-            raise SyntaxError("Ожидается 'for'")
-        
-        # Начальное присваивание
-        self._parse_assignment()
-        
-        if not self._match(TokenType.TO):
-            raise SyntaxError("Ожидается 'to'")
-        
-        # Выражение завершения цикла
-        self._parse_expression()
-        
-        if not self._match(TokenType.DO):
-            raise SyntaxError("Ожидается 'do'")
-        
-        # Тело цикла
-        self._parse_statement()
+    def _operand(self, token: Token):
+        # Узлы выражения строит ASTBuilder; Parser только проверяет синтаксис
+        return None
 
-    def _parse_conditional_loop(self):
-        # Условный цикл
-        if not self._match(TokenType.WHILE):
-            raise SyntaxError("Ожидается 'while'")
-        
-        # Условие цикла
-        self._parse_expression()
-        
-        if not self._match(TokenType.DO):
-            raise SyntaxError("Ожидается 'do'")
-        
-        # Тело цикла
-        self._parse_statement()
+    def _unary(self, operator: Token, operand):
+        return None
 
-    def _parse_input(self):
-        # Оператор ввода
-        if not self._match(TokenType.READ):
-            raise SyntaxError("Ожидается 'read'")
-        
-        if not self._match(TokenType.LPAREN):
-            raise SyntaxError("Ожидается '('")
-        
-        # Первый идентификатор
-        if not self._check(TokenType.IDENTIFIER):
-            raise SyntaxError("Ожидается идентификатор")
-        
-        self._advance()  # Первый идентификатор
-        
-        # Дополнительные идентификаторы через запятую
-        while self._match(TokenType.COMMA):
-            if not self._check(TokenType.IDENTIFIER):
-                raise SyntaxError("Ожидается идентификатор")
-            self._advance()
-        
-        if not self._match(TokenType.RPAREN):
-            raise SyntaxError("Ожидается ')'")
+    def _binary(self, operator: Token, left, right):
+        return None
 
-    def _parse_output(self):
-        # Оператор вывода
-        if not self._match(TokenType.WRITE):
-            raise SyntaxError("Ожидается 'write'")
-        
-        if not self._match(TokenType.LPAREN):
-            raise SyntaxError("Ожидается '('")
-        
-        # Первое выражение
-        self._parse_expression()
-        
-        # Дополнительные выражения через запятую
-        while self._match(TokenType.COMMA):
-            self._parse_expression()
-        
-        if not self._match(TokenType.RPAREN):
-            raise SyntaxError("Ожидается ')'")
-    
-    def _parse_compound_statement(self):
-        # Составной оператор в квадратных скобках
-        if not self._match(TokenType.LPAREN):
-            raise SyntaxError("Ожидается '[' в начале составного оператора")
-        
-        # Разбор операторов внутри составного оператора
-        while not self._check(TokenType.RPAREN):
-            self._parse_statement()
-            # Разрешаем разделители между операторами
-            self._match(TokenType.SEMICOLON)
-        
-        if not self._match(TokenType.RPAREN):
-            raise SyntaxError("Ожидается ']' в конце составного оператора")
-    
-    def _parse_expression(self):
-        # Разбор выражения: операнды и операции
-        self._parse_operand()
-        
-        # Поддержка операций отношения
-        while self._check_types([
-            TokenType.NE, TokenType.EQ, TokenType.LT,
-            TokenType.LE, TokenType.GT, TokenType.GE
-        ]):
-            self._advance()  # Оператор отношения
-            self._parse_operand()
-    
-    def _parse_operand(self):
-        # Разбор операнда: слагаемые и операции сложения
-        self._parse_summand()
-        
-        while self._check_types([TokenType.PLUS, TokenType.MIN, TokenType.OR]):
-            self._advance()  # Оператор сложения
-            self._parse_summand()
-    
-    def _parse_summand(self):
-        # Разбор слагаемого: множители и операции умножения
-        self._parse_multiplier()
-        
-        while self._check_types([TokenType.MULT, TokenType.DIV, TokenType.AND]):
-            self._advance()  # Оператор умножения
-            self._parse_multiplier()
-    
-    def _parse_multiplier(self):
-        # Разбор множителя: идентификаторы, числа, константы, унарные операции
-        if self._check(TokenType.IDENTIFIER):
-            self._advance()
-        elif self._check(TokenType.INTEGER):
-            self._advance()
-        elif self._check(TokenType.FLOAT):
+    def _expect(self, terminal: Terminal) -> Optional[Token]:
+        # Обязательный токен; в нестрогом режиме отсутствующий токен пропускается
+        token = self.stream.peek()
+        if token is not None and token.type in terminal.types:
+            return self._advance()
+        if self.strict:
+            raise self._error(terminal.message.format(token=token))
+        return None
+
+    def _require(self, terminal: Terminal):
+        # Обязательное слово программы: при сборе диагностики разбор продолжается без него
+        token = self.stream.peek()
+        if token is not None and token.type in terminal.types:
             self._advance()
-        elif self._check(TokenType.BOOLEAN):
+        elif self.strict:
+            self._report(self._error(terminal.message))
+
+    def _report(self, error: SyntaxError):
+        if self.diagnostics is None:
+            raise error
+        self.diagnostics.report(error)
+
+    def _synchronize(self, types) -> bool:
+        # Режим паники: пропуск токенов до точки синхронизации; False в конце потока
+        while not self._check(*types):
+            if self.stream.peek() is None:
+                return False
             self._advance()
-        elif self._check(TokenType.UNARY_NEGATION):
-            self._advance()  # Унарная операция
-            self._parse_multiplier()
-        elif self._match(TokenType.LPAREN):
-            self._parse_expression()
-            if not self._match(TokenType.RPAREN):
-                raise SyntaxError("Ожидается ')' в конце выражения")
-        else:
-            raise SyntaxError("Неожиданный множитель в выражении")
+        return True
+
+    def _skip_declaration(self) -> bool:
+        """Пропуск ошибочного объявления; False, если объявлений больше нет"""
+        return self._synchronize(DECLARATION_SYNC) and self._match(TokenType.SEMICOLON)
+
+    def _skip_statement(self) -> bool:
+        """Пропуск ошибочного оператора; False, если достигнут конец программы"""
+        if not self._synchronize(STATEMENT_SYNC) or self._check(TokenType.END):
+            return False
+        # После 'then' и 'do' разбор продолжается с вложенного оператора
+        self._after_then = self._check(TokenType.THEN)
+        self._advance()
+        return True
+
+    def _skip_else(self) -> bool:
+        # Ветвь else условного оператора, разбор которого продолжен с 'then',
+        # разбирается как следующий оператор, без ошибки о точке с запятой
+        after_then, self._after_then = self._after_then, False
+        return after_then and self._match(TokenType.ELSE)
+
+    def _error(self, message: str) -> SyntaxError:
+        # Ошибка с позицией текущего токена в исходном тексте
+        token = self.stream.peek()
+        if token is None:
+            return SyntaxError(f"{message} (конец программы)")
+        return token.error(message)
 
     def _match(self, *types) -> bool:
         # Проверка текущего токена и его продвижение
@@ -259,24 +307,20 @@ class Parser:
         return False
     
     def _check_next(self, *types) -> bool:
-        if self.current_pos + 1 >= len(self.tokens):
+        token = self.stream.peek(1)
+        if token is None:
             return False
-        return self.tokens[self.current_pos + 1].type in types
+        return token.type in types
 
     def _check(self, *types) -> bool:
         # Проверка текущего токена без продвижения
-        if self.current_pos >= len(self.tokens):
-            return False
-        return self.tokens[self.current_pos].type in types
-    
-    def _check_types(self, types) -> bool:
-        # Проверка типов
-        if self.current_pos >= len(self.tokens):
+        token = self.stream.peek()
+        if token is None:
             return False
-        return self.tokens[self.current_pos].type in types
+        return token.type in types
     
     def _advance(self) -> Token:
         # Продвижение к следующему токену
-        token = self.tokens[self.current_pos]
+        token = self.stream.advance()
         self.current_pos += 1
         return token
@@ -0,0 +1,262 @@
+import sys
+
+from functools import lru_cache
+from typing import Callable, Dict, Generator, Iterator, List, Optional, TextIO
+
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.ast_node_type import NodeType
+from src.ast_nodes.traversal import trampoline, walk
+from src.interpreter import (DEFAULT_VALUES, format_value, integer_div, literal_value,
+                             parse_input_value, read_words)
+from src.tokens.token_type import TokenType
+
+
+PYTHON_OPERATORS = {
+    TokenType.PLUS: '+',
+    TokenType.MIN: '-',
+    TokenType.MULT: '*',
+    TokenType.NE: '!=',
+    TokenType.EQ: '==',
+    TokenType.LT: '<',
+    TokenType.LE: '<=',
+    TokenType.GT: '>',
+    TokenType.GE: '>=',
+    TokenType.AND: 'and',
+    TokenType.OR: 'or'
+}
+
+# Пределы CPython для сгенерированного текста: уровни отступа, вложенные
+# циклы (statically nested blocks) и вложенные скобки; на скобки вызовов
+# write, float и div оставлен запас
+MAX_INDENT = 99
+MAX_LOOPS = 20
+MAX_EXPRESSION_DEPTH = 190
+
+# Имя файла сгенерированного кода: по нему ищется строка при ошибке исполнения
+GENERATED_FILENAME = '<uvm>'
+
+
+class PythonTranspiler:
+    """Генерация исходного текста функции Python по AST.
+    
+    Переменные программы становятся локальными переменными функции,
+    циклы - циклами Python, литералы подставляются уже декодированными.
+    AST обходится через trampoline, но сам текст ограничен пределами CPython
+    (MAX_INDENT, MAX_LOOPS, MAX_EXPRESSION_DEPTH): глубже них генерация
+    останавливается ошибкой SyntaxError.
+    """
+
+    def __init__(self):
+        self.lines: List[str] = []
+        # Смещение в исходном тексте программы для каждой строки сгенерированного кода
+        self.line_offsets: List[int] = []
+        # Имена локальных переменных и типы по номеру идентификатора (ASTNode.symbol)
+        self.names: Dict[int, str] = {}
+        self.types: Dict[int, TokenType] = {}
+        self._temporaries = 0
+        # Число циклов, внутри которых генерируется текущий оператор
+        self._loops = 0
+
+    def generate(self, root: ASTNode) -> str:
+        declarations = [node for node in root.children
+                        if node.type == NodeType.VARIABLE_DECLARATION]
+        variables: Dict[int, str] = {}
+        for node in declarations:
+            self.names[node.symbol] = f"v{len(self.names)}"
+            self.types[node.symbol] = node.value_type
+            variables[node.symbol] = node.value
+        
+        self._emit(0, "def program(read, write):", root)
+        for symbol, local in self.names.items():
+            self._emit(1, f"{local} = {DEFAULT_VALUES[self.types[symbol]]!r}", root)
+        
+        for node in root.children:
+            if node.type != NodeType.VARIABLE_DECLARATION:
+                trampoline(self._statement(node, 1))
+        
+        result = ', '.join(f"{variables[symbol]!r}: {local}" for symbol, local in self.names.items())
+        self._emit(1, f"return {{{result}}}", root)
+        return '\n'.join(self.lines) + '\n'
+
+    def _emit(self, level: int, line: str, node: Optional[ASTNode]):
+        self.lines.append('    ' * level + line)
+        offset = node.offset if node is not None else None
+        self.line_offsets.append(offset if offset is not None else -1)
+
+    def _local(self, node: ASTNode) -> str:
+        local = self.names.get(node.symbol)
+        if local is None:
+            raise node.error(f"Необъявленная переменная: {node.value}")
+        return local
+
+    def _store(self, node: ASTNode, expression: ASTNode) -> Generator:
+        # Объявление проверяется до вычисления: тип есть только у объявленной переменной
+        local = self._local(node)
+        value = yield self._expression(expression)
+        # Вещественная переменная хранит float и при присваивании целого
+        if self.types[node.symbol] == TokenType.FLOAT and expression.value_type != TokenType.FLOAT:
+            value = f"float({value})"
+        return f"{local} = {value}"
+
+    def _statement(self, node: Optional[ASTNode], level: int) -> Generator:
+        if level > MAX_INDENT:
+            raise self._nesting_error(node)
+        if node is None:
+            self._emit(level, "pass", None)
+        elif node.type == NodeType.ASSIGNMENT:
+            self._emit(level, (yield self._store(node, node.children[0])), node)
+        elif node.type == NodeType.CONDITIONAL:
+            self._emit(level, f"if {(yield self._expression(node.children[0]))}:", node)
+            yield self._statement(node.children[1], level + 1)
+            if len(node.children) > 2:
+                self._emit(level, "else:", node)
+                yield self._statement(node.children[2], level + 1)
+        elif node.type == NodeType.LOOP and node.value == 'for':
+            yield self._fixed_loop(node, level)
+        elif node.type == NodeType.LOOP:
+            condition, loop_body = node.children
+            self._emit(level, f"while {(yield self._expression(condition))}:", node)
+            yield self._loop_body(node, loop_body, level + 1)
+        elif node.type == NodeType.INPUT:
+            for child in node.children:
+                local = self._local(child)
+                self._emit(level, f"{local} = read({child.value!r}, {self.types[child.symbol].name!r})",
+                           child)
+        elif node.type == NodeType.OUTPUT:
+            values = []
+            for child in node.children:
+                values.append((yield self._expression(child)))
+            self._emit(level, f"write({', '.join(values)})", node)
+
+    def _loop_body(self, node: ASTNode, loop_body: Optional[ASTNode], level: int) -> Generator:
+        if self._loops == MAX_LOOPS:
+            raise self._nesting_error(node)
+        self._loops += 1
+        yield self._statement(loop_body, level)
+        self._loops -= 1
+
+    def _fixed_loop(self, node: ASTNode, level: int) -> Generator:
+        initial_assignment, end_condition, loop_body = node.children
+        symbol = initial_assignment.symbol
+        local = self._local(initial_assignment)
+        end = f"t{self._temporaries}"
+        self._temporaries += 1
+        
+        self._emit(level, (yield self._store(initial_assignment, initial_assignment.children[0])),
+                   initial_assignment)
+        self._emit(level, f"{end} = {(yield self._expression(end_condition))}", end_condition)
+        
+        # range подходит, только если переменная целая и тело ее не изменяет
+        if (self.types[symbol] == TokenType.INTEGER
+                and end_condition.value_type == TokenType.INTEGER
+                and not self._assigns(loop_body, symbol)):
+            self._emit(level, f"for {local} in range({local}, {end} + 1):", node)
+            yield self._loop_body(node, loop_body, level + 1)
+            # После цикла переменная равна границе плюс один, как в Interpreter
+            self._emit(level, f"{local} = max({local}, {end} + 1)", node)
+        else:
+            self._emit(level, f"while {local} <= {end}:", node)
+            yield self._loop_body(node, loop_body, level + 1)
+            self._emit(level + 1, f"{local} += 1", node)
+
+    @staticmethod
+    def _assigns(node: Optional[ASTNode], symbol: int) -> bool:
+        for child, _ in walk(node):
+            if child.type == NodeType.ASSIGNMENT and child.symbol == symbol:
+                return True
+            if child.type == NodeType.INPUT and any(target.symbol == symbol for target in child.children):
+                return True
+        return False
+
+    def _expression(self, node: ASTNode, depth: int = 0) -> Generator:
+        if node.type == NodeType.IDENTIFIER:
+            return self._local(node)
+        
+        if node.type == NodeType.LITERAL:
+            return repr(literal_value(node))
+        
+        if depth == MAX_EXPRESSION_DEPTH:
+            raise self._nesting_error(node)
+        
+        if node.type == NodeType.UNARY_OPERATION:
+            return f"(not {(yield self._expression(node.children[0], depth + 1))})"
+        
+        operator_type = node.value
+        left = yield self._expression(node.children[0], depth + 1)
+        right = yield self._expression(node.children[1], depth + 1)
+        
+        if operator_type == TokenType.DIV:
+            # Вещественное деление известно заранее, иначе - через integer_div
+            if node.value_type == TokenType.FLOAT:
+                return f"({left} / {right})"
+            return f"div({left}, {right})"
+        
+        # Скобки обязательны: иначе Python объединит сравнения в цепочку
+        return f"({left} {PYTHON_OPERATORS[operator_type]} {right})"
+
+    @staticmethod
+    def _nesting_error(node: Optional[ASTNode]) -> SyntaxError:
+        message = "Слишком глубокая вложенность для трансляции в Python"
+        return node.error(message) if node is not None else SyntaxError(message)
+
+
+@lru_cache(maxsize=128)
+def compile_source(source: str):
+    # Один и тот же сгенерированный текст компилируется один раз
+    return compile(source, GENERATED_FILENAME, 'exec')
+
+
+def transpile(root: ASTNode) -> 'PythonProgram':
+    transpiler = PythonTranspiler()
+    source = transpiler.generate(root)
+    namespace = {'div': integer_div, '__builtins__': {'range': range, 'float': float, 'max': max}}
+    exec(compile_source(source), namespace)
+    source_map = root.token.source_map if root.token is not None else None
+    return PythonProgram(source, namespace['program'], transpiler.line_offsets, source_map)
+
+
+class PythonProgram:
+    """Скомпилированная в Python программа с подключаемыми потоками ввода и вывода"""
+
+    def __init__(self, source: str, function: Callable, line_offsets: List[int], source_map=None):
+        self.source = source
+        self.function = function
+        self.line_offsets = line_offsets
+        self.source_map = source_map
+
+    def run(self, input_stream: Optional[TextIO] = None,
+            output_stream: Optional[TextIO] = None) -> Dict[str, object]:
+        input_stream = input_stream if input_stream is not None else sys.stdin
+        output_stream = output_stream if output_stream is not None else sys.stdout
+        words: Iterator[str] = read_words(input_stream)
+        
+        def read(name: str, type_name: str):
+            word = next(words, None)
+            if word is None:
+                raise RuntimeError(f"Недостаточно входных данных для {name}")
+            try:
+                return parse_input_value(word, TokenType[type_name])
+            except ValueError:
+                raise RuntimeError(f"Неверное входное значение для {name}: {word}") from None
+        
+        def write(*values):
+            output_stream.write(' '.join(map(format_value, values)) + '\n')
+        
+        try:
+            return self.function(read, write)
+        except ZeroDivisionError as e:
+            raise self._error("Деление на ноль", e.__traceback__) from None
+        except RuntimeError as e:
+            raise self._error(str(e), e.__traceback__) from None
+
+    def _error(self, message: str, traceback) -> RuntimeError:
+        # Строка сгенерированного кода, на которой возникла ошибка
+        line = None
+        while traceback is not None:
+            if traceback.tb_frame.f_code.co_filename == GENERATED_FILENAME:
+                line = traceback.tb_lineno
+            traceback = traceback.tb_next
+        
+        if line is None or self.source_map is None or self.line_offsets[line - 1] < 0:
+            return RuntimeError(message)
+        return self.source_map.error(message, self.line_offsets[line - 1], RuntimeError)
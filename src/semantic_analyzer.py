@@ -1,11 +1,17 @@
-from typing import List, Dict, Optional, Set
+from typing import Dict, Optional, Sequence, Set
+from src.ast_nodes.ast_node import ASTNode
+from src.diagnostics import Diagnostics
 from src.tokens.token import Token
 from src.tokens.token_type import TokenType
+from src.type_checker import TypeChecker
 
 class SemanticAnalyzer:
-    def __init__(self, tokens: List[Token]):
+    def __init__(self, tokens: Sequence[Token] = (), diagnostics: Optional[Diagnostics] = None):
         self.tokens = tokens
-        self.symbol_table: Dict[str, TokenType] = {}
+        # Без diagnostics анализ прерывается на первой ошибке
+        self.diagnostics = diagnostics
+        # Типы переменных по номеру идентификатора в SymbolTable лексера
+        self.symbol_table: Dict[int, TokenType] = {}
         self.type_compatibility: Dict[TokenType, Set[TokenType]] = {
             TokenType.INTEGER: {TokenType.INTEGER},
             TokenType.FLOAT: {TokenType.FLOAT, TokenType.INTEGER},
@@ -43,6 +49,10 @@ class SemanticAnalyzer:
         # Проверка типов и семантики выражений
         self._check_type_consistency()
     
+    def analyze_tree(self, root: ASTNode):
+        # Проверки по готовому AST с выводом типов всех выражений за один обход
+        TypeChecker(self.symbol_table, self.diagnostics).check(root)
+    
     def _register_variables(self):
         # Заполнение таблицы символов с более надежным парсингом
         current_pos = 0
@@ -56,7 +66,7 @@ class SemanticAnalyzer:
                     while (current_pos < len(self.tokens) and
                            self.tokens[current_pos].type in (TokenType.IDENTIFIER, TokenType.COMMA)):
                         if self.tokens[current_pos].type != TokenType.COMMA:
-                            identifiers.append(self.tokens[current_pos].value)
+                            identifiers.append(self.tokens[current_pos].symbol)
                         current_pos += 1
                     
                     # Пропуск двоеточия
@@ -83,21 +93,27 @@ class SemanticAnalyzer:
         }
         return type_mapping.get(token_type, TokenType.FLOAT)  # По умолчанию FLOAT
     
-    def get_variable_type(self, identifier: str) -> Optional[TokenType]:
-        return self.symbol_table.get(identifier)
+    def get_variable_type(self, symbol: int) -> Optional[TokenType]:
+        return self.symbol_table.get(symbol)
     
     def _check_type_consistency(self):
         # Проверка семантической корректности
         i = 0
         while i < len(self.tokens):
-            # Проверка присваивания
-            if self.tokens[i].type == TokenType.AS:
-                self._validate_assignment(i)
-            
-            # Проверка операций
-            elif self.tokens[i].type in {TokenType.PLUS, TokenType.MIN, 
-                                         TokenType.LT, TokenType.GT}:
-                self._validate_operation(i)
+            try:
+                # Проверка присваивания
+                if self.tokens[i].type == TokenType.AS:
+                    self._validate_assignment(i)
+                
+                # Проверка операций
+                elif self.tokens[i].type in {TokenType.PLUS, TokenType.MIN, 
+                                             TokenType.LT, TokenType.GT}:
+                    self._validate_operation(i)
+            except SyntaxError as error:
+                # Проверки независимы: после ошибки анализ продолжается со следующего токена
+                if self.diagnostics is None:
+                    raise
+                self.diagnostics.report(error)
             
             i += 1
     
@@ -108,24 +124,24 @@ class SemanticAnalyzer:
         right_token = self.tokens[as_pos + 1]
         
         # Получаем тип левой переменной
-        left_type = self.get_variable_type(left_token.value)
+        left_type = self.get_variable_type(left_token.symbol)
         
         if left_type is None:
-            raise SyntaxError(f"Необъявленная переменная: {left_token.value}")
+            raise self._error(f"Необъявленная переменная: {left_token.value}", left_token)
         
         # Определение типа правого выражения
         right_type = None
         if right_token.type == TokenType.IDENTIFIER:
-            right_type = self.get_variable_type(right_token.value)
+            right_type = self.get_variable_type(right_token.symbol)
         elif right_token.type in {TokenType.INTEGER, TokenType.FLOAT, TokenType.BOOLEAN}:
             right_type = right_token.type
         
         if right_type is None:
-            raise SyntaxError(f"Невозможно определить тип: {right_token.value}")
+            raise self._error(f"Невозможно определить тип: {right_token.value}", right_token)
         
         # Проверка совместимости типов
         if not self._are_types_compatible(left_type, right_type):
-            raise SyntaxError(f"Несовместимые типы при присваивании: {left_type} ≠ {right_type} ({left_token.value} {right_token.value})")
+            raise self._error(f"Несовместимые типы при присваивании: {left_type} ≠ {right_type} ({left_token.value} {right_token.value})", left_token)
     
     def _validate_operation(self, op_pos: int):
         # Получаем операцию
@@ -137,11 +153,11 @@ class SemanticAnalyzer:
         right_token = self.tokens[op_pos + 1]
         
         # Определение типов
-        left_type = (self.get_variable_type(left_token.value) 
+        left_type = (self.get_variable_type(left_token.symbol) 
                      if left_token.type == TokenType.IDENTIFIER 
                      else left_token.type)
         
-        right_type = (self.get_variable_type(right_token.value) 
+        right_type = (self.get_variable_type(right_token.symbol) 
                       if right_token.type == TokenType.IDENTIFIER 
                       else right_token.type)
         
@@ -150,11 +166,15 @@ class SemanticAnalyzer:
         if op_rules:
             # Проверка типов левого операнда
             if left_type not in op_rules['left_types']:
-                raise SyntaxError(f"Недопустимый тип левого операнда для {operation.type}")
+                raise self._error(f"Недопустимый тип левого операнда для {operation.type}", operation)
             
             # Проверка типов правого операнда
             if right_type not in op_rules['right_types']:
-                raise SyntaxError(f"Недопустимый тип правого операнда для {operation.type}")
+                raise self._error(f"Недопустимый тип правого операнда для {operation.type}", operation)
+    
+    def _error(self, message: str, token: Token) -> SyntaxError:
+        # Ошибка с позицией токена в исходном тексте
+        return token.error(message)
     
     def _are_types_compatible(self, type1: TokenType, type2: TokenType) -> bool:
         """Проверка совместимости типов"""
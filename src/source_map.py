@@ -0,0 +1,111 @@
+from bisect import bisect_right
+from typing import List, Optional, Tuple, Type
+
+
+def error_offset(error: Exception) -> Optional[int]:
+    """Смещение в тексте, к которому относится ошибка, если оно известно"""
+    return getattr(error, 'source_offset', None)
+
+
+class SourceMap:
+    """Перевод смещений в исходном тексте в номера строк и столбцов"""
+
+    def __init__(self, text: Optional[str] = None):
+        # Индекс начал строк для целого текста строится при первом обращении,
+        # чтобы не замедлять лексический анализ
+        self._pending = text
+        self._line_starts: List[int] = [0]
+        self._length = 0
+        # Отложенный сдвиг после правок: начала строк с номерами от первого
+        # числа отстают от настоящих на второе
+        self._shift = (1, 0)
+
+    def extend(self, chunk: str):
+        # Дописывание очередного фрагмента при потоковом чтении
+        self._settle(len(self._line_starts))
+        line_starts = self._line_starts
+        base = self._length
+        newline = chunk.find('\n')
+        while newline >= 0:
+            line_starts.append(base + newline + 1)
+            newline = chunk.find('\n', newline + 1)
+        self._length += len(chunk)
+
+    def reset(self, text: str):
+        # Текст после правки; токены ссылаются на этот же объект и видят новые позиции
+        self._pending = text
+        self._line_starts = [0]
+        self._length = 0
+        self._shift = (1, 0)
+
+    def replace(self, start: int, end: int, text: str):
+        """Правка: символы [start, end) заменены на text.
+
+        Индекс меняется только около правки, сдвиг следующих строк
+        откладывается и досчитывается при чтении или следующей правке.
+        """
+        if self._pending is not None:
+            self._pending = self._pending[:start] + text + self._pending[end:]
+            return
+        
+        delta = len(text) - (end - start)
+        line_starts = self._line_starts
+        # Удаляются начала строк после удаленных переводов строки: start < p <= end
+        first = self._line_index(start)
+        self._settle(first)
+        stop = self._line_index(end)
+        added = []
+        newline = text.find('\n')
+        while newline >= 0:
+            added.append(start + newline + 1)
+            newline = text.find('\n', newline + 1)
+        
+        shift_from, shift = self._shift
+        if not shift:
+            shift_from = first
+        elif shift_from > stop and delta:
+            line_starts[stop:shift_from] = [line_start + delta for line_start in line_starts[stop:shift_from]]
+        line_starts[first:stop] = added
+        line_delta = len(added) - (stop - first)
+        self._shift = (max(first + len(added), shift_from + line_delta), shift + delta)
+        self._length += delta
+
+    def _line_index(self, offset: int) -> int:
+        # Номер первой строки, начинающейся после offset
+        line_starts = self._line_starts
+        shift_from, shift = self._shift
+        if shift_from < len(line_starts) and offset >= line_starts[shift_from] + shift:
+            return bisect_right(line_starts, offset - shift, lo=shift_from)
+        return bisect_right(line_starts, offset, hi=shift_from)
+
+    def _settle(self, stop: int):
+        # Досчитывает отложенный сдвиг начал строк с номерами до stop
+        line_starts = self._line_starts
+        shift_from, shift = self._shift
+        stop = min(stop, len(line_starts))
+        if stop > shift_from:
+            if shift:
+                line_starts[shift_from:stop] = [line_start + shift for line_start in line_starts[shift_from:stop]]
+            self._shift = (stop, shift if stop < len(line_starts) else 0)
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        if self._pending is not None:
+            text, self._pending = self._pending, None
+            self.extend(text)
+        
+        line = self._line_index(offset)
+        line_start = self._line_starts[line - 1]
+        if line - 1 >= self._shift[0]:
+            line_start += self._shift[1]
+        return line, offset - line_start + 1
+
+    def describe(self, offset: int) -> str:
+        line, column = self.position(offset)
+        return f"строка {line}, столбец {column}"
+
+    def error(self, message: str, offset: int, error_type: Type[Exception] = SyntaxError) -> Exception:
+        # Позиция дописывается в сообщение для человека и сохраняется в source_offset
+        # для программ (языковой сервер); разбирать текст сообщения не нужно
+        error = error_type(f"{message} ({self.describe(offset)})")
+        error.source_offset = offset
+        return error
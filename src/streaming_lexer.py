@@ -0,0 +1,94 @@
+from typing import Iterable, Iterator, Optional, TextIO, Union
+
+from src.lexer import KEYWORDS, SYMBOLS, TOKEN_PATTERN, scan_number
+from src.source_map import SourceMap
+from src.symbol_table import SymbolTable
+from src.tokens.token import Token
+from src.tokens.token_type import TokenType
+
+
+class StreamingLexer:
+    """Лексер, читающий исходный текст по частям и выдающий токены по одному"""
+
+    def __init__(self, source: Union[TextIO, Iterable[str]], chunk_size: int = 1 << 16,
+                 symbols: Optional[SymbolTable] = None):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.source_map = SourceMap()
+        self.symbols = symbols if symbols is not None else SymbolTable()
+
+    def __iter__(self) -> Iterator[Token]:
+        pending = ''
+        in_comment = False
+        # Смещение начала text относительно начала всего потока
+        base = 0
+        
+        for chunk in self._chunks():
+            self.source_map.extend(chunk)
+            
+            # Пропуск комментария, начатого в одном из предыдущих фрагментов
+            if in_comment:
+                comment_end = chunk.find('}')
+                if comment_end < 0:
+                    base += len(chunk)
+                    continue
+                base += comment_end + 1
+                chunk = chunk[comment_end + 1:]
+                in_comment = False
+            
+            text = pending + chunk
+            pending = ''
+            
+            for match in TOKEN_PATTERN.finditer(text):
+                kind = match.lastgroup
+                end = match.end()
+                # Число с порядком, разрезанное после знака: '1.5E+' и '3' в следующем фрагменте
+                if kind == 'NUMBER' and end == len(text) - 1 and text[-2:] in ('E+', 'E-', 'e+', 'e-'):
+                    end = len(text)
+                
+                # Лексема, упирающаяся в конец фрагмента, может продолжиться в следующем
+                if end == len(text):
+                    if kind == 'COMMENT' and not match.group().endswith('}'):
+                        in_comment = True
+                        break
+                    if kind in ('IDENTIFIER', 'NUMBER'):
+                        pending = text[match.start():]
+                        break
+                
+                token = self._make_token(kind, match.group(), base + match.start())
+                if token is not None:
+                    yield token
+            
+            base += len(text) - len(pending)
+        
+        # Конец потока: отложенная лексема завершена
+        for match in TOKEN_PATTERN.finditer(pending):
+            token = self._make_token(match.lastgroup, match.group(), base + match.start())
+            if token is not None:
+                yield token
+
+    def _chunks(self) -> Iterator[str]:
+        if isinstance(self.source, str):
+            yield self.source
+        elif hasattr(self.source, 'read'):
+            yield from iter(lambda: self.source.read(self.chunk_size), '')
+        else:
+            yield from self.source
+
+    def _make_token(self, kind: str, value: str, offset: int):
+        if kind == 'SPACE' or kind == 'COMMENT':
+            return None
+        source_map = self.source_map
+        if kind == 'IDENTIFIER':
+            token_type = KEYWORDS.get(value)
+            if token_type is not None:
+                return Token(token_type, value, offset, source_map)
+            symbol = self.symbols.intern(value)
+            return Token(TokenType.IDENTIFIER, self.symbols.names[symbol], offset, source_map,
+                         None, symbol)
+        if kind == 'SYMBOL':
+            return Token(SYMBOLS[value], value, offset, source_map)
+        if kind == 'NUMBER':
+            token_type, literal = scan_number(value, source_map, offset)
+            return Token(token_type, value, offset, source_map, literal)
+        raise source_map.error(f"Неожиданный символ: {value}", offset)
@@ -0,0 +1,35 @@
+from typing import Dict, Iterator, List
+
+
+class SymbolTable:
+    """Общая таблица идентификаторов.
+    
+    Каждое имя хранится одной строкой и получает плотный целый номер
+    в порядке первого появления; дальше компилятор работает с номерами.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def intern(self, name: str) -> int:
+        symbol = self.ids.get(name)
+        if symbol is None:
+            symbol = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return symbol
+
+    def name(self, symbol: int) -> str:
+        return self.names[symbol]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __repr__(self):
+        return f"SymbolTable({len(self)} symbols)"
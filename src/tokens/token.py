@@ -1,9 +1,46 @@
+from typing import Optional, Union
+
 from src.tokens.token_type import TokenType
 
 class Token:
-    def __init__(self, type: TokenType, value: str):
+    # Без __dict__ токен занимает заметно меньше памяти на больших программах
+    __slots__ = ('type', 'value', 'offset', 'source_map', 'literal', 'symbol')
+
+    def __init__(self, type: TokenType, value: str, offset: int = -1, source_map=None,
+                 literal: Union[int, float, None] = None, symbol: Optional[int] = None):
         self.type = type
         self.value = value
+        # Значение числового литерала, вычисленное лексером
+        self.literal = literal
+        # Номер идентификатора в SymbolTable
+        self.symbol = symbol
+        # Позиция хранится смещением, строка и столбец вычисляются по запросу
+        self.offset = offset
+        self.source_map = source_map
+
+    @property
+    def line(self) -> Optional[int]:
+        if self.source_map is None:
+            return None
+        return self.source_map.position(self.offset)[0]
+
+    @property
+    def column(self) -> Optional[int]:
+        if self.source_map is None:
+            return None
+        return self.source_map.position(self.offset)[1]
+
+    @property
+    def location(self) -> str:
+        if self.source_map is None:
+            return ''
+        return self.source_map.describe(self.offset)
+    
+    def error(self, message: str, error_type: type = SyntaxError) -> Exception:
+        """Ошибка с позицией токена в тексте сообщения и в source_offset"""
+        if self.source_map is None:
+            return error_type(message)
+        return self.source_map.error(message, self.offset, error_type)
     
     def __repr__(self):
         return f"Token({self.type}, {self.value})"
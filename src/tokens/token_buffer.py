@@ -0,0 +1,66 @@
+from array import array
+from typing import Dict, Iterator, Union
+
+from src.tokens.token import Token
+from src.tokens.token_type import TokenType
+
+
+# Коды типов токенов для хранения в array('B')
+TOKEN_TYPES = list(TokenType)
+TOKEN_TYPE_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}
+
+
+class TokenBuffer:
+    """Компактный поток токенов: коды типов и смещения лексем в исходном тексте"""
+
+    def __init__(self, source: str, source_map=None, symbols=None):
+        self.source = source
+        self.source_map = source_map
+        # Таблица идентификаторов лексера: номера имен не хранятся в буфере
+        self.symbols = symbols
+        self.types = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        # Значения числовых литералов по номеру токена; чисел в программе немного
+        self.literals: Dict[int, Union[int, float]] = {}
+
+    def append(self, token_type: TokenType, start: int, end: int,
+               literal: Union[int, float, None] = None):
+        if literal is not None:
+            self.literals[len(self.types)] = literal
+        self.types.append(TOKEN_TYPE_CODES[token_type])
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def type_at(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.types[index]]
+
+    def value_at(self, index: int) -> str:
+        return self.source[self.starts[index]:self.ends[index]]
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> Token:
+        # Token создается по требованию, лексема вырезается из исходного текста
+        code = self.types[index]
+        if index < 0:
+            index += len(self)
+        return self._token(index, code, self.starts[index], self.ends[index])
+
+    def __iter__(self) -> Iterator[Token]:
+        token = self._token
+        for index, (code, start, end) in enumerate(zip(self.types, self.starts, self.ends)):
+            yield token(index, code, start, end)
+
+    def _token(self, index: int, code: int, start: int, end: int) -> Token:
+        token_type = TOKEN_TYPES[code]
+        value = self.source[start:end]
+        symbol = None
+        if token_type == TokenType.IDENTIFIER and self.symbols is not None:
+            symbol = self.symbols.ids[value]
+            value = self.symbols.names[symbol]
+        return Token(token_type, value, start, self.source_map, self.literals.get(index), symbol)
+
+    def __repr__(self):
+        return f"TokenBuffer({len(self)} tokens)"
@@ -0,0 +1,27 @@
+from collections import deque
+from typing import Deque, Iterable, Optional
+
+from src.tokens.token import Token
+
+
+class TokenStream:
+    """Буфер предпросмотра поверх любого итерируемого потока токенов"""
+
+    def __init__(self, tokens: Iterable[Token]):
+        self._tokens = iter(tokens)
+        self._buffer: Deque[Token] = deque()
+
+    def peek(self, offset: int = 0) -> Optional[Token]:
+        # Дочитываем ровно столько токенов, сколько нужно для предпросмотра
+        buffer = self._buffer
+        while len(buffer) <= offset:
+            token = next(self._tokens, None)
+            if token is None:
+                return None
+            buffer.append(token)
+        return buffer[offset]
+
+    def advance(self) -> Token:
+        if not self._buffer and self.peek() is None:
+            raise SyntaxError("Неожиданный конец программы")
+        return self._buffer.popleft()
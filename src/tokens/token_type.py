@@ -58,3 +58,7 @@ class TokenType(Enum):
     WRITE = 'write'
     COMMENT_START = '{'
     COMMENT_END = '}'
+
+    # Члены перечисления единственны, поэтому хэш по адресу согласован с равенством;
+    # Enum.__hash__ написан на Python и замедляет поиск по словарям с ключами TokenType
+    __hash__ = object.__hash__
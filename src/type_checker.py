@@ -0,0 +1,181 @@
+from typing import Dict, Generator, Optional
+
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.ast_node_type import NodeType
+from src.ast_nodes.traversal import trampoline
+from src.diagnostics import Diagnostics
+from src.tokens.token import Token
+from src.tokens.token_type import TokenType
+
+
+NUMERIC_TYPES = {TokenType.INTEGER, TokenType.FLOAT}
+
+# Тип переменной по слову типа в объявлении
+DECLARED_TYPES = {
+    TokenType.INTEGER_TYPE: TokenType.INTEGER,
+    TokenType.FLOAT_TYPE: TokenType.FLOAT,
+    TokenType.BOOLEAN_TYPE: TokenType.BOOLEAN
+}
+
+ARITHMETIC_OPERATORS = {TokenType.PLUS, TokenType.MIN, TokenType.MULT, TokenType.DIV}
+LOGICAL_OPERATORS = {TokenType.OR, TokenType.AND}
+ORDER_OPERATORS = {TokenType.LT, TokenType.LE, TokenType.GT, TokenType.GE}
+EQUALITY_OPERATORS = {TokenType.NE, TokenType.EQ}
+
+# Допустимые типы при присваивании: тип переменной -> типы значения
+TYPE_COMPATIBILITY = {
+    TokenType.INTEGER: {TokenType.INTEGER},
+    TokenType.FLOAT: {TokenType.FLOAT, TokenType.INTEGER},
+    TokenType.BOOLEAN: {TokenType.BOOLEAN}
+}
+
+
+class TypeChecker:
+    """Вывод и проверка типов за один обход AST.
+    
+    Тип каждого выражения вычисляется снизу вверх и сохраняется
+    в поле value_type его узла, поэтому повторно не выводится.
+    """
+
+    def __init__(self, symbol_table: Optional[Dict[int, TokenType]] = None,
+                 diagnostics: Optional[Diagnostics] = None):
+        # Типы переменных по номеру идентификатора (ASTNode.symbol)
+        self.symbol_table: Dict[int, TokenType] = {} if symbol_table is None else symbol_table
+        # Без diagnostics проверка прерывается на первой ошибке
+        self.diagnostics = diagnostics
+
+    def check(self, root: ASTNode):
+        for node in root.children:
+            if node.type == NodeType.VARIABLE_DECLARATION:
+                self.declare(node)
+                continue
+            try:
+                self.check_statement(node)
+            except SyntaxError as error:
+                # Операторы верхнего уровня проверяются независимо друг от друга
+                if self.diagnostics is None:
+                    raise
+                self.diagnostics.report(error)
+
+    def declare(self, node: ASTNode):
+        self.symbol_table[node.symbol] = node.value_type
+
+    def check_statement(self, node: Optional[ASTNode]):
+        trampoline(self._statement(node))
+
+    def _statement(self, node: Optional[ASTNode]) -> Generator:
+        # Вложенные операторы проверяются через trampoline, без рекурсии
+        if node is None:
+            return
+        
+        if node.type == NodeType.ASSIGNMENT:
+            self._check_assignment(node)
+        elif node.type == NodeType.CONDITIONAL:
+            self._check_condition(node.children[0])
+            for branch in node.children[1:]:
+                yield self._statement(branch)
+        elif node.type == NodeType.LOOP and node.value == 'for':
+            initial_assignment, end_condition, loop_body = node.children
+            self._check_assignment(initial_assignment)
+            variable_type = self.symbol_table[initial_assignment.symbol]
+            if variable_type not in NUMERIC_TYPES:
+                raise self._error(f"Переменная цикла должна быть числом, получено: {variable_type} "
+                                  f"({initial_assignment.value})", initial_assignment.token)
+            end_type = self.infer(end_condition)
+            if end_type not in NUMERIC_TYPES:
+                raise self._error(f"Граница цикла должна быть числом, получено: {end_type}",
+                                  end_condition.token)
+            yield self._statement(loop_body)
+        elif node.type == NodeType.LOOP:
+            condition, loop_body = node.children
+            self._check_condition(condition)
+            yield self._statement(loop_body)
+        elif node.type in (NodeType.INPUT, NodeType.OUTPUT):
+            for child in node.children:
+                self.infer(child)
+
+    def _check_assignment(self, node: ASTNode):
+        left_type = self.symbol_table.get(node.symbol)
+        if left_type is None:
+            raise self._error(f"Необъявленная переменная: {node.value}", node.token)
+        
+        right_type = self.infer(node.children[0])
+        if right_type not in TYPE_COMPATIBILITY[left_type]:
+            raise self._error(f"Несовместимые типы при присваивании: {left_type} ≠ {right_type} ({node.value})",
+                              node.token)
+
+    def _check_condition(self, node: ASTNode):
+        condition_type = self.infer(node)
+        if condition_type != TokenType.BOOLEAN:
+            raise self._error(f"Условие должно иметь логический тип, получено: {condition_type}",
+                              node.token)
+
+    def infer(self, node: ASTNode) -> TokenType:
+        # Тип литерала известен с построения дерева
+        if node.value_type is not None:
+            return node.value_type
+        
+        # Операнды выводятся раньше операции, слева направо; стек явный,
+        # чтобы глубоко вложенные выражения не упирались в предел рекурсии
+        stack = [(node, False)]
+        while stack:
+            current, ready = stack.pop()
+            if current.value_type is not None:
+                continue
+            if ready or not current.children:
+                current.value_type = self._infer_node(current)
+            else:
+                stack.append((current, True))
+                stack.extend((child, False) for child in reversed(current.children))
+        return node.value_type
+
+    def _infer_node(self, node: ASTNode) -> TokenType:
+        if node.type == NodeType.IDENTIFIER:
+            value_type = self.symbol_table.get(node.symbol)
+            if value_type is None:
+                raise self._error(f"Необъявленная переменная: {node.value}", node.token)
+        elif node.type == NodeType.UNARY_OPERATION:
+            value_type = self._infer_unary(node)
+        else:
+            value_type = self._infer_binary(node)
+        return value_type
+
+    def _infer_unary(self, node: ASTNode) -> TokenType:
+        operator = node.value
+        operand_type = self.infer(node.children[0])
+        
+        # Унарная операция ~ - логическое отрицание
+        if operand_type != TokenType.BOOLEAN:
+            raise self._error(f"Недопустимый тип операнда для {operator}", node.token)
+        return TokenType.BOOLEAN
+
+    def _infer_binary(self, node: ASTNode) -> TokenType:
+        operator = node.value
+        left_type = self.infer(node.children[0])
+        right_type = self.infer(node.children[1])
+        
+        if operator in LOGICAL_OPERATORS:
+            allowed = {TokenType.BOOLEAN}
+        elif operator in EQUALITY_OPERATORS and left_type == TokenType.BOOLEAN:
+            allowed = {TokenType.BOOLEAN}
+        else:
+            allowed = NUMERIC_TYPES
+        
+        if left_type not in allowed:
+            raise self._error(f"Недопустимый тип левого операнда для {operator}", node.token)
+        if right_type not in allowed:
+            raise self._error(f"Недопустимый тип правого операнда для {operator}", node.token)
+        
+        if operator in ARITHMETIC_OPERATORS:
+            # Целочисленный результат, только если оба операнда целые
+            if left_type == TokenType.INTEGER and right_type == TokenType.INTEGER:
+                return TokenType.INTEGER
+            return TokenType.FLOAT
+        return TokenType.BOOLEAN
+
+    @staticmethod
+    def _error(message: str, token: Optional[Token]) -> SyntaxError:
+        # Ошибка с позицией токена в исходном тексте
+        if token is None:
+            return SyntaxError(message)
+        return token.error(message)
@@ -0,0 +1,96 @@
+"""Компактные узлы AST: __slots__, общие пустые кортежи и операции-перечисления."""
+import io
+
+import pytest
+
+from src.ast_nodes.ast_node import ASTNode
+from src.ast_nodes.ast_node_type import NodeType
+from src.ast_nodes.printer import print_ast
+from src.ast_nodes.traversal import count_nodes
+from src.compiler import Compiler
+from src.tokens.token_type import TokenType
+
+
+CODE = ("program var x, z : %; f : !; y : $; begin x as (1 plus 2) mult x; f as 2.5; "
+        "y as ~(x LT 2) or true; z as x div 2; write(x) end.")
+
+
+def walk(node):
+    yield node
+    for child in node.children:
+        yield from walk(child)
+
+
+def build(code=CODE, **options):
+    return Compiler.build(code, **options)[1]
+
+
+def test_slots():
+    node = ASTNode(NodeType.IDENTIFIER, 'x')
+    assert not hasattr(node, '__dict__')
+    with pytest.raises(AttributeError):
+        node.extra = 1
+
+
+def test_leaves_share_empty_tuple():
+    root = build()
+    leaves = [node for node in walk(root) if not node.children]
+    assert leaves
+    assert all(node.children == () for node in leaves)
+    assert len({id(node.children) for node in leaves}) == 1
+    assert all(isinstance(node.children, list) for node in walk(root) if node.children)
+
+
+def test_operators_are_token_types():
+    root = build()
+    operators = [node for node in walk(root)
+                 if node.type in (NodeType.BINARY_OPERATION, NodeType.UNARY_OPERATION)]
+    assert [node.value for node in operators] == [
+        TokenType.MULT, TokenType.PLUS, TokenType.OR, TokenType.UNARY_NEGATION, TokenType.LT, TokenType.DIV]
+    # В трехпроходной компиляции дерево то же
+    simple = "program var x : %; y : $; begin x as x plus 2 mult x; if x LT 2 then y as true end."
+    assert build(simple, legacy_pipeline=True) == build(simple)
+
+
+def test_literals_and_declarations():
+    root = build()
+    declarations = [node for node in root.children if node.type == NodeType.VARIABLE_DECLARATION]
+    assert [(node.value, node.value_type) for node in declarations] == [
+        ('x', TokenType.INTEGER), ('z', TokenType.INTEGER), ('f', TokenType.FLOAT), ('y', TokenType.BOOLEAN)]
+    literals = [node for node in walk(root) if node.type == NodeType.LITERAL]
+    assert [(node.value, node.literal, node.value_type) for node in literals] == [
+        ('1', 1, TokenType.INTEGER), ('2', 2, TokenType.INTEGER), ('2.5', 2.5, TokenType.FLOAT),
+        ('2', 2, TokenType.INTEGER), ('true', True, TokenType.BOOLEAN), ('2', 2, TokenType.INTEGER)]
+    # Тип литерала и переменной хранится в поле, а не в дочернем узле
+    assert all(node.children == () for node in literals + declarations)
+
+
+def test_folded_literals_keep_types():
+    root = build(optimize=True)
+    assignment = next(node for node in root.children if node.type == NodeType.ASSIGNMENT)
+    product = assignment.children[0]
+    assert product.value == TokenType.MULT
+    folded = product.children[0]
+    assert (folded.type, folded.literal, folded.value_type) == (NodeType.LITERAL, 3, TokenType.INTEGER)
+
+
+def test_printer_keeps_type_lines():
+    # Вывод -v прежний: тип литерала и объявления печатается дочерней строкой
+    stream = io.StringIO()
+    print_ast(build("program var x : %; begin x as 1 end."), stream)
+    assert stream.getvalue().splitlines() == [
+        "PROGRAM: ",
+        "  VARIABLE_DECLARATION: x",
+        "    IDENTIFIER: TokenType.INTEGER_TYPE",
+        "  ASSIGNMENT: x",
+        "    LITERAL: 1",
+        "      IDENTIFIER: integer",
+    ]
+
+
+def test_equality_ignores_positions():
+    first = build()
+    second = build("program var x, z : %; f : !; y : $;\nbegin\n  x as (1 plus 2) mult x;\n  f as 2.5;\n"
+                   "  y as ~(x LT 2) or true;\n  z as x div 2;\n  write(x)\nend.")
+    assert first == second
+    assert count_nodes(first) == count_nodes(second) == sum(1 for _ in walk(first))
@@ -0,0 +1,135 @@
+"""Двоичный и JSON форматы AST."""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.ast_nodes.serialization import MAGIC, dump_ast, dump_ast_json, iter_ast_json, load_ast
+from src.ast_nodes.traversal import walk
+from src.compiler import Compiler
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CODE = """program var a, i : %; f : !; p : $;
+begin
+  { комментарий: строки с не-ASCII символами }
+  read(a);
+  f as 2.5e3 mult a min 0.125;
+  p as ~(a LT 0) and true or false;
+  for i as 1 to 10 do a as a plus i min 300000000000;
+  while a GT 0 do a as a div 2;
+  if p then write(a, f) else write(i)
+end."""
+
+DEEP = "program var a : %; begin a as " + "(a plus " * 20000 + "1" + ")" * 20000 + " end."
+
+
+def fields(root):
+    return [(node.type, node.value, node.value_type, node.literal, type(node.literal), node.symbol, depth)
+            for node, depth in walk(root)]
+
+
+def expected_json_fields(root):
+    return [(node.type.name, node.value.name if hasattr(node.value, 'name') else node.value, node.literal, depth)
+            for node, depth in walk(root)]
+
+
+def json_fields(item):
+    # Узлы JSON в прямом порядке; стек явный, как в walk
+    result = []
+    stack = [(item, 0)]
+    while stack:
+        item, depth = stack.pop()
+        result.append((item['type'], item.get('value'), item.get('literal'), depth))
+        stack.extend((child, depth + 1) for child in reversed(item['children']))
+    return result
+
+
+@pytest.mark.parametrize('optimize', [False, True])
+def test_binary_round_trip(optimize):
+    tokens, root = Compiler.build(CODE, optimize=optimize)
+    data = dump_ast(root, tokens)
+    assert data.startswith(MAGIC)
+    loaded = load_ast(data, tokens)
+    assert fields(loaded) == fields(root)
+    # Узлы ссылаются на те же токены
+    assert all(a.token is b.token for (a, _), (b, _) in zip(walk(loaded), walk(root)))
+
+
+def test_without_tokens():
+    tokens, root = Compiler.build(CODE)
+    data = dump_ast(root)
+    loaded = load_ast(data)
+    assert fields(loaded) == fields(root)
+    assert all(node.token is None for node, _ in walk(loaded))
+    # Без токенов запись короче, а загрузка по записи с токенами их пропускает
+    assert len(data) < len(dump_ast(root, tokens))
+    assert fields(load_ast(dump_ast(root, tokens))) == fields(root)
+
+
+def test_deep_tree():
+    tokens, root = Compiler.build(DEEP)
+    loaded = load_ast(memoryview(dump_ast(root, tokens)), tokens)
+    assert fields(loaded) == fields(root)
+    assert max(depth for _, depth in walk(loaded)) > 20000
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'UAST',
+    b'XAST\x01\x00\x00',
+    b'UAST\x09\x00\x00',
+])
+def test_unknown_format(data):
+    with pytest.raises(ValueError, match="Неизвестный формат AST"):
+        load_ast(data)
+
+
+def test_damaged_data():
+    tokens, root = Compiler.build(CODE)
+    data = dump_ast(root, tokens)
+    with pytest.raises(ValueError, match="Поврежденная запись AST"):
+        load_ast(data[:-3], tokens)
+    with pytest.raises(ValueError, match="Поврежденная запись AST"):
+        load_ast(data + b'\x00', tokens)
+    with pytest.raises(ValueError, match="Поврежденная запись AST"):
+        # Номер токена за пределами потока
+        load_ast(data, tokens[:3])
+
+
+@pytest.mark.parametrize('indent', [None, 2])
+def test_json(indent):
+    tokens, root = Compiler.build(CODE)
+    text = dump_ast_json(root, indent)
+    assert text == ''.join(iter_ast_json(root, indent))
+    tree = json.loads(text)
+    assert tree['type'] == 'PROGRAM'
+    assert json_fields(tree) == expected_json_fields(root)
+    assert ('\n' in text) == (indent is not None)
+    assignment = tree['children'][5]
+    assert (assignment['type'], assignment['value'], assignment['line'], assignment['column']) == (
+        'ASSIGNMENT', 'f', 5, 3)
+    assert assignment['offset'] == CODE.index('f as')
+    assert assignment['children'][0]['value'] == 'MIN'
+
+
+def test_json_deep_tree():
+    # json.loads рекурсивен, поэтому глубокий вывод проверяется по скобкам
+    text = dump_ast_json(Compiler.build(DEEP)[1])
+    assert text.count('[') == text.count(']') > 40000
+    assert text.startswith('{"type": "PROGRAM"') and text.endswith(']}' * 4)
+
+
+def test_command_line(tmp_path):
+    binary = tmp_path / 'tree.ast'
+    text = tmp_path / 'tree.json'
+    for path in (binary, text):
+        result = subprocess.run([sys.executable, 'main.py', '--dump-ast', str(path)], cwd=ROOT,
+                                capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0
+    loaded = load_ast(binary.read_bytes())
+    tree = json.loads(text.read_text(encoding='utf-8'))
+    assert json_fields(tree) == expected_json_fields(loaded)
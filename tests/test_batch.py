@@ -0,0 +1,64 @@
+"""Пакетная компиляция файлов в пуле процессов."""
+import json
+import os
+import subprocess
+import sys
+
+from src.batch import compile_batch, expand_sources
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROGRAMS = {
+    'ok.uvm': "program var x : %; begin x as 1; write(x) end.",
+    'syntax.uvm': "program var x : %; begin x as ; end.",
+    'several.uvm': "program var x : %; begin x as true; y as 1 end.",
+    'nested/deep.uvm': "program var y : !; begin y as 1.5 end.",
+    'nested/notes.txt': "не программа",
+}
+
+
+def write_programs(directory):
+    for name, code in PROGRAMS.items():
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(code, encoding='utf-8')
+
+
+def test_expand_sources(tmp_path):
+    write_programs(tmp_path)
+    assert expand_sources([str(tmp_path)], '*.uvm') == sorted(
+        str(tmp_path / name) for name in PROGRAMS if name.endswith('.uvm'))
+    assert expand_sources([str(tmp_path / '*.uvm')]) == sorted(
+        str(tmp_path / name) for name in ('ok.uvm', 'syntax.uvm', 'several.uvm'))
+    # Несуществующий файл остается в списке, ошибка будет в его результате
+    assert expand_sources([str(tmp_path / 'missing.uvm')]) == [str(tmp_path / 'missing.uvm')]
+
+
+def test_compile_batch(tmp_path):
+    write_programs(tmp_path)
+    paths = expand_sources([str(tmp_path)], '*.uvm') + [str(tmp_path / 'missing.uvm')]
+    results = list(compile_batch(paths, workers=2, cache_dir=str(tmp_path / 'cache'), stats=True))
+    # Результаты в порядке файлов
+    assert [result['file'] for result in results] == paths
+    by_name = {os.path.relpath(result['file'], tmp_path): result for result in results}
+    assert by_name['ok.uvm']['status'] == 'ok'
+    assert by_name['ok.uvm']['tokens'] == 16
+    assert 'parser' in [phase['name'] for phase in by_name['ok.uvm']['stats']['phases']]
+    assert by_name['nested/deep.uvm']['status'] == 'ok'
+    assert by_name['syntax.uvm']['status'] == 'error'
+    assert by_name['syntax.uvm']['error'] == "Неожиданный множитель в выражении (строка 1, столбец 31)"
+    assert len(by_name['several.uvm']['errors']) == 2
+    assert by_name['missing.uvm']['error'].startswith("Ошибка чтения файла")
+    assert any(name.endswith('.ast') for name in os.listdir(tmp_path / 'cache'))
+
+
+def test_command_line(tmp_path):
+    write_programs(tmp_path)
+    completed = subprocess.run([sys.executable, 'main.py', str(tmp_path), '--pattern', '*.uvm', '-j', '2'],
+                               cwd=ROOT, capture_output=True, text=True, encoding='utf-8')
+    results = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert len(results) == 4
+    assert sum(result['status'] == 'ok' for result in results) == 2
+    # Ненулевой код выхода, если хотя бы один файл не скомпилирован
+    assert completed.returncode == 1
@@ -0,0 +1,83 @@
+"""Генератор синтетических программ и набор замеров."""
+import json
+
+import pytest
+
+from benchmarks.generator import SHAPES, generate_program
+from benchmarks.suite import best_time, compare, main, run_suite
+from src.compiler import Compiler
+from src.lexer import Lexer
+
+
+def result(shape, size, **seconds):
+    return {'results': {shape: {'size': size, 'seconds': seconds}}}
+
+
+@pytest.mark.parametrize('shape', list(SHAPES))
+def test_shapes_compile(shape):
+    # Программы рассчитаны только на компиляцию: в них есть read и бесконечные циклы
+    code = generate_program(shape, 50)
+    tokens, _ = Compiler.build(code)
+    assert len(tokens) > 50
+    Compiler.build(code, legacy_pipeline=True)
+    Compiler.build(code, optimize=True)
+
+
+@pytest.mark.parametrize('shape', list(SHAPES))
+def test_deterministic(shape):
+    assert generate_program(shape, 30, seed=5) == generate_program(shape, 30, seed=5)
+
+
+def test_size_and_depth():
+    assert generate_program('statements', 10, seed=1) != generate_program('statements', 10, seed=2)
+    small = len(Lexer(generate_program('statements', 10)).tokenize())
+    large = len(Lexer(generate_program('statements', 100)).tokenize())
+    assert large > 5 * small
+    shallow = generate_program('expressions', 5, depth=2)
+    deep = generate_program('expressions', 5, depth=20)
+    assert deep.count('(') > shallow.count('(')
+    with pytest.raises(KeyError):
+        generate_program('unknown', 10)
+
+
+def test_best_time():
+    calls = []
+    seconds = best_time(lambda: calls.append(1), 4)
+    assert len(calls) == 4
+    assert 0 <= seconds < 1
+
+
+def test_compare(capsys):
+    baseline = result('statements', 100, lexer=1.0, parser=1.0, semantic=1.0)
+    current = result('statements', 100, lexer=1.5, parser=1.05, semantic=0.5)
+    assert compare(current, baseline, 0.10) == ['statements/lexer: 1.50x']
+    output = capsys.readouterr().out
+    assert 'регрессия' in output and 'ускорение' in output
+    # Разные размеры программ не сравниваются
+    assert compare(result('statements', 200, lexer=9.0), baseline, 0.10) == []
+
+
+def test_run_suite(tmp_path, capsys):
+    current = run_suite(['statements', 'nested'], 0.005, 1, 0)
+    assert set(current['results']) == {'statements', 'nested'}
+    statements = current['results']['statements']
+    assert statements['size'] == 50
+    assert set(statements['seconds']) == {'lexer', 'parser', 'semantic', 'ast_builder', 'compile'}
+    assert current['meta']['seed'] == 0
+
+    output = tmp_path / 'baseline.json'
+    assert main(['--shapes', 'statements', '--scale', '0.005', '--repeat', '1',
+                 '--output', str(output)]) == 0
+    baseline = json.loads(output.read_text(encoding='utf-8'))
+    assert baseline['results']['statements']['size'] == 50
+    # Завышенный допуск исключает шум замеров
+    assert main(['--shapes', 'statements', '--scale', '0.005', '--repeat', '1',
+                 '--baseline', str(output), '--tolerance', '100']) == 0
+    assert "Регрессий нет" in capsys.readouterr().out
+
+    for seconds in baseline['results']['statements']['seconds'].values():
+        assert seconds > 0
+    baseline['results']['statements']['seconds'] = {'lexer': 1e-9}
+    output.write_text(json.dumps(baseline), encoding='utf-8')
+    assert main(['--shapes', 'statements', '--scale', '0.005', '--repeat', '1',
+                 '--baseline', str(output)]) == 1
@@ -0,0 +1,97 @@
+"""Дисковый кэш компиляции: попадания, промахи, вытеснение и смена версии."""
+import os
+
+from benchmarks.generator import generate_program
+from src.ast_nodes.traversal import walk
+from src.compile_cache import CompileCache
+from src.compiler import Compiler
+
+
+CODE = """program var a, b : %; f : !; begin
+    read(a); b as a plus 17O mult 2; f as b div 3 plus 1.5E1; write(a, b, f)
+end."""
+
+
+def node_fields(root):
+    return [(node.type, node.value, node.offset, node.value_type, node.literal, node.symbol, depth)
+            for node, depth in walk(root)]
+
+
+def token_fields(tokens):
+    return [(token.type, token.value, token.offset, token.literal, token.symbol) for token in tokens]
+
+
+def test_miss_then_hit(tmp_path):
+    cache = CompileCache(str(tmp_path), '1')
+    tokens, root = Compiler.build(CODE, cache=cache)
+    assert cache.stats() == {'hits': 0, 'misses': 1, 'evictions': 0}
+    cached_tokens, cached_root = Compiler.build(CODE, cache=cache)
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0}
+    assert token_fields(cached_tokens) == token_fields(tokens)
+    assert node_fields(cached_root) == node_fields(root)
+    # Позиции ошибок по загруженным токенам считаются по тексту программы
+    assert str(cached_root.children[-1].error("ошибка")) == str(root.children[-1].error("ошибка"))
+
+
+def test_optimized_build_uses_unoptimized_entry(tmp_path):
+    cache = CompileCache(str(tmp_path), '1')
+    Compiler.build(CODE, cache=cache)
+    root = Compiler.build(CODE, cache=cache, optimize=True)[1]
+    assert cache.hits == 1
+    assert node_fields(root) == node_fields(Compiler.build(CODE, optimize=True)[1])
+
+
+def test_version_invalidates_entries(tmp_path):
+    Compiler.build(CODE, cache=CompileCache(str(tmp_path), '1'))
+    cache = CompileCache(str(tmp_path), '2')
+    assert cache.key(CODE) != CompileCache(str(tmp_path), '1').key(CODE)
+    assert cache.get(CODE) is None
+    assert cache.misses == 1
+
+
+def test_corrupted_entry_is_a_miss(tmp_path):
+    cache = CompileCache(str(tmp_path), '1')
+    Compiler.build(CODE, cache=cache)
+    path = cache._path(cache.key(CODE))
+    with open(path, 'wb') as file:
+        file.write(b'not a cache entry')
+    assert cache.get(CODE) is None
+    assert not os.path.exists(path)
+
+
+def test_eviction_keeps_size_limit(tmp_path):
+    programs = [generate_program('statements', 50, seed=seed) for seed in range(6)]
+    sizes = []
+    for code in programs[:2]:
+        probe = CompileCache(str(tmp_path / 'probe'), '1')
+        Compiler.build(code, cache=probe)
+        sizes.append(os.path.getsize(probe._path(probe.key(code))))
+    limit = sum(sizes) + sizes[0] // 2
+
+    cache = CompileCache(str(tmp_path / 'cache'), '1', max_bytes=limit)
+    for index, code in enumerate(programs):
+        Compiler.build(code, cache=cache)
+        # Давно не использованные записи - с меньшим mtime
+        os.utime(cache._path(cache.key(code)), (index, index))
+    total = sum(entry.stat().st_size for entry in os.scandir(cache.directory))
+    assert cache.evictions > 0
+    assert total <= limit
+    # Последняя запись остается, первая вытеснена
+    assert cache.get(programs[-1]) is not None
+    assert cache.get(programs[0]) is None
+
+
+def test_overwriting_entry_does_not_grow_total(tmp_path):
+    # Параллельные процессы могут записать один и тот же исходный текст
+    cache = CompileCache(str(tmp_path), '1')
+    tokens, root = Compiler.build(CODE)
+    for _ in range(5):
+        cache.put(CODE, tokens, root)
+    size = os.path.getsize(cache._path(cache.key(CODE)))
+    assert cache._total == size
+
+    small = CompileCache(str(tmp_path), '1', max_bytes=size)
+    for _ in range(5):
+        small.put(CODE, tokens, root)
+    assert small.evictions == 0
+    assert small.get(CODE) is not None
@@ -0,0 +1,135 @@
+"""Замеры фаз компиляции, профилирование и точки подключения метрик."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.ast_nodes.traversal import count_nodes
+from src.compile_cache import CompileCache
+from src.compile_stats import CompileHooks, CompileStats
+from src.compiler import Compiler
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CODE = ("program var x, y : %; begin x as 2 mult 3; y as x; y as x plus 1; "
+        "while x GT 0 do x as x min 1; write(y) end.")
+
+
+class RecordingHooks(CompileHooks):
+    def __init__(self):
+        self.events = []
+
+    def phase_started(self, name):
+        self.events.append(('started', name))
+
+    def phase_finished(self, phase):
+        self.events.append(('finished', phase.name))
+
+    def compile_finished(self, stats):
+        self.events.append(('compiled', len(stats.phases)))
+
+
+def phase_names(stats):
+    return [phase.name for phase in stats.phases]
+
+
+def test_phases():
+    stats = Compiler.measure(CODE)
+    assert phase_names(stats) == ['lexer', 'parser', 'semantic']
+    assert stats.phases[0].details == {'tokens': stats.tokens}
+    assert stats.nodes == count_nodes(stats.root)
+    assert stats.seconds >= sum(phase.seconds for phase in stats.phases)
+    # Без trace_memory память не отслеживается
+    assert stats.peak_memory is None
+    assert all(phase.peak_memory is None for phase in stats.phases)
+
+    assert phase_names(Compiler.measure(CODE, legacy_pipeline=True)) == ['lexer', 'parser', 'semantic', 'ast']
+
+    optimized = Compiler.measure(CODE, optimize=True)
+    assert phase_names(optimized) == ['lexer', 'parser', 'semantic', 'optimizer', 'dataflow']
+    assert optimized.phases[3].details['eliminated'] > 0
+    assert set(optimized.phases[4].details) == {'dead_stores', 'common_subexpressions', 'hoisted'}
+    assert optimized.phases[4].details['dead_stores'] == 1
+
+
+def test_cache_phases(tmp_path):
+    cache = CompileCache(str(tmp_path), 'test')
+    assert phase_names(Compiler.measure(CODE, cache=cache)) == ['cache', 'lexer', 'parser', 'semantic', 'cache_store']
+    stats = Compiler.measure(CODE, cache=cache)
+    assert phase_names(stats) == ['cache']
+    assert stats.phases[0].details == {'hit': True}
+    assert stats.tokens > 0
+
+
+def test_memory():
+    stats = Compiler.measure(CODE, trace_memory=True)
+    assert stats.peak_memory > 0
+    assert all(phase.peak_memory >= 0 for phase in stats.phases)
+    text = stats.format()
+    lines = text.splitlines()
+    assert lines[0].split() == ['Фаза', 'Время,', 'мс', 'Память,', 'КБ', 'Данные']
+    assert [line.split()[0] for line in lines[1:]] == ['lexer', 'parser', 'semantic', 'Всего']
+    assert f"tokens={stats.tokens}" in lines[1]
+    assert lines[-1].endswith(f"токенов={stats.tokens}, узлов={stats.nodes}")
+
+
+def test_failed_phase():
+    stats = CompileStats()
+    with pytest.raises(SyntaxError):
+        Compiler.build("program var x : %; begin x as true end.", stats=stats, max_errors=1)
+    assert phase_names(stats) == ['lexer', 'parser', 'semantic']
+    assert [phase.failed for phase in stats.phases] == [False, False, True]
+    assert stats.format().splitlines()[3].rstrip().endswith("ошибка")
+    assert stats.as_dict()['phases'][2]['failed'] is True
+
+
+def test_as_dict():
+    stats = Compiler.measure(CODE)
+    data = stats.as_dict()
+    assert set(data) == {'seconds', 'tokens', 'nodes', 'peak_memory', 'phases'}
+    assert data['tokens'] == stats.tokens and data['nodes'] == stats.nodes
+    assert [phase['name'] for phase in data['phases']] == phase_names(stats)
+    assert set(data['phases'][0]) == {'name', 'seconds', 'peak_memory', 'details', 'failed'}
+
+
+def test_profile():
+    assert Compiler.measure(CODE).format_profile() == ''
+    stats = Compiler.measure(CODE, profile=True)
+    text = stats.format_profile(limit=10)
+    assert 'function calls' in text
+    assert 'tokenize' in stats.format_profile(limit=50, sort='cumulative')
+
+
+def test_hooks():
+    hooks = RecordingHooks()
+    Compiler.measure(CODE, hooks=[hooks])
+    assert hooks.events == [
+        ('started', 'lexer'), ('finished', 'lexer'),
+        ('started', 'parser'), ('finished', 'parser'),
+        ('started', 'semantic'), ('finished', 'semantic'),
+        ('compiled', 3),
+    ]
+
+
+def test_execute_phase(capsys):
+    # compile вызывает build: замеряется одна внешняя пара start/finish
+    hooks = RecordingHooks()
+    stats = CompileStats(hooks=[hooks])
+    Compiler.compile(CODE, run=True, backend='vm', stats=stats)
+    assert phase_names(stats) == ['lexer', 'parser', 'semantic', 'execute']
+    assert stats.phases[-1].details == {'backend': 'vm'}
+    assert [event for event in hooks.events if event[0] == 'compiled'] == [('compiled', 4)]
+    assert capsys.readouterr().out.splitlines()[-1] == '7'
+
+
+def test_command_line():
+    result = subprocess.run([sys.executable, 'main.py', '--stats', '--profile', '-O'], cwd=ROOT,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0
+    lines = result.stdout.splitlines()
+    header = next(index for index, line in enumerate(lines) if line.startswith('Фаза'))
+    assert [line.split()[0] for line in lines[header + 1:header + 7]] == [
+        'lexer', 'parser', 'semantic', 'optimizer', 'dataflow', 'Всего']
+    assert 'function calls' in result.stdout
@@ -0,0 +1,124 @@
+"""Удаление мертвых присваиваний, общих подвыражений и вынос инвариантов не меняют поведение программы."""
+import io
+
+import pytest
+
+from src.compiler import Compiler
+from src.dataflow.analysis import liveness, reaching_definitions
+from src.dataflow.cfg import ControlFlowGraph
+from src.dataflow.data_flow_optimizer import DataFlowOptimizer
+from src.interpreter import Interpreter
+
+
+INPUT = "3 4 " * 20
+
+PROGRAMS = {
+    'dead_stores': """program var a, b, c : %; begin
+        read(a);
+        b as a plus 1; b as a mult 2; c as b plus 1;
+        c as a min 1; a as 5;
+        write(b, c)
+    end.""",
+    'common_subexpressions': """program var a, b, c, d : %; f, g : !; begin
+        read(a, f, b, g);
+        c as (a plus b) mult 2; d as (a plus b) min 1; write(c, d, a plus b);
+        a as a plus 1; write(a plus b, (a plus b) mult 2);
+        g as f mult g plus 1.0; write(f mult g, f mult g plus 1.0, g)
+    end.""",
+    'hoisting': """program var a, b, c, i : %; begin
+        read(a, b); c as 0;
+        for i as 1 to 5 do c as c plus (a mult b) plus i;
+        while c GT a mult b do c as c min (a plus b);
+        for i as 1 to 3 do for b as 1 to 2 do write(a mult 3, i mult b);
+        write(c, i)
+    end.""",
+    'loop_reads': """program var a, b, c : %; begin
+        read(a); b as 0;
+        for c as 1 to 4 do if a GT c plus 1 then read(b) else b as b plus a mult 2;
+        for c as 1 to 2 do read(a);
+        write(a, b, c, a plus b)
+    end.""",
+    'guarded_division': """program var a, b, c : %; begin
+        read(a); b as 0; c as 0;
+        while b GT 0 do c as a div b;
+        if b NE 0 then c as a div b;
+        write(c, a div (b plus 1))
+    end.""",
+    'division_by_zero': """program var a, b : %; begin
+        read(a); b as a min a; write(a plus 1);
+        for a as 1 to 3 do write(a div b)
+    end.""",
+}
+
+
+def run(root):
+    output = io.StringIO()
+    interpreter = Interpreter(io.StringIO(INPUT), output)
+    try:
+        variables = interpreter.run(root)
+    except RuntimeError as error:
+        return output.getvalue(), str(error)
+    return output.getvalue(), variables
+
+
+def declared_names(root):
+    return {node.value for node in root.children if node.symbol is not None and node.value is not None}
+
+
+@pytest.mark.parametrize('code', PROGRAMS.values(), ids=PROGRAMS.keys())
+def test_data_flow_keeps_output(code):
+    expected_output, expected_result = run(Compiler.build(code)[1])
+    output, result = run(DataFlowOptimizer().optimize(Compiler.build(code)[1]))
+    assert output == expected_output
+    if isinstance(expected_result, str):
+        assert result == expected_result
+
+
+@pytest.mark.parametrize('code', PROGRAMS.values(), ids=PROGRAMS.keys())
+def test_data_flow_keeps_live_variables(code):
+    # Переменные из live_at_exit наблюдаемы после программы и должны совпасть
+    root = Compiler.build(code)[1]
+    names = declared_names(root)
+    expected = run(root)
+    output, result = run(DataFlowOptimizer(names).optimize(Compiler.build(code)[1]))
+    if isinstance(result, dict):
+        result = {name: value for name, value in result.items() if name in names}
+    assert (output, result) == expected
+
+
+@pytest.mark.parametrize('code', PROGRAMS.values(), ids=PROGRAMS.keys())
+def test_full_pipeline_keeps_output(code):
+    assert run(Compiler.build(code, optimize=True)[1])[0] == run(Compiler.build(code)[1])[0]
+
+
+@pytest.mark.parametrize('name, counter', [('dead_stores', 'dead_stores'),
+                                           ('common_subexpressions', 'common_subexpressions'),
+                                           ('hoisting', 'hoisted')])
+def test_optimizations_apply(name, counter):
+    optimizer = DataFlowOptimizer()
+    optimizer.optimize(Compiler.build(PROGRAMS[name])[1])
+    assert getattr(optimizer, counter) > 0
+
+
+def test_analyses_use_symbols():
+    root = Compiler.build(PROGRAMS['dead_stores'])[1]
+    symbols = {node.value: node.symbol for node in root.children if node.symbol is not None}
+    cfg = ControlFlowGraph(root)
+    assert cfg.entry.defs == set(symbols.values())
+    live_out = liveness(cfg, {symbols['b']})
+    assert live_out[cfg.exit.predecessors[0].index] == {symbols['b']}
+    definitions = reaching_definitions(cfg)[cfg.exit.index]
+    assert {symbol for symbol, _ in definitions} == set(symbols.values())
+
+
+def test_common_subexpressions_stay_inside_bodies():
+    # Присваивание временной переменной перед оператором тела поставить некуда
+    code = """program var a, b, c : %; begin
+        read(a, b);
+        if a LT b then c as (a plus b) mult (a plus b);
+        write(c)
+    end."""
+    optimizer = DataFlowOptimizer()
+    root = optimizer.optimize(Compiler.build(code)[1])
+    assert optimizer.common_subexpressions == 0
+    assert run(root) == run(Compiler.build(code)[1])
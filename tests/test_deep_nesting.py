@@ -0,0 +1,108 @@
+"""Глубоко вложенные программы: разбор, проверки и исполнение без RecursionError."""
+import contextlib
+import io
+
+import pytest
+
+from src.ast_nodes.ast_node_type import NodeType
+from src.ast_nodes.printer import print_ast
+from src.ast_nodes.traversal import count_nodes, postorder, trampoline, walk
+from src.compiler import Compiler
+from src.lexer import Lexer
+from src.parser import Parser
+from src.tokens.token_type import TokenType
+
+
+DEPTH = 20000
+# Вложенные операторы и оптимизация заметно медленнее выражений
+STATEMENT_DEPTH = 3000
+
+PROGRAMS = {
+    'parens': ("program var a : %; begin a as 1; a as " + "(a plus " * DEPTH + "1" + ")" * DEPTH
+               + "; write(a) end.", {'a': DEPTH + 1}),
+    'negations': ("program var p : $; begin p as " + "~" * (DEPTH + 1) + "true; write(p) end.",
+                  {'p': False}),
+    'chain': ("program var a : %; begin a as 1; a as " + " plus ".join(["a"] * DEPTH) + "; write(a) end.",
+              {'a': DEPTH}),
+    'ifs': ("program var a : %; begin a as 0; " + "if a LT 1 then " * STATEMENT_DEPTH + "a as 1; write(a) end.",
+            {'a': 1}),
+    'whiles': ("program var a : %; begin a as 0; " + "while a LT 1 do " * STATEMENT_DEPTH
+               + "a as a plus 1; write(a) end.", {'a': 1}),
+}
+
+# Трехпроходная компиляция проверяет присваивания по соседним токенам: справа от as
+# допускаются только идентификаторы и литералы
+LEGACY_PROGRAMS = ['chain', 'ifs', 'whiles']
+
+
+def tree_text(root):
+    # Сравнение узлов dataclass рекурсивно, печать дерева - нет
+    stream = io.StringIO()
+    print_ast(root, stream, 'compact')
+    return stream.getvalue()
+
+
+def execute(root, backend):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Compiler.execute(root, backend)
+
+
+@pytest.mark.parametrize('name', list(PROGRAMS))
+def test_single_pass(name):
+    code, expected = PROGRAMS[name]
+    root = Compiler.build(code)[1]
+    assert execute(root, 'ast') == execute(root, 'vm') == expected
+
+
+@pytest.mark.parametrize('name', ['parens', 'negations', 'chain', 'ifs'])
+def test_optimized(name):
+    code, expected = PROGRAMS[name]
+    root = Compiler.build(code, optimize=True)[1]
+    assert execute(root, 'ast') == execute(root, 'vm') == expected
+
+
+@pytest.mark.parametrize('name', LEGACY_PROGRAMS)
+def test_legacy_pipeline(name):
+    code, expected = PROGRAMS[name]
+    legacy = Compiler.build(code, legacy_pipeline=True)[1]
+    assert tree_text(legacy) == tree_text(Compiler.build(code)[1])
+    assert execute(legacy, 'vm') == expected
+
+
+@pytest.mark.parametrize('name', list(PROGRAMS))
+def test_parser(name):
+    Parser(Lexer(PROGRAMS[name][0]).tokenize()).parse()
+
+
+def test_missing_parenthesis():
+    code = "program var a : %; begin a as " + "(a plus " * DEPTH + "1" + ")" * (DEPTH - 1) + " end."
+    with pytest.raises(SyntaxError, match="Ожидается '\\)'") as error:
+        Compiler.build(code)
+    assert error.value.args[0].endswith(f"столбец {code.index(' end.') + 2})")
+
+
+def test_printer():
+    root = Compiler.build(PROGRAMS['parens'][0])[1]
+    lines = tree_text(root).splitlines()
+    assert len(lines) == count_nodes(root)
+    assert max(len(line) - len(line.lstrip()) for line in lines) >= DEPTH
+
+
+def test_traversal():
+    root = Compiler.build("program var a : %; begin a as (a plus 1) mult 2 end.")[1]
+    assert [(node.type, depth) for node, depth in walk(root)] == [
+        (NodeType.PROGRAM, 0), (NodeType.VARIABLE_DECLARATION, 1), (NodeType.ASSIGNMENT, 1),
+        (NodeType.BINARY_OPERATION, 2), (NodeType.BINARY_OPERATION, 3),
+        (NodeType.IDENTIFIER, 4), (NodeType.LITERAL, 4), (NodeType.LITERAL, 3)]
+    assert [node.value for node in postorder(root)] == [
+        'a', 'a', '1', TokenType.PLUS, '2', TokenType.MULT, 'a', None]
+    assert count_nodes(None) == 0
+
+
+def test_trampoline():
+    def depth(level):
+        if level == 0:
+            return 0
+        return (yield depth(level - 1)) + 1
+
+    assert trampoline(depth(DEPTH * 5)) == DEPTH * 5
@@ -0,0 +1,72 @@
+"""Сбор всех ошибок за одну компиляцию с восстановлением после ошибки."""
+import pytest
+
+from src.compiler import Compiler
+from src.diagnostics import CompilationErrors
+
+
+ERRORS_CODE = """program var x, y : %; p : $;
+begin
+x as ;
+y as true;
+z as 1;
+while x do y as 2;
+write(x plus)
+end."""
+
+
+def errors(code, **options):
+    with pytest.raises(CompilationErrors) as caught:
+        Compiler.build(code, max_errors=20, **options)
+    return [str(error) for error in caught.value.errors], caught.value.truncated
+
+
+@pytest.mark.parametrize('legacy_pipeline', [False, True])
+def test_reports_all_errors_with_positions(legacy_pipeline):
+    messages, truncated = errors(ERRORS_CODE, legacy_pipeline=legacy_pipeline)
+    assert not truncated
+    assert len(messages) > 1
+    assert all('(строка ' in message for message in messages)
+    # Первая ошибка та же, что без восстановления
+    with pytest.raises(SyntaxError) as first:
+        Compiler.build(ERRORS_CODE, legacy_pipeline=legacy_pipeline)
+    assert messages[0] == str(first.value)
+
+
+def test_syntax_and_semantic_errors():
+    messages, _ = errors(ERRORS_CODE)
+    assert messages == [
+        "Неожиданный множитель в выражении (строка 3, столбец 6)",
+        "Неожиданный множитель в выражении (строка 7, столбец 13)",
+        "Несовместимые типы при присваивании: TokenType.INTEGER ≠ TokenType.BOOLEAN (y) (строка 4, столбец 1)",
+        "Необъявленная переменная: z (строка 5, столбец 1)",
+        "Условие должно иметь логический тип, получено: TokenType.INTEGER (строка 6, столбец 7)",
+    ]
+
+
+def test_error_limit():
+    code = "program var x : %; begin " + "; ".join(["x as true"] * 10) + " end."
+    with pytest.raises(CompilationErrors) as caught:
+        Compiler.build(code, max_errors=3)
+    assert len(caught.value.errors) == 3
+    assert caught.value.truncated
+
+
+def test_single_error_without_collection():
+    with pytest.raises(SyntaxError) as caught:
+        Compiler.build(ERRORS_CODE)
+    assert not isinstance(caught.value, CompilationErrors)
+
+
+@pytest.mark.parametrize('legacy_pipeline', [False, True])
+def test_failed_phase_is_not_reported_completed(capsys, legacy_pipeline):
+    Compiler.compile("program var x : %; begin x as ; x as 1 end.", legacy_pipeline=legacy_pipeline)
+    output = capsys.readouterr().out
+    assert "Ошибка компиляции" in output
+    assert "Синтаксический анализ завершен" not in output
+    assert "Семантический анализ завершен" not in output
+
+    Compiler.compile("program var x : %; begin x as true end.", legacy_pipeline=legacy_pipeline)
+    output = capsys.readouterr().out
+    assert "Синтаксический анализ завершен" in output
+    assert "Семантический анализ завершен" not in output
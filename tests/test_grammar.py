@@ -0,0 +1,95 @@
+"""Грамматика языка: множества FIRST и FOLLOW и таблица LL(1)."""
+import pytest
+
+from src.grammar import (BINARY_PRECEDENCE, EPSILON, FIRST, FOLLOW, OPERAND_TYPES, TABLE,
+                         Repeat, Rule, Tail, Terminal, build_table, compute_first, compute_follow)
+from src.tokens.token_type import TokenType
+
+
+EXPRESSION_START = OPERAND_TYPES | {TokenType.UNARY_NEGATION, TokenType.LPAREN}
+STATEMENT_START = {TokenType.IDENTIFIER, TokenType.IF, TokenType.FOR, TokenType.WHILE,
+                   TokenType.READ, TokenType.WRITE}
+
+
+def test_first():
+    assert FIRST['statement'] == STATEMENT_START
+    assert FIRST['expression'] == FIRST['operand'] == FIRST['multiplier'] == EXPRESSION_START
+    assert FIRST['variables'] == {TokenType.IDENTIFIER}
+    assert all(EPSILON not in types for types in FIRST.values())
+
+
+def test_follow():
+    # После оператора: ';' и 'end' из циклов Parser, 'else' после then-ветки
+    assert FOLLOW['statement'] == {TokenType.SEMICOLON, TokenType.END, TokenType.ELSE}
+    assert FOLLOW['variables'] == {TokenType.SEMICOLON}
+    assert TokenType.RPAREN in FOLLOW['expression'] and TokenType.THEN in FOLLOW['expression']
+    assert {TokenType.TO, TokenType.DO, TokenType.COMMA} <= FOLLOW['expression']
+    assert FOLLOW['summand'] >= {TokenType.PLUS, TokenType.MIN, TokenType.OR, TokenType.LT}
+
+
+def test_table():
+    assert set(TABLE['statement']) == STATEMENT_START
+    # Цепные правила statement -> assignment заменены правыми частями
+    assert TABLE['statement'][TokenType.IDENTIFIER] is TABLE['assignment'][TokenType.IDENTIFIER]
+    assert TABLE['statement'][TokenType.WHILE].name == 'conditional_loop'
+    multiplier = TABLE['multiplier']
+    assert set(multiplier) == EXPRESSION_START
+    assert multiplier[TokenType.INTEGER] is multiplier[TokenType.BOOLEAN]
+    assert multiplier[TokenType.LPAREN] is not multiplier[TokenType.UNARY_NEGATION]
+
+
+def test_precedence():
+    assert BINARY_PRECEDENCE[TokenType.LT] < BINARY_PRECEDENCE[TokenType.PLUS] < BINARY_PRECEDENCE[TokenType.MULT]
+    assert BINARY_PRECEDENCE[TokenType.OR] == BINARY_PRECEDENCE[TokenType.MIN]
+    assert BINARY_PRECEDENCE[TokenType.AND] == BINARY_PRECEDENCE[TokenType.DIV]
+
+
+def table_for(grammar, entries=None):
+    first = compute_first(grammar)
+    follow = compute_follow(grammar, first, entries or {})
+    return build_table(grammar, first, follow)
+
+
+def test_conflicting_alternatives():
+    # Обе альтернативы начинаются с идентификатора
+    grammar = {
+        'statement': Rule([(Terminal(TokenType.IDENTIFIER), Terminal(TokenType.AS)),
+                           (Terminal(TokenType.IDENTIFIER), Terminal(TokenType.COLON))]),
+    }
+    with pytest.raises(ValueError, match="Грамматика не LL\\(1\\): statement по TokenType.IDENTIFIER"):
+        table_for(grammar)
+
+
+def test_conflict_through_chain_rule():
+    grammar = {
+        'statement': Rule([('assignment',), ('call',)]),
+        'assignment': Rule([(Terminal(TokenType.IDENTIFIER), Terminal(TokenType.AS))]),
+        'call': Rule([(Terminal({TokenType.IDENTIFIER, TokenType.WRITE}), Terminal(TokenType.LPAREN))]),
+    }
+    with pytest.raises(ValueError, match="statement по TokenType.IDENTIFIER"):
+        table_for(grammar)
+
+
+def test_conflict_with_follow():
+    # Пустая альтернатива optional выбирается по FOLLOW, где есть else первой альтернативы
+    grammar = {
+        'statement': Rule([(Terminal(TokenType.IF), 'optional', Terminal(TokenType.ELSE))]),
+        'optional': Rule([(Terminal(TokenType.ELSE), Terminal(TokenType.INTEGER)),
+                          (Tail(Terminal(TokenType.THEN), 'statement'),)]),
+    }
+    with pytest.raises(ValueError, match="optional по TokenType.ELSE"):
+        table_for(grammar)
+
+
+def test_small_grammar():
+    grammar = {
+        'list': Rule([(Repeat('item', Terminal(TokenType.COMMA)),)]),
+        'item': Rule([(Terminal(TokenType.INTEGER),), (Terminal(TokenType.LPAREN), 'list',
+                                                        Terminal(TokenType.RPAREN))]),
+    }
+    first = compute_first(grammar)
+    assert first == {'list': {TokenType.INTEGER, TokenType.LPAREN}, 'item': {TokenType.INTEGER, TokenType.LPAREN}}
+    follow = compute_follow(grammar, first, {'list': frozenset({TokenType.SEMICOLON})})
+    assert follow['item'] == {TokenType.COMMA, TokenType.RPAREN, TokenType.SEMICOLON}
+    table = build_table(grammar, first, follow)
+    assert set(table['item']) == {TokenType.INTEGER, TokenType.LPAREN}
@@ -0,0 +1,105 @@
+"""Диагностика, токены и дерево IncrementalCompiler совпадают с полной компиляцией."""
+import io
+import random
+
+import pytest
+
+from src.ast_nodes.printer import print_ast
+from src.compiler import Compiler
+from src.incremental import IncrementalCompiler
+
+
+PROGRAM = """program var x, y : %; z : !; p : $;
+begin
+x as 1;
+y as x plus 2;
+z as 1.5;
+if x LT y then write(x) else y as 2;
+while x LT 3 do x as x plus 1;
+for y as 1 to 3 do write(y, z);
+p as x EQ y;
+read(x)
+end."""
+
+# Правки (старый фрагмент, новый фрагмент) применяются по очереди к первому вхождению
+EDITS = [
+    ('x as 1', 'x as 10'),                  # литерал другой длины сдвигает все следующие токены
+    ('z as 1.5', 'z as true'),              # ошибка типов
+    ('y as x plus 2', 'y as x plus 2.5'),   # вторая ошибка выше первой
+    ('y as x plus 2.5', 'y as x plus 2'),
+    ('z as true', 'z as 1.5'),
+    ('write(x)', 'write(x'),                # синтаксическая ошибка
+    ('write(x', 'write(x)'),
+    ('z : !;', 'z : %;'),                   # смена типа в объявлении
+    ('z : %;', 'z : !;'),
+    ('p as x EQ y;', 'p as x EQ y; x as #;'),  # лексическая ошибка
+    (' x as #;', ''),
+    ('x as 10;\n', ''),                     # удаление оператора
+    ('begin\n', 'begin\nx as 1;\n'),
+]
+
+
+def full_build(code):
+    try:
+        tokens, root = Compiler.build(code)
+    except SyntaxError as error:
+        return str(error), None, None
+    return None, tokens, root
+
+
+def tree_text(root):
+    stream = io.StringIO()
+    print_ast(root, stream, 'compact')
+    return stream.getvalue()
+
+
+def token_fields(tokens):
+    return [(token.type, token.value, token.offset) for token in tokens]
+
+
+def check(compiler, code):
+    assert compiler.code == code
+    error, tokens, root = full_build(code)
+    diagnostics = compiler.diagnostics
+    assert (str(diagnostics[0]) if diagnostics else None) == error
+    if error is None:
+        assert token_fields(compiler.tokens) == token_fields(tokens)
+        assert tree_text(compiler.root) == tree_text(root)
+        for token in tokens[::7]:
+            assert compiler.token_at(token.offset) is compiler.tokens[tokens.index(token)]
+
+
+def apply(compiler, code, start, end, text):
+    compiler.edit(start, end, text)
+    return code[:start] + text + code[end:]
+
+
+def test_edit_sequence():
+    code = PROGRAM
+    compiler = IncrementalCompiler(code)
+    check(compiler, code)
+    for old, new in EDITS:
+        start = code.index(old)
+        code = apply(compiler, code, start, start + len(old), new)
+        check(compiler, code)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_edits(seed):
+    # Случайные вставки и удаления с частыми откатами, чтобы текст оставался похожим на программу
+    pieces = [';', ' ', 'x', 'y', ' as ', '1', ' plus ', '(', ')', 'if ', ' then ', ' else ', 'while ',
+              ' do ', 'write(x)', 'read(y)', '{', '}', 'true', ' LT ', '2.5', '\n', 'x as x plus 1;']
+    rng = random.Random(seed)
+    code = PROGRAM
+    compiler = IncrementalCompiler(code)
+    undo = []
+    for _ in range(60):
+        if undo and rng.random() < 0.5:
+            start, end, text = undo.pop()
+        else:
+            start = rng.randint(0, len(code))
+            end = min(len(code), start + rng.choice([0, 0, 1, 3]))
+            text = rng.choice(pieces) if rng.random() < 0.7 or start == end else ''
+            undo.append((start, start + len(text), code[start:end]))
+        code = apply(compiler, code, start, end, text)
+        check(compiler, code)
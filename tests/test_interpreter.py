@@ -0,0 +1,119 @@
+"""Исполнение программ обходом AST: рекурсивный обход и обход на явном стеке."""
+import io
+
+import pytest
+
+import src.interpreter
+from src.ast_builder import ASTBuilder
+from src.compiler import Compiler
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+
+
+INPUT = "3 4 2.5 " * 10
+
+PROGRAMS = {
+    'expressions': """program var a, b : %; f : !; p : $; begin
+        read(a, b, f);
+        write(a plus b mult 2, (a min b) div 2, a div b, 7 div 2, 0 min 7 div 2, a div 2.0, f mult a);
+        p as (a LT b) and ~(a EQ b) or false; write(p, a NE b, a LE b, a GE b, a GT b);
+        p as false and (1 div 0 EQ 0); write(p, true or (1 div 0 EQ 0));
+        f as a; write(f)
+    end.""",
+    'statements': """program var a, b, i : %; begin
+        read(a, b);
+        if a LT b then write(a) else write(b);
+        if a GT b then write(a);
+        for i as a to b plus 2 do if i EQ 4 then write(i mult 10) else write(i);
+        write(i);
+        for i as 1 to 10 do i as i plus 3;
+        write(i);
+        while a LT 100 do a as a mult b;
+        write(a)
+    end.""",
+    'division_by_zero': """program var a, b : %; begin
+        read(a); write(a); b as a div (a min 3)
+    end.""",
+    'missing_input': """program var a : %; begin
+        for a as 1 to 50 do read(a)
+    end.""",
+}
+
+DEEP_PROGRAMS = {
+    'chain': "program var a : %; begin a as 1; a as " + " plus ".join(["a"] * 3000) + "; write(a) end.",
+    'parens': "program var a : %; begin a as " + "(a plus " * 1000 + "1" + ")" * 1000 + "; write(a) end.",
+    'negations': "program var p : $; begin p as " + "~" * 1001 + "true; write(p) end.",
+    'ifs': "program var a : %; begin a as 0; " + "if a LT 1 then " * 500 + "a as 1; write(a) end.",
+    'whiles': "program var a : %; begin a as 0; " + "while a LT 1 do " * 500 + "a as a plus 1; write(a) end.",
+    'fors': "program var a, b : %; begin " + "for a as 1 to 2 do " * 300 + "b as b plus 1; write(a, b) end.",
+    'deep_error': "program var a : %; begin " + "if true then " * 300 + "a as " + "(1 plus " * 300 + "1 div 0" + ")" * 300 + " end.",
+}
+
+
+def run(code, input_text=INPUT):
+    output = io.StringIO()
+    try:
+        variables = Interpreter(io.StringIO(input_text), output).run(Compiler.build(code)[1])
+    except RuntimeError as error:
+        return output.getvalue(), str(error)
+    return output.getvalue(), variables
+
+
+def test_results():
+    assert run(PROGRAMS['expressions'])[0] == (
+        "11 0 0 3 -3 1.5 7.5\ntrue true true false false\nfalse true\n3.0\n")
+    assert run(PROGRAMS['statements']) == (
+        "3\n3\n40\n5\n6\n7\n13\n192\n", {'a': 192, 'b': 4, 'i': 13})
+    assert run(PROGRAMS['division_by_zero']) == ("3\n", "Деление на ноль (строка 2, столбец 35)")
+    assert run(PROGRAMS['missing_input'], "1 2")[1] == "Недостаточно входных данных для a (строка 2, столбец 34)"
+
+
+@pytest.mark.parametrize('code', {**PROGRAMS, **DEEP_PROGRAMS}.values(),
+                         ids={**PROGRAMS, **DEEP_PROGRAMS}.keys())
+@pytest.mark.parametrize('depth', [0, 1, 3])
+def test_stack_traversal_matches_recursion(code, depth, monkeypatch):
+    # При RECURSION_DEPTH = 0 весь обход идет на явном стеке, при малых - попеременно
+    expected = run(code)
+    monkeypatch.setattr(src.interpreter, 'RECURSION_DEPTH', depth)
+    assert run(code) == expected
+
+
+def test_deep_programs():
+    assert run(DEEP_PROGRAMS['chain'])[1] == {'a': 3000}
+    assert run(DEEP_PROGRAMS['negations'])[1] == {'p': False}
+    assert run(DEEP_PROGRAMS['whiles'])[1] == {'a': 1}
+    assert run(DEEP_PROGRAMS['fors'])[1] == {'a': 302, 'b': 2}
+    assert run(DEEP_PROGRAMS['deep_error'])[1].startswith("Деление на ноль")
+
+
+def test_input_uses_literal_syntax():
+    code = "program var a, b : %; f, g : !; p : $; begin read(a, b, f, g, p); write(a, b, f, g, p) end."
+    assert run(code, "101B 1FH\n1.5E1 7\n  false") == ("5 31 15.0 7.0 false\n",
+                                                       {'a': 5, 'b': 31, 'f': 15.0, 'g': 7.0, 'p': False})
+
+
+@pytest.mark.parametrize('input_text, message', [
+    ("1.5", "Неверное входное значение для a: 1.5"),
+    ("true", "Неверное входное значение для a: true"),
+    ("12B", "Неверное входное значение для a: 12B"),
+    ("", "Недостаточно входных данных для a"),
+])
+def test_bad_input(input_text, message):
+    assert run("program var a : %; begin read(a) end.", input_text)[1].startswith(message)
+
+
+def test_undeclared_variable_without_type_checking():
+    code = "program var x : %; begin x as 1; write(y) end."
+    root = ASTBuilder(Lexer(code).tokenize(), strict=True).parse()
+    output = io.StringIO()
+    with pytest.raises(RuntimeError, match=r"Необъявленная переменная: y \(строка 1, столбец 40\)"):
+        Interpreter(io.StringIO(), output).run(root)
+    assert output.getvalue() == ""
+
+
+def test_compile_and_run(capsys, monkeypatch):
+    monkeypatch.setattr('sys.stdin', io.StringIO("4"))
+    Compiler.compile("program var a : %; begin read(a); write(a mult a) end.", run=True)
+    assert capsys.readouterr().out.splitlines()[-1] == "16"
+    Compiler.compile("program var a : %; begin a as 1 div 0 end.", run=True)
+    assert capsys.readouterr().out.splitlines()[-1] == "Ошибка выполнения: Деление на ноль (строка 1, столбец 33)"
@@ -0,0 +1,161 @@
+"""Сервер LSP: сеанс клиента по сценарию."""
+import io
+import os
+import subprocess
+import sys
+
+from src.language_server import Document, LanguageServer, read_message, write_message
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+URI = 'file:///test.uvm'
+TEXT = "program var x, y : %; z : !;\nbegin\n  x as 1;\n  z as x plus 2.5;\n  write(z)\nend."
+
+
+def request(id, method, params=None):
+    return {'jsonrpc': '2.0', 'id': id, 'method': method, 'params': params or {}}
+
+
+def notification(method, params=None):
+    return {'jsonrpc': '2.0', 'method': method, 'params': params or {}}
+
+
+def change(version, start, end, text):
+    return notification('textDocument/didChange', {
+        'textDocument': {'uri': URI, 'version': version},
+        'contentChanges': [{'range': {'start': start, 'end': end}, 'text': text}]
+    })
+
+
+def position(line, character):
+    return {'line': line, 'character': character}
+
+
+def session(messages, debounce=3600.0):
+    """Прогоняет сообщения через сервер; возвращает код завершения и ответы сервера"""
+    reader = io.BytesIO()
+    for message in messages:
+        write_message(reader, message)
+    reader.seek(0)
+    writer = io.BytesIO()
+    code = LanguageServer(reader, writer, debounce).serve()
+    writer.seek(0)
+    replies = []
+    while True:
+        message = read_message(writer)
+        if message is None:
+            return code, replies
+        replies.append(message)
+
+
+def opened(text=TEXT):
+    return notification('textDocument/didOpen', {
+        'textDocument': {'uri': URI, 'languageId': 'uvm', 'version': 1, 'text': text}
+    })
+
+
+def test_scripted_session():
+    code, replies = session([
+        request(1, 'initialize'),
+        notification('initialized'),
+        opened(),
+        request(2, 'textDocument/hover', {'textDocument': {'uri': URI}, 'position': position(3, 3)}),
+        request(3, 'textDocument/definition', {'textDocument': {'uri': URI}, 'position': position(3, 8)}),
+        # "1" -> "true" тремя нажатиями: диагностика публикуется один раз, перед запросом
+        change(2, position(2, 7), position(2, 8), 't'),
+        change(3, position(2, 8), position(2, 8), 'r'),
+        change(4, position(2, 9), position(2, 9), 'ue'),
+        request(4, 'textDocument/hover', {'textDocument': {'uri': URI}, 'position': position(2, 2)}),
+        change(5, position(2, 7), position(2, 11), '1'),
+        request(5, 'textDocument/hover', {'textDocument': {'uri': URI}, 'position': position(4, 8)}),
+        request(6, 'textDocument/unknown'),
+        notification('textDocument/didClose', {'textDocument': {'uri': URI}}),
+        request(7, 'shutdown'),
+        notification('exit'),
+    ])
+    assert code == 0
+
+    initialize, diagnostics, hover, definition, *rest = replies
+    assert initialize['id'] == 1
+    capabilities = initialize['result']['capabilities']
+    assert capabilities['hoverProvider'] and capabilities['definitionProvider']
+    assert capabilities['textDocumentSync']['change'] == 2
+
+    assert diagnostics['method'] == 'textDocument/publishDiagnostics'
+    assert diagnostics['params'] == {'uri': URI, 'version': 1, 'diagnostics': []}
+
+    assert hover['id'] == 2
+    assert hover['result']['contents']['value'] == "z : ! (действительный)"
+    assert hover['result']['range'] == {'start': position(3, 2), 'end': position(3, 3)}
+
+    assert definition['id'] == 3
+    assert definition['result'] == {'uri': URI, 'range': {'start': position(0, 12), 'end': position(0, 13)}}
+
+    broken, hover_x, fixed, hover_z, unknown, closed, shutdown = rest
+    assert broken['params']['version'] == 4
+    [error] = broken['params']['diagnostics']
+    assert error['severity'] == 1 and error['source'] == 'uvm'
+    # Несовместимые типы отмечаются на переменной присваивания
+    assert error['range'] == {'start': position(2, 2), 'end': position(2, 3)}
+    assert hover_x['result']['contents']['value'] == "x : % (целый)"
+
+    assert fixed['params']['version'] == 5 and fixed['params']['diagnostics'] == []
+    assert hover_z['id'] == 5
+    assert hover_z['result']['contents']['value'] == "z : ! (действительный)"
+
+    assert unknown['id'] == 6 and unknown['error']['code'] == -32601
+    assert closed['params'] == {'uri': URI, 'diagnostics': []}
+    assert shutdown == {'jsonrpc': '2.0', 'id': 7, 'result': None}
+
+
+def test_debounced_analysis():
+    # Без запросов отложенный анализ срабатывает сам после паузы
+    code, replies = session([
+        request(1, 'initialize'),
+        opened(),
+        change(2, position(2, 7), position(2, 8), 'true'),
+        request(2, 'shutdown'),
+        notification('exit'),
+    ], debounce=0.0)
+    assert code == 0
+    published = [reply for reply in replies if reply.get('method') == 'textDocument/publishDiagnostics']
+    assert [reply['params']['version'] for reply in published] == [1, 2]
+    assert len(published[1]['params']['diagnostics']) == 1
+
+
+def test_requests_before_initialize():
+    code, replies = session([
+        opened(),
+        request(1, 'textDocument/hover', {'textDocument': {'uri': URI}, 'position': position(0, 0)}),
+        notification('exit'),
+    ])
+    # Выход без shutdown - код 1, уведомления до initialize игнорируются
+    assert code == 1
+    assert replies == [{'jsonrpc': '2.0', 'id': 1, 'error': {'code': -32002, 'message': "Сервер не инициализирован"}}]
+
+
+def test_document_positions():
+    document = Document(URI, 1, "a\n\U0001F600b\nc")
+    # Символ вне BMP занимает две кодовые единицы UTF-16
+    assert document.offset(position(1, 2)) == 3
+    assert document.position(4) == position(1, 3)
+    # Строка за концом текста - начало последней строки
+    assert document.offset(position(9, 0)) == 5
+    document.change({'range': {'start': position(1, 0), 'end': position(2, 0)}, 'text': ''})
+    assert document.text == "a\nc"
+    assert document.pending == [(2, 5, '')]
+
+
+def test_stdio_session():
+    stdin = io.BytesIO()
+    for message in [request(1, 'initialize'), opened("program var x : %; begin x as end."),
+                    request(2, 'shutdown'), notification('exit')]:
+        write_message(stdin, message)
+    result = subprocess.run([sys.executable, 'main.py', '--lsp'], cwd=ROOT, input=stdin.getvalue(),
+                            capture_output=True, timeout=60)
+    assert result.returncode == 0
+    stdout = io.BytesIO(result.stdout)
+    replies = [read_message(stdout) for _ in range(3)]
+    assert [reply.get('id') for reply in replies] == [1, None, 2]
+    assert len(replies[1]['params']['diagnostics']) == 1
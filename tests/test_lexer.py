@@ -0,0 +1,56 @@
+"""Регулярный, прежний посимвольный и потоковый лексеры выдают одинаковые токены."""
+import io
+
+import pytest
+
+from benchmarks.generator import SHAPES, generate_program
+from src.lexer import Lexer
+from src.streaming_lexer import StreamingLexer
+
+
+PROGRAMS = [
+    "program var a, b, c : %; f : !; ok : $;\n"
+    "begin\n"
+    "  a as 101B; b as 17O; f as 1.5; a as 1FH; b as 12D; f as 2.5E+3; f as 1.5e-2;\n"
+    "  ok as a NE b; ok as a EQ b; ok as a LE b; ok as a GE b; ok as a LT b; ok as a GT b;\n"
+    "  a as a mult b div 2; ok as ok and true or false; ok as ~ok; f as 2.;\n"
+    "  { комментарий\n на две строки } c as a plus b min 1;\n"
+    "  read(a, b); write(a, b plus 1)\n"
+    "end.",
+    "program var x, y : %; begin\n"
+    " if x LT y then while x GT 0 do x as x min 1 else for y as 1 to 5 do write((x plus y) mult 2)\n"
+    "end.",
+]
+
+
+def token_fields(tokens):
+    return [(token.type, token.value, token.offset, token.literal) for token in tokens]
+
+
+def stream_tokens(code: str, chunk_size: int):
+    return list(StreamingLexer(io.StringIO(code), chunk_size=chunk_size))
+
+
+CASES = {f'program{index}': code for index, code in enumerate(PROGRAMS)}
+CASES.update((shape, generate_program(shape, 60, seed=1)) for shape in SHAPES)
+
+
+@pytest.mark.parametrize('code', CASES.values(), ids=CASES.keys())
+def test_lexers_agree(code):
+    expected = token_fields(Lexer(code).tokenize())
+    assert token_fields(Lexer(code, legacy=True).tokenize()) == expected
+    # Мелкие фрагменты режут числа, идентификаторы и комментарии на границах
+    for chunk_size in (1, 2, 3, 7, 1 << 16):
+        assert token_fields(stream_tokens(code, chunk_size)) == expected
+
+
+@pytest.mark.parametrize('code', ["program var x : %; begin x as 1 # 2 end.",
+                                  "program var x : %; begin x as 19B end."])
+def test_lexers_report_same_error(code):
+    messages = []
+    for tokenize in (lambda: Lexer(code).tokenize(), lambda: Lexer(code, legacy=True).tokenize(),
+                     lambda: stream_tokens(code, 4)):
+        with pytest.raises(SyntaxError) as error:
+            tokenize()
+        messages.append(str(error.value))
+    assert len(set(messages)) == 1
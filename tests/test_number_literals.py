@@ -0,0 +1,52 @@
+"""Числовые литералы разбираются один раз, в лексере."""
+import pytest
+
+from src.ast_nodes.ast_node_type import NodeType
+from src.ast_nodes.traversal import walk
+from src.compiler import Compiler
+from src.lexer import Lexer, classify_number, decode_number, scan_number
+from src.tokens.token_type import TokenType
+
+
+@pytest.mark.parametrize('text, token_type, value', [
+    ('0', TokenType.INTEGER, 0),
+    ('42', TokenType.INTEGER, 42),
+    ('42D', TokenType.INTEGER, 42),
+    ('101B', TokenType.INTEGER, 5),
+    ('17O', TokenType.INTEGER, 15),
+    ('1FH', TokenType.INTEGER, 31),
+    ('0ABh', TokenType.INTEGER, 171),
+    ('1.5', TokenType.FLOAT, 1.5),
+    ('2.', TokenType.FLOAT, 2.0),
+    ('1.5E+3', TokenType.FLOAT, 1500.0),
+    ('2.5e-1', TokenType.FLOAT, 0.25),
+    ('10D', TokenType.INTEGER, 10),
+])
+def test_number_formats(text, token_type, value):
+    assert scan_number(text) == (token_type, value)
+    assert classify_number(text) == token_type
+    assert decode_number(text) == value
+    assert type(decode_number(text)) is type(value)
+
+
+@pytest.mark.parametrize('text', ['12B', '9O', '1G', '1.5.2', '1E5', '1.5E'])
+def test_invalid_numbers(text):
+    with pytest.raises(SyntaxError, match=f"Неверный формат числа: {text}"):
+        scan_number(text)
+
+
+def test_tokens_and_nodes_carry_values():
+    code = "program var a : %; f : !; p : $; begin a as 1FH plus 101B; f as 2.5E+1; p as true end."
+    tokens, root = Compiler.build(code)
+    assert [(token.value, token.literal) for token in tokens
+            if token.type in (TokenType.INTEGER, TokenType.FLOAT)] == [('1FH', 31), ('101B', 5), ('2.5E+1', 25.0)]
+    literals = [(node.value, node.literal, node.value_type) for node, _ in walk(root)
+                if node.type == NodeType.LITERAL]
+    assert literals == [('1FH', 31, TokenType.INTEGER), ('101B', 5, TokenType.INTEGER),
+                        ('2.5E+1', 25.0, TokenType.FLOAT), ('true', True, TokenType.BOOLEAN)]
+    assert Compiler.execute(root) == {'a': 36, 'f': 25.0, 'p': True}
+
+
+def test_lexer_reports_number_position():
+    with pytest.raises(SyntaxError, match=r"Неверный формат числа: 12B \(строка 2, столбец 12\)"):
+        Lexer("program var x : %;\nbegin x as 12B end.").tokenize()
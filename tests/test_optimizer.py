@@ -0,0 +1,76 @@
+"""Свертка констант и алгебраические упрощения не меняют поведение программы."""
+import io
+
+import pytest
+
+from src.compiler import Compiler
+from src.interpreter import Interpreter
+from src.optimizer import ConstantFolder
+
+
+INPUT = "7 2.5 " * 20
+
+PROGRAMS = {
+    'arithmetic': """program var a, b : %; f : !; begin
+        read(a, f);
+        b as 2 plus 3 mult 4 min 10 div 3;
+        write(b, a plus 0, 0 plus a, a mult 1, 1 mult a, a min 0, a mult 0, a div 1);
+        write(f plus 0, f mult 1, 2.5 mult 2, 1 plus 1.5, 7 div 2, 7.0 div 2);
+        write(a plus (2 plus 3), (a plus 2) plus 3, a min (a min 1))
+    end.""",
+    'numbers': """program var a : %; f : !; begin
+        a as 101B plus 17O plus 1FH plus 12D;
+        f as 2.5E+1 mult 1.5e-1;
+        write(a, f, a EQ 65, 1.0 EQ 1)
+    end.""",
+    'logic': """program var a : %; p, q : $; begin
+        read(a);
+        p as a GT 3; q as true and p; write(q, false and p, true or p, p or false, ~~p, ~true);
+        write(a LT a, a EQ a, 1 LT 2, 2 LE 1, 3 NE 3, 3 GE 3)
+    end.""",
+    'branches': """program var a, b : %; begin
+        read(a);
+        if true then a as a plus 1 else a as 0;
+        if 1 GT 2 then a as 0 else b as a mult 2;
+        if false then write(a);
+        while false do a as a plus 1;
+        for b as 3 to 1 plus 2 do write(b, 2 mult 2);
+        write(a, b)
+    end.""",
+    'loops': """program var a, b, c : %; begin
+        read(a); c as 0;
+        while a GT 0 do a as a min (3 min 2);
+        while c LT 20 do c as c plus (2 mult 3);
+        for b as 1 to 2 plus 2 do c as c plus b mult (1 plus 1);
+        write(a, b, c)
+    end.""",
+    'division_by_zero': """program var a : %; begin
+        a as 1; write(a); a as a div (2 min 2); write(a)
+    end.""",
+    'folded_division_by_zero': """program var a : %; begin
+        write(1); a as 1 div 0
+    end.""",
+}
+
+
+def run(root):
+    output = io.StringIO()
+    interpreter = Interpreter(io.StringIO(INPUT), output)
+    try:
+        variables = interpreter.run(root)
+    except RuntimeError as error:
+        return output.getvalue(), str(error)
+    return output.getvalue(), variables
+
+
+@pytest.mark.parametrize('code', PROGRAMS.values(), ids=PROGRAMS.keys())
+def test_folding_keeps_semantics(code):
+    expected = run(Compiler.build(code)[1])
+    folder = ConstantFolder()
+    assert run(folder.optimize(Compiler.build(code)[1])) == expected
+
+
+def test_folding_eliminates_nodes():
+    folder = ConstantFolder()
+    folder.optimize(Compiler.build(PROGRAMS['arithmetic'])[1])
+    assert folder.eliminated > 0
@@ -0,0 +1,56 @@
+"""Однопроходная компиляция против прежних трех проходов (Parser, SemanticAnalyzer, ASTBuilder)."""
+import io
+
+import pytest
+
+from benchmarks.generator import SHAPES, generate_program
+from src.ast_nodes.printer import print_ast
+from src.compiler import Compiler
+from src.source_map import error_offset
+
+
+def tree_text(root):
+    stream = io.StringIO()
+    print_ast(root, stream, 'compact')
+    return stream.getvalue()
+
+
+def first_error(code, legacy_pipeline):
+    try:
+        Compiler.build(code, legacy_pipeline=legacy_pipeline)
+    except SyntaxError as error:
+        return str(error), error_offset(error)
+    return None
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_same_tree(shape):
+    code = generate_program(shape, 30, seed=6)
+    single = Compiler.build(code)[1]
+    assert tree_text(single) == tree_text(Compiler.build(code, legacy_pipeline=True)[1])
+
+
+@pytest.mark.parametrize('code', [
+    "program var x : %; begin x as ; end.",
+    "program var x : %; begin x as 1 x as 2 end.",
+    "program var x : % begin x as 1 end.",
+    "program var x : %; begin x as 1 end",
+    "program var x : %; begin while x LT 1 x as 1 end.",
+    "program var x : %; begin for x as 1 do x as 1 end.",
+    "program var x : %; begin write(x plus) end.",
+    "program var x : %; begin y as 1 end.",
+    "program var x : %; begin x as x plus true end.",
+])
+def test_same_first_error(code):
+    error = first_error(code, False)
+    assert error is not None
+    assert error == first_error(code, True)
+
+
+def test_single_pass_checks_the_whole_tree():
+    # Прежний SemanticAnalyzer проверял только соседние с операцией токены
+    code = "program var x : %; begin if x then x as 1 end."
+    assert first_error(code, True) is None
+    assert first_error(code, False) == (
+        "Условие должно иметь логический тип, получено: TokenType.INTEGER (строка 1, столбец 29)", 28)
+
@@ -0,0 +1,171 @@
+"""Печать AST: форматы text, compact, line и dot, обрезка по глубине и вывод -v."""
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.ast_builder import ASTBuilder
+from src.ast_nodes.printer import ASTPrinter, print_ast
+from src.compiler import Compiler
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Вывод python main.py -v до перехода на ASTPrinter
+GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden', 'verbose.txt')
+
+CODE = "program var x : %; f : !; begin x as (1 plus x) mult 2; if x LT 3 then write(x, f) end."
+
+# Строки узлов без значения заканчиваются пробелом после двоеточия
+TEXT = ''.join(line + '\n' for line in [
+    "PROGRAM: ",
+    "  VARIABLE_DECLARATION: x",
+    "    IDENTIFIER: TokenType.INTEGER_TYPE",
+    "  VARIABLE_DECLARATION: f",
+    "    IDENTIFIER: TokenType.FLOAT_TYPE",
+    "  ASSIGNMENT: x",
+    "    BINARY_OPERATION: TokenType.MULT",
+    "      BINARY_OPERATION: TokenType.PLUS",
+    "        LITERAL: 1",
+    "          IDENTIFIER: integer",
+    "        IDENTIFIER: x",
+    "      LITERAL: 2",
+    "        IDENTIFIER: integer",
+    "  CONDITIONAL: ",
+    "    BINARY_OPERATION: TokenType.LT",
+    "      IDENTIFIER: x",
+    "      LITERAL: 3",
+    "        IDENTIFIER: integer",
+    "    OUTPUT: ",
+    "      IDENTIFIER: x",
+    "      IDENTIFIER: f",
+])
+
+COMPACT = """\
+PROGRAM
+ VARIABLE_DECLARATION x:integer
+ VARIABLE_DECLARATION f:float
+ ASSIGNMENT x
+  BINARY_OPERATION MULT
+   BINARY_OPERATION PLUS
+    LITERAL 1:integer
+    IDENTIFIER x
+   LITERAL 2:integer
+ CONDITIONAL
+  BINARY_OPERATION LT
+   IDENTIFIER x
+   LITERAL 3:integer
+  OUTPUT
+   IDENTIFIER x
+   IDENTIFIER f
+"""
+
+LINE = ("PROGRAM(VARIABLE_DECLARATION x:integer, VARIABLE_DECLARATION f:float, "
+        "ASSIGNMENT x(BINARY_OPERATION MULT(BINARY_OPERATION PLUS(LITERAL 1:integer, IDENTIFIER x), "
+        "LITERAL 2:integer)), CONDITIONAL(BINARY_OPERATION LT(IDENTIFIER x, LITERAL 3:integer), "
+        "OUTPUT(IDENTIFIER x, IDENTIFIER f)))\n")
+
+
+def printed(root, style='text', max_depth=None):
+    stream = io.StringIO()
+    print_ast(root, stream, style, max_depth)
+    return stream.getvalue()
+
+
+@pytest.fixture
+def root():
+    return Compiler.build(CODE)[1]
+
+
+def test_formats(root):
+    assert printed(root) == TEXT
+    assert printed(root, 'compact') == COMPACT
+    assert printed(root, 'line') == LINE
+
+
+def test_dot(root):
+    lines = printed(root, 'dot').splitlines()
+    assert lines[:3] == ['digraph AST {', '    node [shape=box, fontname="monospace"];', '    n0 [label="PROGRAM"];']
+    assert lines[-1] == '}'
+    vertices = [line for line in lines if '[label=' in line]
+    edges = [line.split() for line in lines if '->' in line]
+    assert len(vertices) == len(COMPACT.splitlines())
+    assert len(edges) == len(vertices) - 1
+    assert ['n4', '->', 'n8;'] in edges and ['n9', '->', 'n13;'] in edges
+    assert '    n13 [label="OUTPUT"];' in lines
+
+
+def test_max_depth(root):
+    assert printed(root, 'compact', 2) == """\
+PROGRAM
+ VARIABLE_DECLARATION x:integer
+ VARIABLE_DECLARATION f:float
+ ASSIGNMENT x
+  BINARY_OPERATION MULT
+   ...
+ CONDITIONAL
+  BINARY_OPERATION LT
+   ...
+  OUTPUT
+   ...
+"""
+    assert printed(root, 'line', 1) == (
+        "PROGRAM(VARIABLE_DECLARATION x:integer, VARIABLE_DECLARATION f:float, ASSIGNMENT x(...), CONDITIONAL(...))\n")
+    assert printed(root, 'text', 1).splitlines()[-2:] == ["  CONDITIONAL: ", "    ..."]
+    dot = printed(root, 'dot', 1)
+    assert dot.count('[style=dashed, label="..."]') == 2
+    assert '    n3 -> n4;' in dot
+    assert printed(root, 'compact', 0) == "PROGRAM\n ...\n"
+    # Глубина больше дерева ничего не обрезает
+    assert printed(root, 'compact', 100) == COMPACT
+
+
+def test_empty_tree():
+    assert printed(None) == ''
+    assert printed(None, 'line') == "\n"
+    assert printed(None, 'dot') == 'digraph AST {\n    node [shape=box, fontname="monospace"];\n}\n'
+
+
+def test_builder_print_ast(root, capsys):
+    # Поток по умолчанию берется при печати, поэтому перехват stdout работает
+    builder = ASTBuilder([])
+    builder.print_ast(root)
+    assert capsys.readouterr().out == TEXT
+    stream = io.StringIO()
+    builder.print_ast(root.children[2], 2, stream)
+    # Поддерево с отступом level
+    assert stream.getvalue() == ''.join('  ' + line + '\n' for line in TEXT.splitlines()[5:13])
+
+
+def test_buffered_writes(root, monkeypatch):
+    class Stream(io.StringIO):
+        writes = 0
+
+        def write(self, text):
+            Stream.writes += 1
+            return super().write(text)
+
+    monkeypatch.setattr(ASTPrinter, 'BUFFER_PARTS', 4)
+    stream = Stream()
+    print_ast(root, stream, 'compact')
+    assert stream.getvalue() == COMPACT
+    # 16 строк частями по 4 - четыре записи вместо записи на узел
+    assert Stream.writes == 4
+
+
+def test_verbose_golden():
+    result = subprocess.run([sys.executable, 'main.py', '-v'], cwd=ROOT, capture_output=True, timeout=60)
+    assert result.returncode == 0
+    with open(GOLDEN, 'rb') as file:
+        assert result.stdout == file.read()
+
+
+def test_verbose_formats():
+    result = subprocess.run([sys.executable, 'main.py', '-v', '--ast-format', 'compact', '--ast-depth', '1'],
+                            cwd=ROOT, capture_output=True, text=True, timeout=60)
+    lines = result.stdout.splitlines()
+    start = lines.index('PROGRAM')
+    assert all(line.startswith(' ') for line in lines[start + 1:])
+    assert lines[-1] == '  ...'
+    assert not any(line.startswith('  ') and line.strip() != '...' for line in lines[start:])
@@ -0,0 +1,107 @@
+"""Программа, транслированная в Python, ведет себя как AST-интерпретатор."""
+import io
+
+import pytest
+
+from src.ast_builder import ASTBuilder
+from src.compiler import Compiler
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.python_backend import transpile
+
+
+INPUT = "3 4 2.5 true " * 10
+
+PROGRAMS = {
+    'arithmetic': """program var a, b : %; f : !; begin
+        read(a, b, f);
+        write(a plus b, a min b, a mult b, a div b, 7 div 2, a div 2.0, f mult 2, f div 0.5);
+        f as a; write(f, f plus 1); a as 101B plus 17O plus 1FH; write(a)
+    end.""",
+    'logic': """program var a, b : %; p, q : $; begin
+        read(a, b); p as a LT b; q as ~p;
+        write(p, q, p and q, p or q, a EQ b, a NE b, a LE b, a GE b, a GT b);
+        write(a LT b EQ true)
+    end.""",
+    'loops': """program var a, b, i : %; f : !; begin
+        read(a, b);
+        for i as a to b plus 3 do write(i);
+        write(i);
+        for i as 5 to 1 do write(i);
+        write(i);
+        for i as 1 to 10 do i as i plus 2;
+        write(i);
+        for f as 0.5 to 2 do write(f);
+        while a LT 10 do a as a mult 2;
+        write(a)
+    end.""",
+    'branches': """program var a, b : %; begin
+        read(a, b);
+        if a LT b then write(a) else write(b);
+        if a GT b then write(a);
+        if a EQ 3 then if b EQ 4 then write(1) else write(2) else write(3)
+    end.""",
+    'read_types': """program var a, b : %; f : !; p : $; begin
+        read(a, b, f, p); write(a, b, f, p)
+    end.""",
+}
+
+ERRORS = {
+    'division_by_zero': ("program var a : %; begin write(1); a as a div 0 end.", INPUT),
+    'missing_input': ("program var a, b : %; begin read(a); write(a); read(b) end.", "1"),
+    'bad_input': ("program var p : $; begin read(p) end.", INPUT),
+}
+
+
+def run_interpreter(root, input_text=INPUT):
+    output = io.StringIO()
+    try:
+        variables = Interpreter(io.StringIO(input_text), output).run(root)
+    except RuntimeError as error:
+        return output.getvalue(), str(error)
+    return output.getvalue(), variables
+
+
+def run_python(root, input_text=INPUT):
+    output = io.StringIO()
+    try:
+        variables = transpile(root).run(io.StringIO(input_text), output)
+    except RuntimeError as error:
+        return output.getvalue(), str(error)
+    return output.getvalue(), variables
+
+
+@pytest.mark.parametrize('code', PROGRAMS.values(), ids=PROGRAMS.keys())
+@pytest.mark.parametrize('optimize', [False, True])
+def test_same_output_as_interpreter(code, optimize):
+    root = Compiler.build(code, optimize=optimize)[1]
+    assert run_python(root) == run_interpreter(root)
+
+
+@pytest.mark.parametrize('code, input_text', ERRORS.values(), ids=ERRORS.keys())
+def test_same_runtime_errors(code, input_text):
+    root = Compiler.build(code)[1]
+    output, error = run_python(root, input_text)
+    expected_output, expected_error = run_interpreter(root, input_text)
+    assert output == expected_output
+    # Позиция ошибки у транслятора - оператор, а не подвыражение
+    assert error.split(' (')[0] == expected_error.split(' (')[0]
+
+
+@pytest.mark.parametrize('code', [
+    "program var x : %; begin y as 1 end.",
+    "program var x : %; begin x as y end.",
+    "program var x : %; begin read(y) end.",
+    "program var x : %; begin for y as 1 to 2 do x as 1 end.",
+])
+def test_undeclared_variable_without_type_checking(code):
+    # Дерево без семантического анализа: необъявленная переменная - ошибка с позицией
+    root = ASTBuilder(Lexer(code).tokenize(), strict=True).parse()
+    with pytest.raises(SyntaxError, match=r"Необъявленная переменная: y \(строка 1, столбец \d+\)"):
+        transpile(root)
+
+
+def test_too_deep_nesting():
+    code = "program var a : %; begin " + "if true then " * 150 + "a as 1 end."
+    with pytest.raises(SyntaxError, match="Слишком глубокая вложенность"):
+        transpile(Compiler.build(code)[1])
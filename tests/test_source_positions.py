@@ -0,0 +1,84 @@
+"""Позиции в исходном тексте у токенов, узлов AST и ошибок."""
+import random
+
+import pytest
+
+from benchmarks.generator import generate_program
+from src.ast_nodes.traversal import walk
+from src.compiler import Compiler
+from src.source_map import SourceMap, error_offset
+
+
+def expected_position(text, offset):
+    line = text.count('\n', 0, offset) + 1
+    return line, offset - (text.rfind('\n', 0, offset) + 1) + 1
+
+
+def test_token_positions():
+    code = generate_program('comments', 30, seed=4)
+    tokens = Compiler.build(code)[0]
+    for token in tokens:
+        assert code.startswith(token.value, token.offset)
+        assert (token.line, token.column) == expected_position(code, token.offset)
+        assert token.location == "строка {}, столбец {}".format(*expected_position(code, token.offset))
+
+
+def test_ast_nodes_share_token_positions():
+    code = generate_program('nested', 10, seed=4)
+    _, root = Compiler.build(code)
+    for node, _ in walk(root):
+        if node.token is not None:
+            assert node.offset == node.token.offset
+            assert (node.line, node.column) == (node.token.line, node.token.column)
+
+
+@pytest.mark.parametrize('code, offset', [
+    ("program var x : %;\nbegin\n  x as y\nend.", 32),
+    ("program var x : %;\nbegin\n  x as true\nend.", 27),
+    ("program var x : %;\r\nbegin\r\n  x as 1 $\r\nend.", 36),
+])
+def test_errors_carry_offset(code, offset):
+    with pytest.raises(SyntaxError) as caught:
+        Compiler.build(code)
+    assert error_offset(caught.value) == offset
+    assert str(caught.value).endswith("(строка {}, столбец {})".format(*expected_position(code, offset)))
+
+
+def test_runtime_errors_carry_offset():
+    code = "program var x : %;\nbegin\n  x as 1 div (x min x)\nend."
+    with pytest.raises(RuntimeError) as caught:
+        Compiler.execute(Compiler.build(code)[1])
+    assert error_offset(caught.value) == code.index('div')
+
+
+def test_source_map_positions():
+    rng = random.Random(1)
+    text = ''.join(rng.choice('ab \n') for _ in range(500))
+    source_map = SourceMap(text)
+    for offset in range(len(text) + 1):
+        assert source_map.position(offset) == expected_position(text, offset)
+
+
+def test_source_map_extend():
+    text = "first\nsecond line\n\nfourth"
+    source_map = SourceMap()
+    for start in range(0, len(text), 4):
+        source_map.extend(text[start:start + 4])
+    for offset in range(len(text)):
+        assert source_map.position(offset) == expected_position(text, offset)
+
+
+def test_source_map_replace():
+    # Отложенный сдвиг строк после правок досчитывается при чтении позиций
+    rng = random.Random(2)
+    text = ''.join(rng.choice('ab\n') for _ in range(300))
+    source_map = SourceMap(text)
+    source_map.position(0)
+    for _ in range(200):
+        start = rng.randint(0, len(text))
+        end = min(len(text), start + rng.randint(0, 5))
+        replacement = ''.join(rng.choice('c\n') for _ in range(rng.randint(0, 4)))
+        source_map.replace(start, end, replacement)
+        text = text[:start] + replacement + text[end:]
+        for offset in rng.sample(range(len(text) + 1), 5):
+            assert source_map.position(offset) == expected_position(text, offset)
@@ -0,0 +1,77 @@
+"""Потоковый лексер и буфер предпросмотра TokenStream."""
+import io
+
+import pytest
+
+from benchmarks.generator import generate_program
+from src.ast_builder import ASTBuilder
+from src.ast_nodes.printer import print_ast
+from src.lexer import Lexer
+from src.parser import Parser
+from src.streaming_lexer import StreamingLexer
+from src.tokens.token_stream import TokenStream
+
+
+CODE = """program var x, y : %; f : !;
+begin { комментарий, который
+  длиннее фрагмента }
+  read(x); f as 1.5E+3 plus x; y as 101B plus 1FH;
+  write(x plus y, f)
+end."""
+
+
+def token_fields(tokens):
+    return [(token.type, token.value, token.offset, token.literal) for token in tokens]
+
+
+def tree_text(root):
+    stream = io.StringIO()
+    print_ast(root, stream, 'compact')
+    return stream.getvalue()
+
+
+def test_reads_file_objects(tmp_path):
+    path = tmp_path / 'program.uvm'
+    path.write_text(CODE, encoding='utf-8')
+    with open(path, encoding='utf-8') as file:
+        tokens = list(StreamingLexer(file, chunk_size=5))
+    assert token_fields(tokens) == token_fields(Lexer(CODE).tokenize())
+
+
+@pytest.mark.parametrize('split', [1, 3, 11, 16, 17, 24])
+def test_reads_iterables_of_chunks(split):
+    # Разрез внутри комментария, числа с порядком и идентификатора
+    chunks = [CODE[start:start + split] for start in range(0, len(CODE), split)]
+    assert token_fields(StreamingLexer(chunks)) == token_fields(Lexer(CODE).tokenize())
+
+
+def test_tokens_are_produced_lazily():
+    chunks = iter([CODE[:40], CODE[40:]])
+    tokens = iter(StreamingLexer(chunks))
+    next(tokens)
+    # Второй фрагмент еще не прочитан
+    assert next(chunks) == CODE[40:]
+
+
+def test_positions_in_errors():
+    code = "program var x : %;\nbegin x as 1 @ end."
+    with pytest.raises(SyntaxError, match=r"Неожиданный символ: @ \(строка 2, столбец 14\)"):
+        list(StreamingLexer(io.StringIO(code), chunk_size=4))
+
+
+def test_token_stream_lookahead():
+    tokens = Lexer("program var x : %;").tokenize()
+    stream = TokenStream(iter(tokens))
+    assert stream.peek(2) is tokens[2]
+    assert stream.peek() is tokens[0]
+    assert [stream.advance() for _ in tokens] == tokens
+    assert stream.peek() is None
+    with pytest.raises(SyntaxError, match="Неожиданный конец программы"):
+        stream.advance()
+
+
+def test_parsers_accept_token_streams():
+    code = generate_program('nested', 20, seed=3)
+    expected = tree_text(ASTBuilder(Lexer(code).tokenize(), strict=True).parse())
+    assert tree_text(ASTBuilder(iter(StreamingLexer([code], chunk_size=7)), strict=True).parse()) == expected
+    Parser(StreamingLexer(io.StringIO(code), chunk_size=7)).parse()
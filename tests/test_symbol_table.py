@@ -0,0 +1,54 @@
+"""Интернирование идентификаторов и номера символов."""
+from src.ast_nodes.ast_node_type import NodeType
+from src.ast_nodes.traversal import walk
+from src.compiler import Compiler
+from src.lexer import Lexer
+from src.streaming_lexer import StreamingLexer
+from src.symbol_table import SymbolTable
+
+
+CODE = "program var alpha, beta : %; begin alpha as 1; beta as alpha plus alpha; write(beta) end."
+
+
+def test_intern():
+    table = SymbolTable()
+    assert [table.intern(name) for name in ('x', 'y', 'x', 'z', 'y')] == [0, 1, 0, 2, 1]
+    assert table.name(2) == 'z'
+    assert list(table) == ['x', 'y', 'z']
+    assert len(table) == 3
+    assert 'y' in table and 'w' not in table
+
+
+def test_tokens_share_names_and_symbols():
+    lexer = Lexer(CODE)
+    tokens = [token for token in lexer.tokenize() if token.symbol is not None]
+    assert [token.value for token in tokens] == ['alpha', 'beta', 'alpha', 'beta', 'alpha', 'alpha', 'beta']
+    for token in tokens:
+        assert token.symbol == lexer.symbols.ids[token.value]
+        # Все вхождения имени - одна строка из таблицы
+        assert token.value is lexer.symbols.name(token.symbol)
+
+
+def test_lexers_agree_on_symbols():
+    expected = [token.symbol for token in Lexer(CODE).tokenize()]
+    assert [token.symbol for token in Lexer(CODE, legacy=True).tokenize()] == expected
+    assert [token.symbol for token in StreamingLexer([CODE[:20], CODE[20:]])] == expected
+    assert [token.symbol for token in Lexer(CODE).tokenize_buffer()] == expected
+
+
+def test_shared_table_across_lexers():
+    table = SymbolTable()
+    first = Lexer("program var x, y : %;", symbols=table).tokenize()
+    second = Lexer("program var y, z : %;", symbols=table).tokenize()
+    assert first[4].symbol == second[2].symbol == 1
+    assert len(table) == 3
+
+
+def test_ast_nodes_carry_symbols():
+    tokens, root = Compiler.build(CODE)
+    declared = {node.value: node.symbol for node in root.children
+                if node.type == NodeType.VARIABLE_DECLARATION}
+    for node, _ in walk(root):
+        if node.type in (NodeType.IDENTIFIER, NodeType.ASSIGNMENT, NodeType.VARIABLE_DECLARATION):
+            assert node.symbol == declared[node.value]
+    assert Compiler.execute(root) == {'alpha': 1, 'beta': 2}
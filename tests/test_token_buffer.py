@@ -0,0 +1,65 @@
+"""Компактное хранение токенов: TokenBuffer и Token со __slots__."""
+import io
+
+import pytest
+
+from benchmarks.generator import SHAPES, generate_program
+from src.ast_builder import ASTBuilder
+from src.ast_nodes.printer import print_ast
+from src.lexer import Lexer
+from src.parser import Parser
+from src.semantic_analyzer import SemanticAnalyzer
+from src.tokens.token import Token
+
+
+def token_fields(tokens):
+    return [(token.type, token.value, token.offset, token.literal, token.symbol) for token in tokens]
+
+
+def tree_text(root):
+    stream = io.StringIO()
+    print_ast(root, stream, 'compact')
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_buffer_matches_token_list(shape):
+    code = generate_program(shape, 40, seed=2)
+    tokens = Lexer(code).tokenize()
+    buffer = Lexer(code).tokenize_buffer()
+    assert len(buffer) == len(tokens)
+    assert token_fields(buffer) == token_fields(tokens)
+    assert token_fields([buffer[index] for index in range(len(buffer))]) == token_fields(tokens)
+    assert token_fields([buffer[-1]]) == token_fields([tokens[-1]])
+    assert [buffer.type_at(index) for index in range(len(buffer))] == [token.type for token in tokens]
+    assert [buffer.value_at(index) for index in range(len(buffer))] == [token.value for token in tokens]
+
+
+def test_buffer_feeds_all_phases():
+    code = generate_program('statements', 60, seed=5)
+    buffer = Lexer(code).tokenize_buffer()
+    Parser(buffer).parse()
+    SemanticAnalyzer(buffer).analyze()
+    assert tree_text(ASTBuilder(buffer).parse()) == tree_text(ASTBuilder(Lexer(code).tokenize()).parse())
+
+
+def test_buffer_identifiers_share_interned_names():
+    buffer = Lexer("program var alpha : %; begin alpha as alpha plus 1 end.").tokenize_buffer()
+    names = [token for token in buffer if token.value == 'alpha']
+    assert len(names) == 3
+    assert all(token.value is names[0].value and token.symbol == names[0].symbol for token in names)
+
+
+@pytest.mark.parametrize('code, message', [
+    ("program var x : %;\nbegin x # 1 end.", r"Неожиданный символ: # \(строка 2, столбец 9\)"),
+    ("program var x : %;\nbegin x as 12B end.", r"\(строка 2, столбец 12\)"),
+])
+def test_buffer_errors_have_positions(code, message):
+    with pytest.raises(SyntaxError, match=message):
+        Lexer(code).tokenize_buffer()
+
+
+def test_tokens_have_no_instance_dict():
+    token = Lexer("program").tokenize()[0]
+    assert not hasattr(token, '__dict__')
+    assert isinstance(token, Token)
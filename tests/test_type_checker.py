@@ -0,0 +1,57 @@
+"""Вывод и проверка типов по AST."""
+import pytest
+
+from src.ast_nodes.ast_node_type import NodeType
+from src.ast_nodes.traversal import walk
+from src.compiler import Compiler
+from src.tokens.token_type import TokenType
+
+
+DECLARATIONS = "program var i, j : %; f : !; b, c : $; begin "
+
+# Оператор, начало сообщения об ошибке и фрагмент оператора, на который указывает позиция
+ILL_TYPED = {
+    'integer_from_float': ("i as 1.5", "Несовместимые типы при присваивании: TokenType.INTEGER ≠ TokenType.FLOAT (i)", "i as"),
+    'integer_from_boolean': ("i as j LT 2", "Несовместимые типы при присваивании: TokenType.INTEGER ≠ TokenType.BOOLEAN (i)", "i as"),
+    'boolean_from_number': ("b as i plus 1", "Несовместимые типы при присваивании: TokenType.BOOLEAN ≠ TokenType.INTEGER (b)", "b as"),
+    'undeclared_target': ("k as 1", "Необъявленная переменная: k", "k as"),
+    'undeclared_operand': ("i as k plus 1", "Необъявленная переменная: k", "k plus"),
+    'arithmetic_on_boolean': ("i as b plus 1", "Недопустимый тип левого операнда для TokenType.PLUS", "plus"),
+    'not_on_number': ("b as ~i", "Недопустимый тип операнда для TokenType.UNARY_NEGATION", "~"),
+    'order_on_boolean': ("b as b LT c", "Недопустимый тип левого операнда для TokenType.LT", "LT"),
+    'condition_not_boolean': ("if i then j as 1", "Условие должно иметь логический тип, получено: TokenType.INTEGER", "i then"),
+    'while_not_boolean': ("while f do j as 1", "Условие должно иметь логический тип, получено: TokenType.FLOAT", "f do"),
+    'for_end_not_number': ("for i as 1 to b do j as 1", "Граница цикла должна быть числом, получено: TokenType.BOOLEAN", "b do"),
+    'for_variable_not_number': ("for b as true to 3 do j as 1",
+                                "Переменная цикла должна быть числом, получено: TokenType.BOOLEAN (b)", "b as"),
+    'nested_statement': ("if b then while c do for i as 1 to 2 do j as f",
+                         "Несовместимые типы при присваивании: TokenType.INTEGER ≠ TokenType.FLOAT (j)", "j as"),
+}
+
+
+@pytest.mark.parametrize('statement, message, marker', ILL_TYPED.values(), ids=ILL_TYPED.keys())
+def test_rejects_ill_typed_programs(statement, message, marker):
+    with pytest.raises(SyntaxError) as caught:
+        Compiler.build(DECLARATIONS + statement + " end.")
+    column = len(DECLARATIONS) + statement.index(marker) + 1
+    assert str(caught.value) == f"{message} (строка 1, столбец {column})"
+
+
+def test_infers_expression_types():
+    root = Compiler.build(DECLARATIONS + "f as i plus 1 mult f; b as (i div 2 EQ j) and ~c; "
+                          "for f as 0.5 to i do write(f div 2, i div j) end.")[1]
+    types = {}
+    for node, _ in walk(root):
+        if node.type in (NodeType.BINARY_OPERATION, NodeType.UNARY_OPERATION, NodeType.IDENTIFIER):
+            types.setdefault((node.type, node.value), set()).add(node.value_type)
+    assert types[(NodeType.BINARY_OPERATION, TokenType.PLUS)] == {TokenType.FLOAT}
+    assert types[(NodeType.BINARY_OPERATION, TokenType.EQ)] == {TokenType.BOOLEAN}
+    assert types[(NodeType.UNARY_OPERATION, TokenType.UNARY_NEGATION)] == {TokenType.BOOLEAN}
+    # div целых - целое, с вещественным операндом - вещественное
+    assert types[(NodeType.BINARY_OPERATION, TokenType.DIV)] == {TokenType.INTEGER, TokenType.FLOAT}
+    assert all(len(value_types) == 1 and None not in value_types
+               for (node_type, _), value_types in types.items() if node_type == NodeType.IDENTIFIER)
+
+
+def test_float_variable_accepts_integer():
+    Compiler.build(DECLARATIONS + "f as i plus 1; for f as 1 to 3 do j as 1 end.")
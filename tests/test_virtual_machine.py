@@ -0,0 +1,93 @@
+"""Байт-код на стековой машине ведет себя как AST-интерпретатор."""
+import io
+
+import pytest
+
+from benchmarks.generator import generate_program
+from src.bytecode.bytecode_compiler import BytecodeCompiler
+from src.bytecode.disassembler import disassemble
+from src.bytecode.virtual_machine import VirtualMachine
+from src.compiler import Compiler
+from src.interpreter import Interpreter
+
+
+INPUT = "3 4 2.5 true " * 10
+
+PROGRAMS = {
+    'arithmetic': """program var a, b : %; f : !; begin
+        read(a, b, f);
+        write(a plus b, a min b, a mult b, a div b, 0 min 7 div 2, a div 2.0, f mult 2, f div 0.5);
+        f as a; write(f, f plus 1)
+    end.""",
+    'logic': """program var a, b : %; p, q : $; begin
+        read(a, b); p as a LT b; q as ~p;
+        write(p, q, p and q, p or q, a EQ b, a NE b, a LE b, a GE b, a GT b);
+        p as false and (1 div 0 EQ 0); q as true or (1 div 0 EQ 0); write(p, q)
+    end.""",
+    'loops': """program var a, b, i : %; f : !; begin
+        read(a, b);
+        for i as a to b plus 3 do write(i);
+        for i as 5 to 1 do write(i);
+        for i as 1 to 10 do i as i plus 2;
+        for f as 0.5 to 2 do write(f);
+        while a LT 10 do a as a mult 2;
+        write(a, i, f)
+    end.""",
+    'branches': """program var a, b : %; begin
+        read(a, b);
+        if a LT b then write(a) else write(b);
+        if a GT b then write(a);
+        if a EQ 3 then if b EQ 4 then write(1) else write(2) else write(3)
+    end.""",
+    'generated': generate_program('nested', 5, depth=4, seed=7),
+    'deep': "program var a : %; begin a as 0; " + "while a LT 1 do " * 300
+            + "a as " + "(a plus " * 500 + "1" + ")" * 500 + "; write(a) end.",
+}
+
+ERRORS = {
+    'division_by_zero': ("program var a : %; begin write(1); a as a div 0 end.", INPUT),
+    'missing_input': ("program var a, b : %; begin read(a); write(a); read(b) end.", "1"),
+    'bad_input': ("program var p : $; begin read(p) end.", INPUT),
+}
+
+
+def run(root, runner, input_text=INPUT):
+    output = io.StringIO()
+    try:
+        variables = runner(root, io.StringIO(input_text), output)
+    except RuntimeError as error:
+        return output.getvalue(), str(error)
+    return output.getvalue(), variables
+
+
+def run_vm(root, input_stream, output_stream):
+    return VirtualMachine(input_stream, output_stream).run(BytecodeCompiler().compile(root))
+
+
+def run_interpreter(root, input_stream, output_stream):
+    return Interpreter(input_stream, output_stream).run(root)
+
+
+@pytest.mark.parametrize('code', PROGRAMS.values(), ids=PROGRAMS.keys())
+@pytest.mark.parametrize('optimize', [False, True])
+def test_same_output_as_interpreter(code, optimize):
+    root = Compiler.build(code, optimize=optimize)[1]
+    assert run(root, run_vm) == run(root, run_interpreter)
+
+
+@pytest.mark.parametrize('code, input_text', ERRORS.values(), ids=ERRORS.keys())
+def test_same_runtime_errors(code, input_text):
+    root = Compiler.build(code)[1]
+    assert run(root, run_vm, input_text) == run(root, run_interpreter, input_text)
+
+
+def test_disassembler():
+    code_object = BytecodeCompiler().compile(Compiler.build(PROGRAMS['loops'])[1])
+    text = disassemble(code_object)
+    for opcode in ('READ', 'LOAD_VAR', 'STORE_VAR', 'JUMP_IF_FALSE', 'WRITE', 'HALT'):
+        assert opcode in text
+
+
+def test_execute_backend():
+    root = Compiler.build("program var a : %; begin a as 6 mult 7 end.")[1]
+    assert Compiler.execute(root, 'vm') == Compiler.execute(root, 'ast') == {'a': 42}